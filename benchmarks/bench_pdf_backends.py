@@ -0,0 +1,69 @@
+"""
+Compare PDF extraction backends on generated sample documents.
+
+Measures the time DocumentParser needs per document with each backend and
+the share of expected (name, value) results it recovers.
+
+Usage:
+    python benchmarks/bench_pdf_backends.py [--repeat 5] [--pages 20]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.samples import build_table_pdf, build_text_pdf, expected_tests, load_sample_record
+from src.utils.document_parser import DocumentParser
+from src.utils.pdf_backends import PDF_BACKENDS
+
+
+def accuracy(result: dict, expected: list) -> float:
+    found = {(test["name"], float(test["value"])) for test in result["blood_tests"]}
+    return sum(1 for item in expected if item in found) / len(expected)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Runs per document")
+    arg_parser.add_argument("--pages", type=int, default=20, help="Pages in the large documents")
+    args = arg_parser.parse_args()
+
+    record = load_sample_record()
+    expected = expected_tests(record)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        documents = {
+            "tables (1 page)": build_table_pdf(tmp_dir / "tables.pdf", record),
+            f"tables (+{args.pages} pages)": build_table_pdf(
+                tmp_dir / "tables_large.pdf", record, filler_pages=args.pages
+            ),
+            "text (1 page)": build_text_pdf(tmp_dir / "text.pdf", record),
+            f"text ({args.pages} pages)": build_text_pdf(
+                tmp_dir / "text_large.pdf", record, repeat_pages=args.pages
+            ),
+        }
+
+        print(f"{'document':<22} {'backend':<12} {'ms/doc':>10} {'accuracy':>10}")
+        for label, path in documents.items():
+            for backend_name, backend_cls in PDF_BACKENDS.items():
+                if not backend_cls.is_available():
+                    continue
+                parser = DocumentParser(pdf_backend=backend_name)
+                result = parser.parse_document(path)
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    parser.parse_document(path)
+                elapsed_ms = (time.perf_counter() - start) * 1000 / args.repeat
+                print(
+                    f"{label:<22} {backend_name:<12} {elapsed_ms:>10.1f} "
+                    f"{accuracy(result, expected):>10.0%}"
+                )
+
+
+if __name__ == "__main__":
+    main()
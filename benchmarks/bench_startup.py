@@ -0,0 +1,106 @@
+"""
+Measure CLI cold start and break down its import time.
+
+Runs ``python -X importtime`` in fresh interpreters and reports the
+cumulative import time of each module imported directly by ``src.main``,
+then times complete CLI runs on the example JSON document per --format.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 5] [--top 15]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from config import EXAMPLES_DIR, OUTPUT_DIR
+
+# "import time: <self us> | <cumulative us> | <indent><module>"
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def import_times(module: str) -> Dict[str, float]:
+    """Cumulative import time in ms of each module imported directly by module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    lines = [IMPORT_LINE.match(line) for line in result.stderr.splitlines()]
+    lines = [match for match in lines if match]
+    # Imports are reported depth first: the module's own line comes after
+    # those of everything it imported, which are indented one level deeper
+    end = next(i for i, m in enumerate(lines) if m.group(4) == module)
+    indent = len(lines[end].group(3))
+    start = end
+    while start > 0 and len(lines[start - 1].group(3)) > indent:
+        start -= 1
+
+    times = {
+        match.group(4): int(match.group(2)) / 1000
+        for match in lines[start:end]
+        if len(match.group(3)) == indent + 2
+    }
+    times[module] = int(lines[end].group(2)) / 1000
+    return times
+
+
+def wall_time(args: List[str], repeat: int) -> float:
+    """Best wall time in ms of running the interpreter with args."""
+    # Render every PDF instead of serving repeats from the report cache
+    env = {**os.environ, "MSA_REPORT_CACHE_MB": "0"}
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *args], cwd=ROOT, env=env, capture_output=True, check=True
+        )
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement")
+    arg_parser.add_argument("--top", type=int, default=15, help="Modules listed in the breakdown")
+    args = arg_parser.parse_args()
+
+    # Best of several runs per module, so disk cache effects do not dominate
+    runs = [import_times("src.main") for _ in range(args.repeat)]
+    best = {module: min(run.get(module, float("inf")) for run in runs) for module in runs[0]}
+    total = best.pop("src.main")
+
+    print(f"{'module imported by src.main':<40} {'ms':>8}")
+    for module, elapsed in sorted(best.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"{module:<40} {elapsed:>8.1f}")
+    print(f"{'total (import src.main)':<40} {total:>8.1f}")
+
+    example = EXAMPLES_DIR / "sample_combined.json"
+    print(f"\n{'command':<40} {'ms':>8}")
+    print(f"{'python -c pass':<40} {wall_time(['-c', 'pass'], args.repeat):>8.1f}")
+    existing_reports = set(OUTPUT_DIR.glob("*.pdf"))
+    with tempfile.TemporaryDirectory() as tmp:
+        for report_format in ("json", "csv", "html", "pdf"):
+            command = ["src/main.py", "--json", str(example), "--format", report_format]
+            if report_format != "pdf":
+                command += ["--output", str(Path(tmp) / f"report.{report_format}")]
+            label = f"main.py --json --format {report_format}"
+            print(f"{label:<40} {wall_time(command, args.repeat):>8.1f}")
+    # PDF reports always go to the output directory; remove the ones written here
+    for report in set(OUTPUT_DIR.glob("*.pdf")) - existing_reports:
+        report.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Sample document generation shared by the benchmark scripts."""
+
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import EXAMPLES_DIR
+
+
+def load_sample_record() -> Dict:
+    """Load the sample patient and blood tests used to build documents."""
+    with open(EXAMPLES_DIR / "sample_combined.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_table_pdf(path: Path, record: Dict, filler_pages: int = 0) -> Path:
+    """
+    Write a PDF laid out like the DOCX template: a patient table and a
+    results table, followed by filler pages of running text.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table
+
+    from src.utils.formatter import register_polish_fonts
+
+    font_name, _ = register_polish_fonts()
+    styles = getSampleStyleSheet()
+    styles["Normal"].fontName = font_name
+
+    patient = record["patient"]
+    patient_rows = [
+        ["Imię", "Nazwisko", "Wiek", "Schorzenia"],
+        [
+            patient["name"],
+            patient["surname"],
+            str(patient["age"]),
+            ", ".join(patient["conditions"]),
+        ],
+    ]
+    test_rows = [["Badanie", "Wartość", "Jednostka"]] + [
+        [test["name"], str(test["value"]).replace(".", ","), test["unit"]]
+        for test in record["blood_tests"]
+    ]
+    table_style = [
+        ("GRID", (0, 0), (-1, -1), 0.5, "black"),
+        ("FONTNAME", (0, 0), (-1, -1), font_name),
+    ]
+
+    elements = [
+        Table(patient_rows, style=table_style),
+        Spacer(1, 20),
+        Table(test_rows, style=table_style),
+    ]
+    for page in range(filler_pages):
+        elements.append(PageBreak())
+        elements.extend(
+            Paragraph(
+                f"Komentarz laboratorium {page}.{line}: badanie wykonano metodą standardową.",
+                styles["Normal"],
+            )
+            for line in range(40)
+        )
+
+    SimpleDocTemplate(str(path), pagesize=A4).build(elements)
+    return path
+
+
+def build_text_pdf(path: Path, record: Dict, repeat_pages: int = 1) -> Path:
+    """Write a PDF with "Name: value unit" result lines and no tables."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    from src.utils.formatter import register_polish_fonts
+
+    font_name, _ = register_polish_fonts()
+    patient = record["patient"]
+    pdf = canvas.Canvas(str(path), pagesize=A4)
+    for _ in range(repeat_pages):
+        pdf.setFont(font_name, 11)
+        y = 800
+        pdf.drawString(50, y, f"Pacjent: {patient['surname']} {patient['name']}")
+        y -= 20
+        pdf.drawString(50, y, f"Wiek: {patient['age']}")
+        for test in record["blood_tests"]:
+            y -= 20
+            pdf.drawString(50, y, f"{test['name']}: {test['value']} {test['unit']}")
+        pdf.showPage()
+    pdf.save()
+    return path
+
+
+def expected_tests(record: Dict) -> List[tuple]:
+    """(name, value) pairs a perfect extraction would return."""
+    return [(test["name"], float(test["value"])) for test in record["blood_tests"]]
@@ -35,7 +35,12 @@ def main():
     print("✓ Clean complete")
     print()
 
-    print("Step 2: Building .app with PyInstaller...")
+    print("Step 2: Compiling reference data bundle...")
+    run_command([sys.executable, "run.py", "--build-data-bundle"], cwd=str(root_dir))
+    print("✓ Data bundle complete")
+    print()
+
+    print("Step 3: Building .app with PyInstaller...")
     run_command([sys.executable, "-m", "PyInstaller", "--clean", str(spec_file)], cwd=str(root_dir))
     print("✓ Build complete")
     print()
@@ -21,6 +21,71 @@ TEST_CATEGORIES_FILE = DATA_DIR / "test_categories.json"
 CLINICAL_THRESHOLDS_FILE = DATA_DIR / "clinical_thresholds.json"
 REGEX_PATTERNS_FILE = DATA_DIR / "regex_patterns.json"
 
+# Application log: level of the module loggers, and size-based rotation of
+# logs/app.log (MB per file, number of rotated files kept)
+LOG_DIR = BASE_DIR / "logs"
+LOG_LEVEL = os.environ.get("MSA_LOG_LEVEL", "DEBUG").upper()
+LOG_FILE_MAX_MB = int(os.environ.get("MSA_LOG_FILE_MAX_MB", "10"))
+LOG_BACKUP_COUNT = 3
+
+# Compiled bundle of the data directory's JSON files and name index, built by
+# `main.py --build-data-bundle`; "0" always reads the JSON files
+DATA_BUNDLE_NAME = "reference_data.bundle"
+DATA_BUNDLE_ENABLED = os.environ.get("MSA_DATA_BUNDLE", "1") != "0"
+
+# PDF text/table extraction backend: "auto", "pymupdf" or "pdfplumber"
+PDF_BACKEND = os.environ.get("MSA_PDF_BACKEND", "auto")
+
+# On-disk LRU cache of rendered PDF reports used by the CLI, GUI and batch
+# runs, kept in this subdirectory of the report output directory. Off (0)
+# unless a size in MB is given, as the cache keeps copies of patient reports
+REPORT_CACHE_DIR_NAME = ".report_cache"
+REPORT_CACHE_MAX_MB = int(os.environ.get("MSA_REPORT_CACHE_MB", "0"))
+
+# Worker processes rendering PDF reports for the web dashboard
+REPORT_RENDER_WORKERS = int(os.environ.get("MSA_REPORT_RENDER_WORKERS", "2"))
+
+# OCR rendering: PyMuPDF zoom factors (1.0 = 72 DPI) and tesseract confidence (0-100)
+# below which the result-table region is re-rendered at the higher zoom
+OCR_BASE_ZOOM = 1.5
+OCR_MAX_ZOOM = 3.0
+OCR_MIN_CONFIDENCE = 75
+
+# Fuzzy matching of test names read from documents (edit similarity of the
+# closest trigram candidates, 0-1): names scoring at least the match threshold
+# are accepted, those above the near-miss threshold are recorded for review
+FUZZY_MATCH_THRESHOLD = float(os.environ.get("MSA_FUZZY_MATCH_THRESHOLD", "0.85"))
+FUZZY_NEAR_MISS_THRESHOLD = 0.6
+
+# Document parsing strategies run in order (tables, text layer, OCR) until one
+# scores at least PARSE_ACCEPT_SCORE (0-1); PARSE_FULL_PANEL_TESTS recognised
+# tests count as a complete panel. No new strategy is started once a document
+# has used PARSE_TIME_BUDGET seconds.
+PARSE_ACCEPT_SCORE = 0.85
+PARSE_FULL_PANEL_TESTS = 5
+PARSE_TIME_BUDGET = float(os.environ.get("MSA_PARSE_TIME_BUDGET", "30"))
+
+# Sandboxed parse workers: each document is parsed in a subprocess with a
+# wall-clock deadline and CPU-time limit (seconds) and an address-space limit
+# (MB); workers are replaced after PARSE_WORKER_MAX_JOBS documents. The CLI,
+# GUI, batch and inbox modes parse PDF/DOCX documents this way unless
+# MSA_PARSE_IN_WORKERS is "0", which parses them in-process without limits
+PARSE_IN_WORKERS = os.environ.get("MSA_PARSE_IN_WORKERS", "1") != "0"
+PARSE_WORKERS = int(os.environ.get("MSA_PARSE_WORKERS", min(4, os.cpu_count() or 1)))
+PARSE_WORKER_TIMEOUT = float(os.environ.get("MSA_PARSE_WORKER_TIMEOUT", "60"))
+PARSE_WORKER_CPU_LIMIT = int(os.environ.get("MSA_PARSE_WORKER_CPU_LIMIT", "60"))
+PARSE_WORKER_MEMORY_LIMIT_MB = int(os.environ.get("MSA_PARSE_WORKER_MEMORY_MB", "2048"))
+PARSE_WORKER_MAX_JOBS = 50
+
+# Inbox watcher: seconds between directory scans, and number of consecutive
+# scans a file's size and mtime must stay unchanged before it is processed
+INBOX_POLL_INTERVAL = float(os.environ.get("MSA_INBOX_POLL_INTERVAL", "2"))
+INBOX_STABLE_POLLS = 2
+
+# Columnar cohort store: rows buffered by the writer and scanned per chunk by
+# the readers, bounding memory regardless of cohort size
+COHORT_CHUNK_ROWS = int(os.environ.get("MSA_COHORT_CHUNK_ROWS", "1000000"))
+
 SAMPLE_PATIENT_FILE = EXAMPLES_DIR / "sample_patient.json"
 SAMPLE_BLOOD_TESTS_FILE = EXAMPLES_DIR / "sample_blood_tests.json"
 
@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 from pathlib import Path
 
 from src.models.blood_test import BloodTest
@@ -13,32 +13,36 @@ from src.core.interpretation_engine import InterpretationEngine
 from src.utils.data_loader import DataLoader
 from src.utils.i18n import t
 from src.utils.logger import get_logger
+from src.utils.name_resolver import NameResolver, get_name_resolver, index_by_test_id
 from config import DATA_DIR
 
 logger = get_logger(__name__)
 
 
 class AdvancedAnalyzer:
-    def __init__(self, data_dir: Path = DATA_DIR):
+    def __init__(
+        self, data_dir: Path = DATA_DIR, name_resolver: Optional[NameResolver] = None
+    ):
         self.data_loader = DataLoader(data_dir)
-        self.interpretation_engine = InterpretationEngine(data_dir)
+        self.name_resolver = name_resolver or get_name_resolver(data_dir)
+        self.interpretation_engine = InterpretationEngine(data_dir, self.name_resolver)
         self.supplements_data = self._load_supplements()
         self.test_categories = self._load_test_categories()
 
-    def _load_test_categories(self) -> Dict[str, List[str]]:
+    def _load_test_categories(self) -> Dict[str, Set[str]]:
         """Load test categories from JSON config file."""
         try:
             data = self.data_loader.load_json("test_categories.json")
             categories = data.get("categories", {})
-            # Flatten categories into lookup dict: category -> list of test names (uppercase)
-            return {
-                cat_name: [name.upper() for name in cat_data.get("tests", [])]
+            # Flatten categories into lookup dict: category -> list of test names
+            names = {
+                cat_name: cat_data.get("tests", [])
                 for cat_name, cat_data in categories.items()
             }
         except (FileNotFoundError, KeyError, TypeError) as e:
             # Fallback to hardcoded lists if config fails to load
-            logger.error(f"Failed to load test_categories.json: {e}")
-            return {
+            logger.error("Failed to load test_categories.json: %s", e)
+            names = {
                 "morphology": [
                     "EOZYNOFILE",
                     "LEUKOCYTY",
@@ -96,16 +100,22 @@ class AdvancedAnalyzer:
                 "glucose_insulin": ["GLUKOZA", "INSULINA", "HBA1C", "HOMA-IR"],
             }
 
+        # Categories are matched by canonical ID, so any spelling of a test counts
+        return {
+            cat_name: {self.name_resolver.canonical_id(name) for name in tests}
+            for cat_name, tests in names.items()
+        }
+
     def _load_supplements(self) -> Dict[str, Any]:
         try:
             data = self.data_loader.load_json("supplements_v2.json")
             supplements = {}
             for supp in data.get("supplements", []):
                 supplements[supp["id"]] = supp
-            logger.info(f"Loaded {len(supplements)} supplements from database")
+            logger.info("Loaded %s supplements from database", len(supplements))
             return supplements
         except (FileNotFoundError, KeyError, TypeError) as e:
-            logger.error(f"Failed to load supplements_v2.json: {e}")
+            logger.error("Failed to load supplements_v2.json: %s", e)
             return {}
 
     def analyze_blood_tests(
@@ -167,26 +177,44 @@ class AdvancedAnalyzer:
         )
 
     def _is_morphology_test(self, name: str) -> bool:
-        return name.upper() in self.test_categories.get("morphology", [])
+        return self._in_category(name, "morphology")
 
     def _is_inflammatory_marker(self, name: str) -> bool:
-        return name.upper() in self.test_categories.get("inflammatory", [])
+        return self._in_category(name, "inflammatory")
 
     def _is_mineral_vitamin(self, name: str) -> bool:
-        return name.upper() in self.test_categories.get("minerals_vitamins", [])
+        return self._in_category(name, "minerals_vitamins")
 
     def _is_electrolyte(self, name: str) -> bool:
-        return name.upper() in self.test_categories.get("electrolytes", [])
+        return self._in_category(name, "electrolytes")
+
+    def _in_category(self, name: str, category: str) -> bool:
+        return self.name_resolver.canonical_id(name) in self.test_categories.get(
+            category, ()
+        )
+
+    def _tests_by_id(self, tests: List[BloodTest]) -> Dict[str, BloodTest]:
+        """Map canonical test IDs to tests, so any spelling of a test is found."""
+        canonical_id = self.name_resolver.canonical_id
+        return index_by_test_id(
+            ((canonical_id(test.name), test.name, test) for test in tests), "blood tests"
+        )
+
+    def _get_test(
+        self, test_dict: Dict[str, BloodTest], name: str
+    ) -> Optional[BloodTest]:
+        return test_dict.get(self.name_resolver.canonical_id(name))
 
     def _analyze_thyroid(self, tests: List[BloodTest]) -> Optional[Any]:
-        test_dict = {test.name.upper(): test for test in tests}
+        test_dict = self._tests_by_id(tests)
 
-        if "TSH" not in test_dict:
+        tsh_test = self._get_test(test_dict, "TSH")
+        if tsh_test is None:
             return None
 
-        tsh = test_dict["TSH"].value
-        ft3 = test_dict.get("FT3")
-        ft4 = test_dict.get("FT4")
+        tsh = tsh_test.value
+        ft3 = self._get_test(test_dict, "FT3")
+        ft4 = self._get_test(test_dict, "FT4")
 
         ft3_val = ft3.value if ft3 else 0
         ft4_val = ft4.value if ft4 else 0
@@ -281,12 +309,12 @@ class AdvancedAnalyzer:
         return 0
 
     def _analyze_lipids(self, tests: List[BloodTest]) -> Optional[Any]:
-        test_dict = {test.name.upper(): test for test in tests}
+        test_dict = self._tests_by_id(tests)
 
-        cholesterol_test = test_dict.get("CHOLESTEROL")
-        hdl_test = test_dict.get("HDL")
-        ldl_test = test_dict.get("LDL")
-        tg_test = test_dict.get("TG")
+        cholesterol_test = self._get_test(test_dict, "CHOLESTEROL")
+        hdl_test = self._get_test(test_dict, "HDL")
+        ldl_test = self._get_test(test_dict, "LDL")
+        tg_test = self._get_test(test_dict, "TG")
 
         cholesterol = cholesterol_test.value if cholesterol_test else 0
         hdl = hdl_test.value if hdl_test else 0
@@ -301,11 +329,11 @@ class AdvancedAnalyzer:
         )
 
     def _analyze_liver(self, tests: List[BloodTest]) -> Optional[Any]:
-        test_dict = {test.name.upper(): test for test in tests}
+        test_dict = self._tests_by_id(tests)
 
-        ast_test = test_dict.get("AST")
-        alt_test = test_dict.get("ALT")
-        ggtp_test = test_dict.get("GGTP")
+        ast_test = self._get_test(test_dict, "AST")
+        alt_test = self._get_test(test_dict, "ALT")
+        ggtp_test = self._get_test(test_dict, "GGTP")
 
         ast = ast_test.value if ast_test else 0
         alt = alt_test.value if alt_test else 0
@@ -317,12 +345,12 @@ class AdvancedAnalyzer:
         return self.interpretation_engine.interpret_liver_panel(ast, alt, ggtp)
 
     def _analyze_hormones(self, tests: List[BloodTest]) -> Optional[Any]:
-        test_dict = {test.name.upper(): test for test in tests}
+        test_dict = self._tests_by_id(tests)
 
-        lh_test = test_dict.get("LH")
-        fsh_test = test_dict.get("FSH")
-        e2_test = test_dict.get("ESTRADIOL")
-        prog_test = test_dict.get("PROGESTERON")
+        lh_test = self._get_test(test_dict, "LH")
+        fsh_test = self._get_test(test_dict, "FSH")
+        e2_test = self._get_test(test_dict, "ESTRADIOL")
+        prog_test = self._get_test(test_dict, "PROGESTERON")
 
         lh = lh_test.value if lh_test else 0
         fsh = fsh_test.value if fsh_test else 0
@@ -1,5 +1,10 @@
-from src.models.blood_test import BloodTest
-from typing import List, Dict, Literal
+from src.models.blood_test import BloodTest, BloodTestRecord
+from src.utils.name_resolver import NameResolver, get_name_resolver, index_by_test_id
+from typing import TYPE_CHECKING, List, Dict, Literal, Optional
+from config import COHORT_CHUNK_ROWS
+
+if TYPE_CHECKING:
+    from src.core.cohort_store import CohortStore
 
 
 class Analyzer:
@@ -9,30 +14,92 @@ class Analyzer:
     based on predefined reference ranges.
     """
 
-    def __init__(self, reference_ranges: Dict):
+    def __init__(
+        self, reference_ranges: Dict, name_resolver: Optional[NameResolver] = None
+    ):
         if "reference_ranges" not in reference_ranges:
             raise ValueError("Missing 'reference_ranges' key in reference data")
         self.reference_ranges = reference_ranges["reference_ranges"]
-        self._lookup: Dict[str, Dict] = {
-            ref["name"]: ref for ref in self.reference_ranges
-        }
+        self.name_resolver = name_resolver or get_name_resolver()
+        # Keyed by canonical test ID so any spelling of a test finds its range
+        canonical_id = self.name_resolver.canonical_id
+        self._lookup: Dict[str, Dict] = index_by_test_id(
+            ((canonical_id(ref["name"]), ref["name"], ref) for ref in self.reference_ranges),
+            "reference ranges",
+        )
 
     def analyze_blood_tests(self, blood_tests: List[BloodTest]) -> List[BloodTest]:
-        analyzed_tests = []
+        """Analyze tests into BloodTest models, for callers outside the engines.
+
+        Tests without a reference range keep the status they came with.
+        """
+        canonical_id = self.name_resolver.canonical_id
+        # Values come from validated BloodTests, so skip revalidation
+        return [
+            BloodTest.model_construct(
+                name=test.name,
+                value=test.value,
+                unit=test.unit,
+                status=self._status(canonical_id(test.name), test.value, test.status),
+            )
+            for test in blood_tests
+        ]
+
+    def analyze_records(self, blood_tests: List[BloodTest]) -> List[BloodTestRecord]:
+        """Analyze tests into compact records for use by the other engines.
+
+        Tests without a reference range keep the status they came with.
+        """
+        canonical_id = self.name_resolver.canonical_id
+        records = []
 
         for test in blood_tests:
-            ref_range = self._find_reference_range(test.name)
+            record = BloodTestRecord.from_model(test, canonical_id(test.name))
+            record.status = self._status(record.test_id, record.value, record.status)
+            records.append(record)
+
+        return records
+
+    def analyze_cohort(
+        self, store: "CohortStore", chunk_rows: int = COHORT_CHUNK_ROWS
+    ) -> None:
+        """Set the status column of a writable cohort store, chunk by chunk.
+
+        Rows of tests without a reference range keep their stored status.
+        """
+        import numpy as np
+
+        from src.core.cohort_store import STATUS_CODES
 
+        # Reference range per test code; NaN where the test has none
+        minima = np.full(len(store.test_ids), np.nan)
+        maxima = np.full(len(store.test_ids), np.nan)
+        for code, test_id in enumerate(store.test_ids):
+            ref_range = self._lookup.get(test_id)
             if ref_range:
-                status = self._determine_status(test.value, ref_range)
-                test = test.model_copy(update={"status": status})
+                minima[code] = ref_range["min"]
+                maxima[code] = ref_range["max"]
 
-            analyzed_tests.append(test)
+        for rows in store.chunks(chunk_rows):
+            codes = store.test[rows]
+            values = store.value[rows]
+            low, high = minima[codes], maxima[codes]
+            status = np.full(len(codes), STATUS_CODES["normal"], dtype=np.int8)
+            status[values < low] = STATUS_CODES["low"]
+            status[values > high] = STATUS_CODES["high"]
+            store.status[rows] = np.where(np.isnan(low), store.status[rows], status)
+        store.flush()
 
-        return analyzed_tests
+    def _status(
+        self, test_id: str, value: float, status: Literal["low", "normal", "high"] | None
+    ) -> Literal["low", "normal", "high"] | None:
+        ref_range = self._lookup.get(test_id)
+        if ref_range:
+            return self._determine_status(value, ref_range)
+        return status
 
     def _find_reference_range(self, test_name: str) -> Dict | None:
-        return self._lookup.get(test_name)
+        return self._lookup.get(self.name_resolver.canonical_id(test_name))
 
     def _determine_status(
         self, value: float, ref_range: Dict
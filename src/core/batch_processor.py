@@ -0,0 +1,456 @@
+"""
+Bulk processing of a directory of blood test reports.
+
+BatchProcessor parses, validates and analyzes every matching document in a
+directory and writes one PDF report per document. Documents are processed
+in parallel worker processes that load the reference data and build the
+engines once, instead of once per document. Progress is recorded in a
+checkpoint file after every document, so an interrupted run can be resumed
+without redoing finished documents, and a JSON summary lists failures and
+per-stage timings.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from src.core.recommendation_engine import RecommendationEngine
+from src.utils.data_loader import DataLoader
+from src.utils.exporters import EXPORTERS
+from src.utils.filenames import sanitize_filename
+from src.utils.json_parser import JSONParser
+from src.utils.logger import get_logger, init_worker_logging, worker_log_queue
+from src.utils.exceptions import (
+    AnalysisError,
+    DataLoaderError,
+    RuleEngineError,
+    ValidationError,
+)
+from src.utils.validator import Validator
+from config import DATA_DIR
+
+if TYPE_CHECKING:
+    from src.utils.document_parser import DocumentParser
+    from src.utils.formatter import PDFFormatter
+    from src.utils.parse_workers import ParseWorkerPool
+
+logger = get_logger(__name__)
+
+SUPPORTED_SUFFIXES = (".pdf", ".docx", ".json")
+
+CHECKPOINT_VERSION = 2
+
+# Exceptions whose str() already starts with the class name
+_NAMED_ERRORS = (AnalysisError, DataLoaderError, RuleEngineError, ValidationError)
+
+
+class DocumentPipeline:
+    """Parse -> validate -> recommend -> report for single documents, engines built once."""
+
+    def __init__(self, output_dir: Path, data_dir: Path = DATA_DIR, report_format: str = "pdf"):
+        loader = DataLoader(data_dir)
+        self.recommendation_engine = RecommendationEngine(
+            reference_ranges=loader.load_reference_ranges(),
+            supplements=loader.load_supplements(),
+            timing_rules=loader.load_timing_rules(),
+            dosage_rules=loader.load_dosage_rules(),
+        )
+        self.json_parser = JSONParser()
+        self.validator = Validator()
+        self.output_dir = Path(output_dir)
+        self.report_format = report_format
+        self._document_parser: Optional[Union["ParseWorkerPool", "DocumentParser"]] = None
+        self._formatter: Optional["PDFFormatter"] = None
+
+    @property
+    def document_parser(self) -> Union["ParseWorkerPool", "DocumentParser"]:
+        """PDF/DOCX parser of this process (see get_document_parser), taken on first use."""
+        if self._document_parser is None:
+            from src.utils.parse_workers import get_document_parser
+
+            self._document_parser = get_document_parser()
+        return self._document_parser
+
+    @property
+    def formatter(self) -> "PDFFormatter":
+        """PDF report formatter, imported and built on first use."""
+        if self._formatter is None:
+            from src.utils.formatter import PDFFormatter
+            from src.utils.report_cache import get_report_cache
+
+            self._formatter = PDFFormatter(self.output_dir, get_report_cache(self.output_dir))
+        return self._formatter
+
+    def process(self, file_path: Path, report_name: str) -> Dict[str, Any]:
+        """
+        Process one document into a report in the pipeline's format.
+
+        Args:
+            file_path: PDF, DOCX or JSON document
+            report_name: File name of the report in the output directory
+
+        Returns:
+            Dictionary with report path, supplement count and stage timings
+
+        Raises:
+            DataLoaderError, ValidationError, ValueError: If the document
+                cannot be parsed or its data is invalid
+        """
+        timings: Dict[str, float] = {}
+
+        started = time.perf_counter()
+        if file_path.suffix.lower() == ".json":
+            parsed_data = self.json_parser.parse_document(file_path)
+        else:
+            parsed_data = self.document_parser.parse_document(file_path)
+        timings["parse"] = time.perf_counter() - started
+
+        patient_data = parsed_data.get("patient")
+        blood_tests_data = parsed_data.get("blood_tests")
+        if not patient_data or not patient_data.get("name"):
+            raise ValueError("Patient data not found")
+        if not blood_tests_data:
+            raise ValueError("No blood tests found")
+
+        started = time.perf_counter()
+        patient = self.validator.validate_patient(patient_data)
+        blood_tests = self.validator.validate_blood_tests(blood_tests_data)
+        recommendation = self.recommendation_engine.generate_recommendation(
+            patient, blood_tests
+        )
+        timings["analyze"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        if self.report_format == "pdf":
+            report_path = self.formatter.generate_pdf(recommendation, filename=report_name)
+        else:
+            report_path = self.output_dir / report_name
+            with EXPORTERS[self.report_format](report_path) as exporter:
+                exporter.export(recommendation)
+        timings["render"] = time.perf_counter() - started
+
+        return {
+            "report": str(report_path),
+            "supplements": len(recommendation.supplements),
+            "timings": timings,
+        }
+
+    def recommend_records(
+        self, records: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Validate and analyze parsed records lazily, one at a time.
+
+        Records are pulled from the iterable only as output rows are
+        consumed, so a streaming reader and writer on either side keep
+        memory constant. Invalid records produce a failed row instead of
+        stopping the stream.
+
+        Args:
+            records: Dictionaries with 'patient' and 'blood_tests' keys
+
+        Yields:
+            Rows with the record index, status and either the patient,
+            analyzed blood tests and recommendation, or the error
+        """
+        analyzer = self.recommendation_engine.analyzer
+        for index, record in enumerate(records):
+            try:
+                patient = self.validator.validate_patient(record["patient"])
+                blood_tests = self.validator.validate_blood_tests(record["blood_tests"])
+            except ValidationError as e:
+                yield {"record": index, "status": "failed", "error": str(e)}
+                continue
+
+            recommendation = self.recommendation_engine.generate_recommendation(
+                patient, blood_tests
+            )
+            yield {
+                "record": index,
+                "status": "ok",
+                "patient": patient.model_dump(),
+                "blood_tests": [
+                    test.model_dump() for test in analyzer.analyze_blood_tests(blood_tests)
+                ],
+                "recommendation": recommendation.model_dump(mode="json"),
+            }
+
+
+# Pipeline of the current worker process, built by _init_worker
+_worker_pipeline: Optional[DocumentPipeline] = None
+
+
+def _init_worker(
+    output_dir: Path, data_dir: Path, report_format: str = "pdf", log_queue=None
+) -> None:
+    global _worker_pipeline
+    init_worker_logging(log_queue)
+    _worker_pipeline = DocumentPipeline(output_dir, data_dir, report_format)
+
+
+def _process_in_worker(file_path: Path, report_name: str) -> Dict[str, Any]:
+    return _run_pipeline(_worker_pipeline, file_path, report_name)
+
+
+def _run_pipeline(
+    pipeline: DocumentPipeline, file_path: Path, report_name: str
+) -> Dict[str, Any]:
+    """Process a document, turning any failure into a failed result."""
+    started = time.perf_counter()
+    try:
+        result = pipeline.process(file_path, report_name)
+        result["status"] = "ok"
+    except Exception as e:
+        logger.warning("Batch processing of %s failed: %s", file_path, e)
+        result = {"status": "failed", "error": _error_message(e)}
+    result["elapsed"] = time.perf_counter() - started
+    return result
+
+
+def _error_message(error: Exception) -> str:
+    """Error text for the summary, naming the exception class once."""
+    if isinstance(error, _NAMED_ERRORS):
+        return str(error)
+    return f"{type(error).__name__}: {error}"
+
+
+def _file_signature(path: Path) -> List[int]:
+    """[size, mtime_ns] of a file, to notice documents replaced between runs."""
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    """Write JSON to a temporary file and rename it, so readers never see a partial file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+class BatchCheckpoint:
+    """Results of finished documents, persisted after every document.
+
+    Each result is stored with the document's size and mtime at the time it
+    was processed; a document that has changed since is processed again.
+    """
+
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+        self.results: Dict[str, Dict[str, Any]] = {}
+        if path is not None and path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == CHECKPOINT_VERSION:
+                    self.results = data.get("files", {})
+            except (json.JSONDecodeError, UnicodeDecodeError, OSError) as e:
+                logger.warning("Ignoring unreadable checkpoint %s: %s", path, e)
+
+    def is_done(self, file_path: Path, signature: List[int]) -> bool:
+        result = self.results.get(str(file_path), {})
+        return result.get("status") == "ok" and result.get("signature") == signature
+
+    def record(self, file_path: Path, signature: List[int], result: Dict[str, Any]) -> None:
+        self.results[str(file_path)] = {**result, "signature": signature}
+        if self.path is not None:
+            _write_json_atomic(
+                self.path, {"version": CHECKPOINT_VERSION, "files": self.results}
+            )
+
+
+class BatchProcessor:
+    """
+    Processes all documents in a directory in parallel.
+
+    Example:
+        processor = BatchProcessor(OUTPUT_DIR, workers=4,
+                                   checkpoint_path=OUTPUT_DIR / "batch_checkpoint.json")
+        summary = processor.run(Path("inbox"), "*.pdf")
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        workers: Optional[int] = None,
+        checkpoint_path: Optional[Path] = None,
+        data_dir: Path = DATA_DIR,
+        report_format: str = "pdf",
+    ):
+        """
+        Args:
+            output_dir: Directory the reports are written to
+            workers: Number of worker processes (default: CPU count); with 1
+                documents are processed in the calling process
+            checkpoint_path: File recording finished documents, or None
+            data_dir: Reference data directory
+            report_format: "pdf", or a lightweight format from EXPORTERS
+        """
+        self.output_dir = Path(output_dir)
+        self.workers = workers or os.cpu_count() or 1
+        self.checkpoint = BatchCheckpoint(checkpoint_path)
+        self.data_dir = data_dir
+        self.report_format = report_format
+
+    @staticmethod
+    def find_documents(input_dir: Path, pattern: str = "*") -> List[Path]:
+        """Supported documents in input_dir matching a glob pattern, sorted."""
+        return sorted(
+            path
+            for path in Path(input_dir).glob(pattern)
+            if path.is_file() and path.suffix.lower() in SUPPORTED_SUFFIXES
+        )
+
+    @staticmethod
+    def report_name(input_dir: Path, file_path: Path, report_format: str = "pdf") -> str:
+        """Report file name derived from the document's path relative to input_dir.
+
+        The document's extension is kept, so x.pdf and x.docx get different
+        names (x_pdf_supplements.pdf and x_docx_supplements.pdf).
+        """
+        relative = file_path.relative_to(input_dir)
+        parts = [*relative.parent.parts, relative.stem, relative.suffix.lstrip(".").lower()]
+        return sanitize_filename("_".join(parts)) + f"_supplements.{report_format}"
+
+    @classmethod
+    def report_names(
+        cls, input_dir: Path, documents: List[Path], report_format: str = "pdf"
+    ) -> Dict[Path, str]:
+        """
+        Report file name per document, unique within the run.
+
+        Names that still collide after sanitizing (e.g. a/b.pdf and a_b.pdf)
+        get a numeric suffix, in document order so resumed runs reuse them.
+        """
+        names: Dict[Path, str] = {}
+        taken = set()
+        for path in documents:
+            name = base = cls.report_name(input_dir, path, report_format)
+            attempt = 1
+            while name in taken:
+                attempt += 1
+                stem, suffix = base.rsplit("_supplements.", 1)
+                name = f"{stem}_{attempt}_supplements.{suffix}"
+            taken.add(name)
+            names[path] = name
+        return names
+
+    def run(
+        self,
+        input_dir: Path,
+        pattern: str = "*",
+        on_result: Optional[Callable[[Path, Dict[str, Any], int, int], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Process every matching document that the checkpoint does not list as done.
+
+        Args:
+            input_dir: Directory with the documents
+            pattern: Glob pattern relative to input_dir, e.g. "*.pdf" or "**/*"
+            on_result: Called as on_result(file, result, finished, total)
+                after each document, e.g. to display progress
+
+        Returns:
+            Summary dictionary (see _summarize)
+        """
+        input_dir = Path(input_dir)
+        started = time.perf_counter()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        documents = self.find_documents(input_dir, pattern)
+        report_names = self.report_names(input_dir, documents, self.report_format)
+        signatures = {path: _file_signature(path) for path in documents}
+        pending = [
+            path for path in documents if not self.checkpoint.is_done(path, signatures[path])
+        ]
+        skipped = len(documents) - len(pending)
+        if skipped:
+            logger.info("Skipping %s documents already processed", skipped)
+
+        results: Dict[Path, Dict[str, Any]] = {}
+
+        def finish(path: Path, result: Dict[str, Any]) -> None:
+            results[path] = result
+            self.checkpoint.record(path, signatures[path], result)
+            if on_result is not None:
+                on_result(path, result, len(results), len(pending))
+
+        if pending and (self.workers == 1 or len(pending) == 1):
+            pipeline = DocumentPipeline(self.output_dir, self.data_dir, self.report_format)
+            for path in pending:
+                finish(path, _run_pipeline(pipeline, path, report_names[path]))
+        elif pending:
+            with ProcessPoolExecutor(
+                max_workers=min(self.workers, len(pending)),
+                initializer=_init_worker,
+                initargs=(self.output_dir, self.data_dir, self.report_format, worker_log_queue()),
+            ) as executor:
+                futures = {
+                    executor.submit(_process_in_worker, path, report_names[path]): path
+                    for path in pending
+                }
+                for future in as_completed(futures):
+                    path = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # The worker process itself failed (e.g. was killed)
+                        result = {"status": "failed", "error": _error_message(e), "elapsed": 0.0}
+                    finish(path, result)
+
+        return self._summarize(
+            input_dir, pattern, results, skipped, time.perf_counter() - started
+        )
+
+    def _summarize(
+        self,
+        input_dir: Path,
+        pattern: str,
+        results: Dict[Path, Dict[str, Any]],
+        skipped: int,
+        elapsed: float,
+    ) -> Dict[str, Any]:
+        """Build the run summary: counts, failures and per-stage timings."""
+        failures = [
+            {"file": str(path), "error": result["error"]}
+            for path, result in sorted(results.items())
+            if result["status"] != "ok"
+        ]
+        stage_totals: Dict[str, float] = {}
+        succeeded = 0
+        for result in results.values():
+            if result["status"] != "ok":
+                continue
+            succeeded += 1
+            for stage, seconds in result["timings"].items():
+                stage_totals[stage] = stage_totals.get(stage, 0.0) + seconds
+
+        return {
+            "input_dir": str(input_dir),
+            "pattern": pattern,
+            "processed": len(results),
+            "succeeded": succeeded,
+            "failed": len(failures),
+            "skipped": skipped,
+            "workers": self.workers,
+            "elapsed": elapsed,
+            "failures": failures,
+            "timings": {
+                "total": stage_totals,
+                "mean": {
+                    stage: total / succeeded for stage, total in stage_totals.items()
+                },
+                "files": {
+                    str(path): {"elapsed": result["elapsed"], **result.get("timings", {})}
+                    for path, result in sorted(results.items())
+                },
+            },
+        }
+
+    @staticmethod
+    def write_summary(summary: Dict[str, Any], path: Path) -> None:
+        """Write a run summary as JSON."""
+        _write_json_atomic(Path(path), summary)
@@ -0,0 +1,316 @@
+"""
+Columnar storage of blood test results for population analytics.
+
+A cohort is stored as one row per (patient, test, value, status) result,
+split into columns saved as separate ``.npy`` files:
+
+    patient.npy  int32    index into the patient IDs of the metadata index
+    test.npy     int32    index into the canonical test IDs
+    value.npy    float64  measured value
+    status.npy   int8     STATUS_CODES code (0 = no reference range)
+
+``index.json`` holds the format version, row count and the interned
+patient and test IDs. Columns are opened as memory maps, so scanning a
+multi-GB cohort only keeps the chunk being processed in memory.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from src.models.blood_test import BloodTest, BloodTestRecord
+from src.utils.exceptions import DataLoaderError
+from src.utils.logger import get_logger
+from src.utils.name_resolver import NameResolver, get_name_resolver
+from config import COHORT_CHUNK_ROWS
+
+logger = get_logger(__name__)
+
+COHORT_FORMAT_VERSION = 1
+INDEX_FILE = "index.json"
+
+STATUSES = (None, "low", "normal", "high")
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+COLUMNS = {
+    "patient": np.dtype(np.int32),
+    "test": np.dtype(np.int32),
+    "value": np.dtype(np.float64),
+    "status": np.dtype(np.int8),
+}
+
+
+class CohortStoreWriter:
+    """
+    Writes a cohort store row by row with bounded memory.
+
+    Rows are buffered and appended to the column files in chunks; the final
+    ``.npy`` files and the metadata index are written by close(). An
+    existing store in the directory is replaced. If the ``with`` block
+    raises, the partial data is discarded and an existing store is kept.
+
+    Example:
+        with CohortStoreWriter(Path("cohort")) as writer:
+            for patient_id, blood_tests in panels:
+                writer.add_panel(patient_id, blood_tests)
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        name_resolver: Optional[NameResolver] = None,
+        buffer_rows: int = COHORT_CHUNK_ROWS,
+    ):
+        """
+        Args:
+            path: Store directory, created if missing
+            name_resolver: Resolver mapping test names to canonical IDs
+            buffer_rows: Rows held in memory before they are written out
+        """
+        self.path = Path(path)
+        self.name_resolver = name_resolver or get_name_resolver()
+        self.buffer_rows = max(1, buffer_rows)
+        self.rows = 0
+
+        self._patient_codes: Dict[str, int] = {}
+        self._test_codes: Dict[str, int] = {}
+        self._buffers: Dict[str, List] = {column: [] for column in COLUMNS}
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._parts = {column: open(self._part_path(column), "wb") for column in COLUMNS}
+
+    def add(
+        self,
+        patient_id: str,
+        test_id: str,
+        value: float,
+        status: Optional[str] = None,
+    ) -> None:
+        """Add one result; test_id must already be a canonical test ID."""
+        patient_code = self._patient_codes.setdefault(patient_id, len(self._patient_codes))
+        test_code = self._test_codes.setdefault(test_id, len(self._test_codes))
+        buffers = self._buffers
+        buffers["patient"].append(patient_code)
+        buffers["test"].append(test_code)
+        buffers["value"].append(value)
+        buffers["status"].append(STATUS_CODES[status])
+        if len(buffers["value"]) >= self.buffer_rows:
+            self._flush()
+
+    def add_records(self, patient_id: str, records: Iterable[BloodTestRecord]) -> None:
+        """Add a panel of records from Analyzer.analyze_records."""
+        for record in records:
+            self.add(patient_id, record.test_id, record.value, record.status)
+
+    def add_panel(self, patient_id: str, blood_tests: Iterable[BloodTest]) -> None:
+        """Add a panel of blood tests, resolving their names to canonical IDs."""
+        canonical_id = self.name_resolver.canonical_id
+        for test in blood_tests:
+            self.add(patient_id, canonical_id(test.name), test.value, test.status)
+
+    def close(self) -> None:
+        """Write the column files and the metadata index."""
+        if self._parts is None:
+            return
+        self._flush()
+        for column, part in self._parts.items():
+            part.close()
+            self._finalize_column(column)
+        self._parts = None
+
+        index = {
+            "version": COHORT_FORMAT_VERSION,
+            "rows": self.rows,
+            "patients": list(self._patient_codes),
+            "tests": list(self._test_codes),
+        }
+        tmp_path = self.path / (INDEX_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path / INDEX_FILE)
+        logger.info(
+            "Wrote cohort store %s: %s rows, %s patients, %s tests",
+            self.path,
+            self.rows,
+            len(self._patient_codes),
+            len(self._test_codes),
+        )
+
+    def abort(self) -> None:
+        """Discard the rows written so far, leaving any existing store intact."""
+        if self._parts is None:
+            return
+        for column, part in self._parts.items():
+            part.close()
+            self._part_path(column).unlink(missing_ok=True)
+        self._parts = None
+        for buffer in self._buffers.values():
+            buffer.clear()
+
+    def _part_path(self, column: str) -> Path:
+        return self.path / f"{column}.npy.part"
+
+    def _flush(self) -> None:
+        count = len(self._buffers["value"])
+        if not count:
+            return
+        for column, dtype in COLUMNS.items():
+            np.asarray(self._buffers[column], dtype=dtype).tofile(self._parts[column])
+            self._buffers[column].clear()
+        self.rows += count
+
+    def _finalize_column(self, column: str) -> None:
+        """Prefix the raw column data with an .npy header."""
+        part_path = self._part_path(column)
+        final_path = self.path / f"{column}.npy"
+        header = {
+            "descr": np.lib.format.dtype_to_descr(COLUMNS[column]),
+            "fortran_order": False,
+            "shape": (self.rows,),
+        }
+        with open(final_path, "wb") as out, open(part_path, "rb") as data:
+            np.lib.format.write_array_header_2_0(out, header)
+            shutil.copyfileobj(data, out, 1024 * 1024)
+        part_path.unlink()
+
+    def __enter__(self) -> "CohortStoreWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if exc[0] is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+class CohortStore:
+    """
+    Read access to a cohort store through memory-mapped columns.
+
+    Example:
+        store = CohortStore(Path("cohort"))
+        stats = store.summary()["WITAMINA D3"]
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        writable: bool = False,
+        name_resolver: Optional[NameResolver] = None,
+    ):
+        """
+        Args:
+            path: Store directory
+            writable: Open the status column for writing (see
+                Analyzer.analyze_cohort)
+            name_resolver: Resolver mapping test names to canonical IDs
+
+        Raises:
+            DataLoaderError: If the store is missing or has another format version
+        """
+        self.path = Path(path)
+        self.name_resolver = name_resolver or get_name_resolver()
+        index_path = self.path / INDEX_FILE
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise DataLoaderError(f"Cannot read cohort index: {e}", str(index_path)) from e
+        if index.get("version") != COHORT_FORMAT_VERSION:
+            raise DataLoaderError(
+                f"Unsupported cohort store version {index.get('version')}", str(index_path)
+            )
+
+        self.patient_ids: List[str] = index["patients"]
+        self.test_ids: List[str] = index["tests"]
+        self._test_codes = {test_id: code for code, test_id in enumerate(self.test_ids)}
+
+        self.patient = self._open_column("patient", "r")
+        self.test = self._open_column("test", "r")
+        self.value = self._open_column("value", "r")
+        self.status = self._open_column("status", "r+" if writable else "r")
+        if len(self.value) != index["rows"]:
+            raise DataLoaderError("Cohort columns do not match the index", str(self.path))
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def test_code(self, name: str) -> Optional[int]:
+        """Column code of a test given by any of its names, None if absent."""
+        return self._test_codes.get(self.name_resolver.canonical_id(name))
+
+    def chunks(self, chunk_rows: int = COHORT_CHUNK_ROWS) -> Iterator[slice]:
+        """Row slices covering the store, chunk_rows at a time."""
+        for start in range(0, len(self), max(1, chunk_rows)):
+            yield slice(start, min(start + chunk_rows, len(self)))
+
+    def values_for(self, name: str, chunk_rows: int = COHORT_CHUNK_ROWS) -> np.ndarray:
+        """All values of one test, in row order."""
+        code = self.test_code(name)
+        if code is None:
+            return np.empty(0, dtype=COLUMNS["value"])
+        parts = [self.value[rows][self.test[rows] == code] for rows in self.chunks(chunk_rows)]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=COLUMNS["value"])
+
+    def summary(
+        self, chunk_rows: int = COHORT_CHUNK_ROWS
+    ) -> Dict[str, Dict[str, Union[int, float]]]:
+        """
+        Per-test statistics computed in one chunked pass.
+
+        Returns:
+            Canonical test ID -> count, mean, min, max and the number of
+            low, normal and high results
+        """
+        tests = len(self.test_ids)
+        counts = np.zeros(tests, dtype=np.int64)
+        sums = np.zeros(tests)
+        minima = np.full(tests, np.inf)
+        maxima = np.full(tests, -np.inf)
+        status_counts = np.zeros(tests * len(STATUSES), dtype=np.int64)
+
+        for rows in self.chunks(chunk_rows):
+            codes = np.asarray(self.test[rows])
+            values = np.asarray(self.value[rows])
+            counts += np.bincount(codes, minlength=tests)
+            sums += np.bincount(codes, weights=values, minlength=tests)
+            np.minimum.at(minima, codes, values)
+            np.maximum.at(maxima, codes, values)
+            status_counts += np.bincount(
+                codes * len(STATUSES) + self.status[rows], minlength=len(status_counts)
+            )
+
+        status_counts = status_counts.reshape(tests, len(STATUSES))
+        summary = {}
+        for code, test_id in enumerate(self.test_ids):
+            if not counts[code]:
+                continue
+            summary[test_id] = {
+                "count": int(counts[code]),
+                "mean": float(sums[code] / counts[code]),
+                "min": float(minima[code]),
+                "max": float(maxima[code]),
+                **{
+                    status: int(status_counts[code, STATUS_CODES[status]])
+                    for status in STATUSES[1:]
+                },
+            }
+        return summary
+
+    def flush(self) -> None:
+        """Write changes to a writable status column to disk."""
+        if isinstance(self.status, np.memmap):
+            self.status.flush()
+
+    def _open_column(self, column: str, mode: str) -> np.ndarray:
+        column_path = self.path / f"{column}.npy"
+        try:
+            array = np.load(column_path, mmap_mode=mode)
+        except (OSError, ValueError) as e:
+            raise DataLoaderError(f"Cannot open cohort column: {e}", str(column_path)) from e
+        if array.dtype != COLUMNS[column]:
+            raise DataLoaderError(f"Unexpected dtype {array.dtype}", str(column_path))
+        return array
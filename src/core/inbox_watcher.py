@@ -0,0 +1,218 @@
+"""
+Continuous processing of documents dropped into an inbox directory.
+
+InboxWatcher polls a directory for PDF, DOCX and JSON files. A file is only
+picked up once its size and modification time have stayed the same for
+several scans, so documents still being copied are not read half-written.
+Each document goes through the same parse -> analyze -> report pipeline as
+batch mode, using workers that keep the reference data and engines loaded
+for the lifetime of the process. Processed inputs are moved to ``done/``
+or ``failed/`` inside the inbox; failures get an ``.error.txt`` note.
+"""
+
+import shutil
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.core.batch_processor import (
+    BatchProcessor,
+    DocumentPipeline,
+    _init_worker,
+    _process_in_worker,
+    _run_pipeline,
+)
+from src.utils.filenames import sanitize_filename
+from src.utils.logger import get_logger, worker_log_queue
+from config import DATA_DIR, OUTPUT_DIR, INBOX_POLL_INTERVAL, INBOX_STABLE_POLLS
+
+logger = get_logger(__name__)
+
+DONE_DIR_NAME = "done"
+FAILED_DIR_NAME = "failed"
+
+
+class InboxWatcher:
+    """
+    Watches a directory and processes new documents as they arrive.
+
+    Example:
+        watcher = InboxWatcher(Path("/srv/lab-inbox"), workers=4)
+        watcher.run()  # until Ctrl+C or watcher.stop()
+    """
+
+    def __init__(
+        self,
+        inbox_dir: Path,
+        output_dir: Path = OUTPUT_DIR,
+        workers: int = 1,
+        poll_interval: float = INBOX_POLL_INTERVAL,
+        stable_polls: int = INBOX_STABLE_POLLS,
+        data_dir: Path = DATA_DIR,
+        on_result: Optional[Callable[[Path, Dict[str, Any]], None]] = None,
+        report_format: str = "pdf",
+    ):
+        """
+        Args:
+            inbox_dir: Directory to watch
+            output_dir: Directory the reports are written to
+            workers: Number of worker processes; with 1 documents are
+                processed in a background thread of this process
+            poll_interval: Seconds between directory scans
+            stable_polls: Consecutive scans a file must be unchanged in
+                before it is processed
+            data_dir: Reference data directory
+            on_result: Called as on_result(original path, result) after each
+                document
+            report_format: Report format, a key of src.utils.exporters.EXPORTERS
+                or "pdf"
+        """
+        self.inbox_dir = Path(inbox_dir)
+        self.output_dir = Path(output_dir)
+        self.done_dir = self.inbox_dir / DONE_DIR_NAME
+        self.failed_dir = self.inbox_dir / FAILED_DIR_NAME
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self.stable_polls = max(1, stable_polls)
+        self.data_dir = data_dir
+        self.on_result = on_result
+        self.report_format = report_format
+
+        # path -> ((mtime_ns, size), consecutive scans with that signature)
+        self._candidates: Dict[Path, Tuple[Tuple[int, int], int]] = {}
+        self._in_flight: Dict[Future, Path] = {}
+        self._stop_event = threading.Event()
+        self._executor = None
+        self._pipeline: Optional[DocumentPipeline] = None
+
+    def run(self, stop_event: Optional[threading.Event] = None) -> None:
+        """
+        Watch the inbox until stop() is called or stop_event is set.
+
+        Documents already being processed are finished before returning.
+        """
+        stop_event = stop_event or self._stop_event
+        for directory in (self.output_dir, self.done_dir, self.failed_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+        self._start_executor()
+        logger.info("Watching %s (poll every %ss)", self.inbox_dir, self.poll_interval)
+        try:
+            while not stop_event.is_set():
+                for path in self.poll_once():
+                    self._submit(path)
+                self._collect_finished()
+                stop_event.wait(self.poll_interval)
+        finally:
+            self._collect_finished(wait=True)
+            self._executor.shutdown()
+            self._executor = None
+            logger.info("Stopped watching %s", self.inbox_dir)
+
+    def stop(self) -> None:
+        """Ask run() to return after the current scan."""
+        self._stop_event.set()
+
+    def poll_once(self) -> List[Path]:
+        """
+        Scan the inbox once.
+
+        Returns:
+            Documents whose size and mtime were unchanged for stable_polls
+            consecutive scans and are not being processed yet
+        """
+        in_flight = set(self._in_flight.values())
+        candidates: Dict[Path, Tuple[Tuple[int, int], int]] = {}
+        ready = []
+        for path in BatchProcessor.find_documents(self.inbox_dir):
+            if path in in_flight:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            previous = self._candidates.get(path)
+            scans = previous[1] + 1 if previous and previous[0] == signature else 1
+            if scans >= self.stable_polls:
+                ready.append(path)
+            else:
+                candidates[path] = (signature, scans)
+        self._candidates = candidates
+        return ready
+
+    def _start_executor(self) -> None:
+        if self.workers == 1:
+            if self._pipeline is None:
+                self._pipeline = DocumentPipeline(
+                    self.output_dir, self.data_dir, self.report_format
+                )
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        else:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.output_dir, self.data_dir, self.report_format, worker_log_queue()),
+            )
+
+    def _submit(self, path: Path) -> None:
+        report_name = (
+            f"{sanitize_filename(path.stem)}_{time.strftime('%Y%m%d-%H%M%S')}"
+            f"_supplements.{self.report_format}"
+        )
+        if self.workers == 1:
+            future = self._executor.submit(_run_pipeline, self._pipeline, path, report_name)
+        else:
+            try:
+                future = self._executor.submit(_process_in_worker, path, report_name)
+            except BrokenProcessPool:
+                self._restart_executor()
+                future = self._executor.submit(_process_in_worker, path, report_name)
+        self._in_flight[future] = path
+        logger.info("Queued %s", path.name)
+
+    def _restart_executor(self) -> None:
+        """Replace a process pool broken by a worker that died (e.g. OOM or a crash)."""
+        logger.warning("A worker process died, restarting the worker pool")
+        self._executor.shutdown(wait=False)
+        self._start_executor()
+
+    def _collect_finished(self, wait: bool = False) -> None:
+        for future in list(self._in_flight):
+            if not (wait or future.done()):
+                continue
+            path = self._in_flight.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker process itself failed (e.g. was killed); every
+                # job of its pool fails with BrokenProcessPool, and the pool is
+                # replaced on the next submit
+                result = {"status": "failed", "error": f"{type(e).__name__}: {e}", "elapsed": 0.0}
+            self._finish(path, result)
+
+    def _finish(self, path: Path, result: Dict[str, Any]) -> None:
+        if result["status"] == "ok":
+            destination = self._move(path, self.done_dir)
+            logger.info("Processed %s -> %s", path.name, result["report"])
+        else:
+            destination = self._move(path, self.failed_dir)
+            destination.with_name(destination.name + ".error.txt").write_text(
+                result["error"] + "\n", encoding="utf-8"
+            )
+            logger.warning("Failed to process %s: %s", path.name, result["error"])
+        result["moved_to"] = str(destination)
+        if self.on_result is not None:
+            self.on_result(path, result)
+
+    @staticmethod
+    def _move(path: Path, directory: Path) -> Path:
+        """Move a file into directory, adding a timestamp if the name is taken."""
+        destination = directory / path.name
+        if destination.exists():
+            destination = directory / f"{path.stem}_{time.time_ns()}{path.suffix}"
+        shutil.move(str(path), str(destination))
+        return destination
@@ -20,6 +20,7 @@ from src.models.test_analysis import (
 )
 from src.utils.data_loader import DataLoader
 from src.utils.logger import get_logger
+from src.utils.name_resolver import NameResolver, get_name_resolver, index_by_test_id
 from src.utils.i18n import t
 from config import DATA_DIR
 
@@ -27,24 +28,34 @@ logger = get_logger(__name__)
 
 
 class InterpretationEngine:
-    def __init__(self, data_dir: Path = DATA_DIR):
+    def __init__(
+        self, data_dir: Path = DATA_DIR, name_resolver: Optional[NameResolver] = None
+    ):
         self.data_loader = DataLoader(data_dir)
+        self.name_resolver = name_resolver or get_name_resolver(data_dir)
         self.reference_data = self._load_reference_data()
         self.interpretation_rules = self._load_interpretation_rules()
         self.clinical_thresholds = self._load_clinical_thresholds()
+        self._test_configs = self._index_test_configs()
+        canonical_id = self.name_resolver.canonical_id
+        self._thresholds_by_id = index_by_test_id(
+            ((canonical_id(name), name, data) for name, data in self.clinical_thresholds.items()),
+            "clinical thresholds",
+        )
+        self._supplement_rules = self._index_supplement_rules()
 
     def _load_reference_data(self) -> Dict[str, Any]:
         try:
             return self.data_loader._load_cached("reference_ranges_v2.json")
         except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
-            logger.error(f"Failed to load reference_ranges_v2.json: {e}")
+            logger.error("Failed to load reference_ranges_v2.json: %s", e)
             return {}
 
     def _load_interpretation_rules(self) -> Dict[str, Any]:
         try:
             return self.data_loader._load_cached("interpretation_rules.json")
         except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
-            logger.error(f"Failed to load interpretation_rules.json: {e}")
+            logger.error("Failed to load interpretation_rules.json: %s", e)
             return {}
 
     def _load_clinical_thresholds(self) -> Dict[str, Dict[str, Any]]:
@@ -54,11 +65,37 @@ class InterpretationEngine:
             if thresholds:
                 return thresholds
         except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
-            logger.error(f"Failed to load clinical_thresholds.json: {e}")
+            logger.error("Failed to load clinical_thresholds.json: %s", e)
 
         # Return fallback thresholds when JSON fails to load
         return self._get_fallback_thresholds()
 
+    def _index_test_configs(self) -> Dict[str, Dict]:
+        """Index reference_ranges_v2 test configs by canonical test ID."""
+        canonical_id = self.name_resolver.canonical_id
+        categories = self.reference_data.get("categories", {})
+        # First definition wins, as in the original linear search
+        return index_by_test_id(
+            (
+                (canonical_id(test.get("name", "")), test.get("name", ""), test)
+                for category_data in categories.values()
+                for test in category_data.get("tests", [])
+            ),
+            "reference_ranges_v2.json",
+        )
+
+    def _index_supplement_rules(self) -> Dict[tuple, List[str]]:
+        """Index single-test supplement rules by (canonical test ID, condition)."""
+        index: Dict[tuple, List[str]] = {}
+        rules = self.interpretation_rules.get("rules", {})
+        for rule in rules.get("single_test_rules", []):
+            key = (
+                self.name_resolver.canonical_id(rule.get("test_name", "")),
+                rule.get("condition"),
+            )
+            index.setdefault(key, []).extend(rule.get("supplements", []))
+        return index
+
     def _get_fallback_thresholds(self) -> Dict[str, Dict[str, Any]]:
         """Fallback thresholds when clinical_thresholds.json fails to load."""
         return {
@@ -147,16 +184,7 @@ class InterpretationEngine:
         )
 
     def _find_test_config(self, test_name: str) -> Optional[Dict]:
-        if not self.reference_data:
-            return None
-
-        categories = self.reference_data.get("categories", {})
-        for category_name, category_data in categories.items():
-            tests = category_data.get("tests", [])
-            for test in tests:
-                if test.get("name", "").upper() == test_name.upper():
-                    return test
-        return None
+        return self._test_configs.get(self.name_resolver.canonical_id(test_name))
 
     def _determine_status(
         self,
@@ -168,11 +196,12 @@ class InterpretationEngine:
             return "unknown"
 
         lab_ref = config.get("lab_reference", "")
-        test_name = test.name.upper()
         value = test.value
 
-        if test_name in self.clinical_thresholds:
-            threshold_data = self.clinical_thresholds[test_name]
+        threshold_data = self._thresholds_by_id.get(
+            self.name_resolver.canonical_id(test.name)
+        )
+        if threshold_data is not None:
             min_key = f"{threshold_type}_min"
             max_key = f"{threshold_type}_max"
 
@@ -239,19 +268,8 @@ class InterpretationEngine:
         return list(set(deficiencies))
 
     def _get_supplements(self, test_name: str, status: str) -> List[str]:
-        supplements = []
-
-        rules = self.interpretation_rules.get("rules", {})
-        single_rules = rules.get("single_test_rules", [])
-
-        for rule in single_rules:
-            if (
-                rule.get("test_name", "").upper() == test_name.upper()
-                and rule.get("condition") == status
-            ):
-                supplements.extend(rule.get("supplements", []))
-
-        return list(set(supplements))
+        key = (self.name_resolver.canonical_id(test_name), status)
+        return list(set(self._supplement_rules.get(key, [])))
 
     def _determine_priority(
         self, test_name: str, status: str, config: Optional[Dict]
@@ -28,8 +28,8 @@ class RecommendationEngine:
     def generate_recommendation(
         self, patient: Patient, blood_tests: List[BloodTest]
     ) -> Recommendation:
-        analyzed_tests = self.analyzer.analyze_blood_tests(blood_tests)
-        supplements_data = self.rule_engine.apply_rules(analyzed_tests, patient)
+        records = self.analyzer.analyze_records(blood_tests)
+        supplements_data = self.rule_engine.apply_rules_to_records(records, patient)
 
         supplement_recommendations = [
             SupplementRecommendation(
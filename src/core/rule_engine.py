@@ -1,6 +1,7 @@
-from src.models.blood_test import BloodTest
+from src.models.blood_test import BloodTest, BloodTestRecord
 from src.models.patient import Patient
-from typing import List, Dict
+from src.utils.name_resolver import NameResolver, get_name_resolver, index_by_test_id
+from typing import List, Dict, Optional, Union
 from config import PRIORITY_ORDER
 
 
@@ -11,15 +12,44 @@ class RuleEngine:
     to determine appropriate supplements, dosages, and timing.
     """
 
-    def __init__(self, dosage_rules: Dict, supplements: Dict, timing_rules: Dict):
+    def __init__(
+        self,
+        dosage_rules: Dict,
+        supplements: Dict,
+        timing_rules: Dict,
+        name_resolver: Optional[NameResolver] = None,
+    ):
+        self.name_resolver = name_resolver or get_name_resolver()
         self.dosage_rules = dosage_rules["dosage_rules"]
         self.supplements = {s["id"]: s for s in supplements["supplements"]}
         self.timing_rules = timing_rules["timing_rules"]
         self.timing_display = timing_rules["timing_display"]
 
     def apply_rules(self, blood_tests: List[BloodTest], patient: Patient) -> List[Dict]:
-        # Build lookup dict for O(1) access by test name
-        test_lookup: Dict[str, BloodTest] = {test.name: test for test in blood_tests}
+        # Build lookup dict for O(1) access by canonical test ID; a test
+        # repeated under another spelling overrides the earlier one
+        canonical_id = self.name_resolver.canonical_id
+        test_lookup: Dict[str, BloodTest] = index_by_test_id(
+            ((canonical_id(test.name), test.name, test) for test in blood_tests),
+            "blood tests",
+            keep_last=True,
+        )
+        return self._apply_rules(test_lookup, patient)
+
+    def apply_rules_to_records(
+        self, records: List[BloodTestRecord], patient: Patient
+    ) -> List[Dict]:
+        """Same as apply_rules for records from Analyzer.analyze_records."""
+        test_lookup = index_by_test_id(
+            ((record.test_id, record.name, record) for record in records),
+            "blood tests",
+            keep_last=True,
+        )
+        return self._apply_rules(test_lookup, patient)
+
+    def _apply_rules(
+        self, test_lookup: Dict[str, Union[BloodTest, BloodTestRecord]], patient: Patient
+    ) -> List[Dict]:
         matched_supplements = {}
 
         for rule in self.dosage_rules:
@@ -72,8 +102,7 @@ class RuleEngine:
     def _matches_single_test_rule(
         self, rule: Dict, test_lookup: Dict[str, BloodTest]
     ) -> bool:
-        test_name = rule["test_name"]
-        test = test_lookup.get(test_name)
+        test = test_lookup.get(self.name_resolver.canonical_id(rule["test_name"]))
 
         if not test or not test.status:
             return False
@@ -96,7 +125,9 @@ class RuleEngine:
         required_tests = rule.get("tests", [])
 
         for required_test in required_tests:
-            test = test_lookup.get(required_test["name"])
+            test = test_lookup.get(
+                self.name_resolver.canonical_id(required_test["name"])
+            )
             if not test:
                 return False
             if not test.status or test.status != required_test["status"]:
@@ -30,8 +30,9 @@ from src.utils.json_parser import JSONParser
 from src.utils.validator import Validator
 from src.core.recommendation_engine import RecommendationEngine
 from src.utils.formatter import PDFFormatter
+from src.utils.report_cache import get_report_cache
 from src.utils.data_loader import DataLoader
-from src.utils.document_parser import DocumentParser
+from src.utils.parse_workers import get_document_parser
 from src.utils.i18n import t
 from config import DATA_DIR, OUTPUT_DIR
 
@@ -41,7 +42,7 @@ class MainWindow(QMainWindow):
         self.setWindowTitle(t("gui.title"))
         self.setMinimumSize(700, 500)
         self.json_parser = JSONParser()
-        self.document_parser = DocumentParser()
+        self.document_parser = get_document_parser()
         self.selected_json_file: Optional[Path] = None
         self.selected_document_file: Optional[Path] = None
         self.output_pdf_path: Optional[Path] = None
@@ -204,7 +205,7 @@ class MainWindow(QMainWindow):
             )
 
             self.status_text.append("Generowanie PDF...")
-            formatter = PDFFormatter(OUTPUT_DIR)
+            formatter = PDFFormatter(OUTPUT_DIR, get_report_cache(OUTPUT_DIR))
             self.output_pdf_path = formatter.generate_pdf(recommendation)
 
             self.status_text.append(f"✓ Utworzono: {self.output_pdf_path.name}")
@@ -217,15 +218,15 @@ class MainWindow(QMainWindow):
             self.open_pdf_button.setEnabled(True)
 
         except FileNotFoundError as e:
-            logger.error(f"File not found: {e}")
+            logger.error("File not found: %s", e)
             QMessageBox.critical(self, "Błąd", "Wybrany plik nie istnieje.")
             self.status_text.append("✗ Błąd: Plik nie istnieje.")
         except ValueError as e:
-            logger.error(f"Invalid data: {e}")
+            logger.error("Invalid data: %s", e)
             QMessageBox.critical(self, "Błąd danych", "Dane wejściowe są nieprawidłowe. Sprawdź format pliku.")
             self.status_text.append("✗ Błąd: Nieprawidłowe dane wejściowe.")
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            logger.error("Unexpected error: %s", e)
             QMessageBox.critical(self, "Błąd", "Wystąpił nieoczekiwany błąd. Sprawdź logi aplikacji.")
             self.status_text.append("✗ Błąd: Wystąpił nieoczekiwany błąd.")
             QMessageBox.critical(self, "Błąd", f"Plik nie istnieje: {e}")
@@ -295,10 +296,10 @@ class MainWindow(QMainWindow):
             else:
                 subprocess.run(["xdg-open", str(resolved_path)], check=True)
         except subprocess.CalledProcessError as e:
-            logger.error(f"Failed to open PDF: {e}")
+            logger.error("Failed to open PDF: %s", e)
             QMessageBox.critical(self, "Błąd", "Nie można otworzyć pliku PDF.")
         except Exception as e:
-            logger.error(f"Unexpected error opening PDF: {e}")
+            logger.error("Unexpected error opening PDF: %s", e)
             QMessageBox.critical(self, "Błąd", "Wystąpił błąd podczas otwierania pliku.")
             QMessageBox.critical(self, "Błąd", f"Nie można otworzyć pliku PDF: {e}")
         except Exception as e:
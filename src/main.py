@@ -1,16 +1,17 @@
 import sys
 import argparse
+import multiprocessing
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from src.utils.data_loader import DataLoader
 from src.utils.validator import Validator
-from src.utils.formatter import PDFFormatter
+from src.utils.exporters import EXPORT_FORMATS, EXPORTERS
+from src.utils.filenames import sanitize_filename
 from src.utils.json_parser import JSONParser
-from src.utils.document_parser import DocumentParser
 from src.core.recommendation_engine import RecommendationEngine
-from config import DATA_DIR, OUTPUT_DIR
+from config import DATA_DIR, OUTPUT_DIR, INBOX_POLL_INTERVAL
 
 
 def run_web(patient, blood_tests, host="127.0.0.1", port=8000, no_browser=False):
@@ -24,7 +25,16 @@ def run_web(patient, blood_tests, host="127.0.0.1", port=8000, no_browser=False)
 
     analyzer = AdvancedAnalyzer()
     comprehensive = analyzer.analyze_blood_tests(blood_tests, patient)
-    app = create_app(analysis=comprehensive)
+
+    loader = DataLoader(DATA_DIR)
+    recommendation_engine = RecommendationEngine(
+        reference_ranges=loader.load_reference_ranges(),
+        supplements=loader.load_supplements(),
+        timing_rules=loader.load_timing_rules(),
+        dosage_rules=loader.load_dosage_rules(),
+    )
+    recommendation = recommendation_engine.generate_recommendation(patient, blood_tests)
+    app = create_app(analysis=comprehensive, recommendation=recommendation)
 
     if not no_browser:
         url = f"http://{host}:{port}"
@@ -35,6 +45,104 @@ def run_web(patient, blood_tests, host="127.0.0.1", port=8000, no_browser=False)
     uvicorn.run(app, host=host, port=port)
 
 
+def run_batch(args):
+    """Process every document in --input-dir and write a JSON summary."""
+    from src.core.batch_processor import BatchProcessor
+
+    checkpoint = Path(args.checkpoint) if args.checkpoint else OUTPUT_DIR / "batch_checkpoint.json"
+    summary_path = Path(args.summary) if args.summary else OUTPUT_DIR / "batch_summary.json"
+
+    def show_progress(path, result, finished, total):
+        mark = "✓" if result["status"] == "ok" else "✗"
+        line = f"[{finished}/{total}] {mark} {path.name} ({result['elapsed']:.1f}s)"
+        if result["status"] != "ok":
+            line += f" - {result['error']}"
+        print(line, flush=True)
+
+    processor = BatchProcessor(
+        OUTPUT_DIR,
+        workers=args.workers,
+        checkpoint_path=checkpoint,
+        report_format=args.format,
+    )
+    summary = processor.run(Path(args.input_dir), args.glob, on_result=show_progress)
+    processor.write_summary(summary, summary_path)
+
+    print(
+        f"\nPrzetworzono: {summary['processed']} "
+        f"(sukces: {summary['succeeded']}, błędy: {summary['failed']}, "
+        f"pominięte: {summary['skipped']}) w {summary['elapsed']:.1f}s"
+    )
+    print(f"Podsumowanie: {summary_path}")
+    return summary["failed"] == 0
+
+
+def run_watch(args):
+    """Process documents arriving in --watch until interrupted."""
+    from src.core.inbox_watcher import InboxWatcher
+
+    def show_result(path, result):
+        mark = "✓" if result["status"] == "ok" else "✗"
+        line = f"{mark} {path.name} ({result['elapsed']:.1f}s)"
+        if result["status"] != "ok":
+            line += f" - {result['error']}"
+        print(line, flush=True)
+
+    watcher = InboxWatcher(
+        Path(args.watch),
+        OUTPUT_DIR,
+        workers=args.workers or 1,
+        poll_interval=args.poll_interval,
+        on_result=show_result,
+        report_format=args.format,
+    )
+    print(f"Obserwowanie katalogu: {args.watch} (Ctrl+C aby zakończyć)")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("\nZatrzymano obserwowanie katalogu.")
+
+
+def run_jsonl(args):
+    """Stream records from --json (JSON Lines or a JSON list of records)
+    through analysis into a JSON Lines file.
+
+    With --format csv, html or json the recommendations are written in that
+    format instead.
+    """
+    from src.core.batch_processor import DocumentPipeline
+    from src.models.recommendation import Recommendation
+    from src.utils.exporters import JSONLinesExporter
+
+    input_path = Path(args.json)
+    exporter_class = EXPORTERS.get(args.format)
+    if args.output and Path(args.output).suffix.lower() == ".jsonl":
+        exporter_class = None
+    suffix = exporter_class.suffix if exporter_class else ".jsonl"
+    output_path = (
+        Path(args.output)
+        if args.output
+        else OUTPUT_DIR / f"{input_path.stem}_recommendations{suffix}"
+    )
+
+    pipeline = DocumentPipeline(OUTPUT_DIR)
+    records = JSONParser().iter_records(input_path)
+    failed = 0
+    exporter = exporter_class(output_path) if exporter_class else JSONLinesExporter(output_path)
+    with exporter:
+        for row in pipeline.recommend_records(records):
+            if row["status"] != "ok":
+                failed += 1
+                print(f"Rekord {row['record']}: {row['error']}")
+            if exporter_class is None:
+                exporter.write(row)
+            elif row["status"] == "ok":
+                exporter.export(Recommendation.model_validate(row["recommendation"]))
+
+    print(f"Zapisano {exporter.count} rekordów (błędy: {failed}) do: {output_path}")
+    return failed == 0
+
+
 def run_cli():
     parser = argparse.ArgumentParser(
         description="Medical Supplement Advisor - Parser dokumentów JSON i generator rekomendacji"
@@ -59,6 +167,70 @@ def run_cli():
         type=str,
         help="Ścieżka do pliku PDF lub DOCX z wynikami badań (automatyczne parsowanie)",
     )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Plik wynikowy; .jsonl (dopisywanie) z --json przetwarza rekordy strumieniowo",
+    )
+    parser.add_argument(
+        "--format",
+        choices=EXPORT_FORMATS,
+        default="pdf",
+        help="Format raportu: pdf lub lekkie csv/html/json bez renderowania PDF (domyślnie: pdf)",
+    )
+    parser.add_argument(
+        "--input-dir",
+        type=str,
+        help="Katalog z dokumentami (PDF/DOCX/JSON) do przetworzenia wsadowo",
+    )
+    parser.add_argument(
+        "--glob",
+        type=str,
+        default="*",
+        help="Wzorzec plików w --input-dir, np. '*.pdf' lub '**/*' (domyślnie: *)",
+    )
+    parser.add_argument(
+        "--watch",
+        type=str,
+        help="Obserwuj katalog i przetwarzaj nowe dokumenty na bieżąco",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=INBOX_POLL_INTERVAL,
+        help=(
+            "Odstęp między skanami katalogu --watch w sekundach "
+            f"(domyślnie: {INBOX_POLL_INTERVAL})"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help=(
+            "Liczba procesów dla --input-dir (domyślnie: liczba rdzeni) "
+            "i --watch (domyślnie: 1)"
+        ),
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        help="Plik postępu umożliwiający wznowienie przetwarzania wsadowego",
+    )
+    parser.add_argument(
+        "--summary",
+        type=str,
+        help="Plik JSON z podsumowaniem przetwarzania wsadowego (błędy i czasy)",
+    )
+    parser.add_argument(
+        "--parse-timeout",
+        type=float,
+        help="Limit czasu parsowania dokumentu w odizolowanym procesie (sekundy)",
+    )
+    parser.add_argument(
+        "--build-data-bundle",
+        action="store_true",
+        help="Sprawdź pliki danych referencyjnych i zapisz ich skompilowany pakiet",
+    )
     parser.add_argument(
         "--web",
         action="store_true",
@@ -83,11 +255,57 @@ def run_cli():
     )
     args = parser.parse_args()
 
-    has_args = any([args.json, args.patient, args.blood_tests, args.document, args.web])
+    has_args = any(
+        [
+            args.json,
+            args.patient,
+            args.blood_tests,
+            args.document,
+            args.web,
+            args.input_dir,
+            args.watch,
+            args.build_data_bundle,
+        ]
+    )
 
     if not has_args:
         return False  # No CLI arguments, should run GUI instead
 
+    if args.build_data_bundle:
+        from src.utils.data_bundle import build_data_bundle
+        from src.utils.exceptions import DataLoaderError
+
+        try:
+            bundle_path = build_data_bundle(DATA_DIR)
+        except DataLoaderError as e:
+            print(f"Błąd: {e.message}")
+            sys.exit(1)
+        print(f"Zapisano pakiet danych: {bundle_path}")
+        return True
+
+    if args.watch:
+        if any(
+            [args.json, args.patient, args.blood_tests, args.document, args.web, args.input_dir]
+        ):
+            print(
+                "Błąd: Nie można używać --watch razem z --input-dir, --document, --json, "
+                "--patient, --blood-tests lub --web"
+            )
+            sys.exit(1)
+        run_watch(args)
+        return True
+
+    if args.input_dir:
+        if any([args.json, args.patient, args.blood_tests, args.document, args.web]):
+            print(
+                "Błąd: Nie można używać --input-dir razem z --document, --json, "
+                "--patient, --blood-tests lub --web"
+            )
+            sys.exit(1)
+        if not run_batch(args):
+            sys.exit(1)
+        return True
+
     # Process CLI arguments
     if args.document:
         if args.patient or args.blood_tests or args.json:
@@ -96,11 +314,16 @@ def run_cli():
             )
             sys.exit(1)
 
-        # Parse document (PDF/DOCX)
-        from src.utils.document_parser import DocumentParser
+        # Parse document (PDF/DOCX) in a sandboxed worker process
+        if args.parse_timeout:
+            from src.utils.parse_workers import ParseWorkerPool
+
+            with ParseWorkerPool(max_workers=1, timeout=args.parse_timeout) as pool:
+                parsed_data = pool.parse_document(Path(args.document))
+        else:
+            from src.utils.parse_workers import get_document_parser
 
-        doc_parser = DocumentParser()
-        parsed_data = doc_parser.parse_document(Path(args.document))
+            parsed_data = get_document_parser().parse_document(Path(args.document))
         patient_data = parsed_data.get("patient")
         blood_tests_data = parsed_data.get("blood_tests")
     elif args.json:
@@ -108,6 +331,17 @@ def run_cli():
             print("Błąd: Nie można używać --json razem z --patient lub --blood-tests")
             sys.exit(1)
 
+        json_path = Path(args.json)
+        if (
+            json_path.suffix.lower() == ".jsonl"
+            or (args.output and Path(args.output).suffix.lower() == ".jsonl")
+            or JSONParser.is_record_list(json_path)
+        ):
+            # Multi-record input or output: stream records with constant memory
+            if not run_jsonl(args):
+                sys.exit(1)
+            return True
+
         json_parser = JSONParser()
         parsed_data = json_parser.parse_document(Path(args.json))
         patient_data = parsed_data.get("patient")
@@ -173,10 +407,33 @@ def run_cli():
 
     recommendation = recommendation_engine.generate_recommendation(patient, blood_tests)
 
-    formatter = PDFFormatter(OUTPUT_DIR)
-    pdf_path = formatter.generate_pdf(recommendation)
+    if args.format == "pdf":
+        from src.utils.formatter import PDFFormatter
+        from src.utils.report_cache import get_report_cache
+
+        formatter = PDFFormatter(OUTPUT_DIR, get_report_cache(OUTPUT_DIR))
+        if args.output:
+            report_path = Path(args.output)
+            report_path.parent.mkdir(parents=True, exist_ok=True)
+            report_path.write_bytes(formatter.render_bytes(recommendation))
+        else:
+            report_path = formatter.generate_pdf(recommendation)
+    else:
+        exporter_class = EXPORTERS[args.format]
+        report_path = (
+            Path(args.output)
+            if args.output
+            else OUTPUT_DIR
+            / (
+                f"{sanitize_filename(recommendation.patient_name)}_"
+                f"{sanitize_filename(recommendation.patient_surname)}_"
+                f"{recommendation.date:%Y%m%d-%H%M%S}_supplements{exporter_class.suffix}"
+            )
+        )
+        with exporter_class(report_path) as exporter:
+            exporter.export(recommendation)
 
-    print(f"\nWygenerowano raport: {pdf_path}")
+    print(f"\nWygenerowano raport: {report_path}")
     print(f"Liczba zarekomendowanych suplementów: {len(recommendation.supplements)}")
 
     if recommendation.supplements:
@@ -203,6 +460,8 @@ def run_gui():
 
 def main():
     """Main entry point - decides whether to run CLI or GUI based on arguments."""
+    # Lets worker processes of a frozen (PyInstaller) build start up
+    multiprocessing.freeze_support()
     # Check if we're running with arguments
     if len(sys.argv) > 1:
         # Has arguments - try CLI first
@@ -18,3 +18,44 @@ class BloodTest(BaseModel):
         if v < 0:
             raise ValueError("Blood test value cannot be negative")
         return v
+
+
+class BloodTestRecord:
+    """Compact, mutable blood test used inside the engines.
+
+    Holds the canonical test ID resolved once, so engines can look tests up
+    without re-normalizing names, and avoids allocating a pydantic model
+    per test per analysis. Convert with to_model() at API boundaries.
+    """
+
+    __slots__ = ("test_id", "name", "value", "unit", "status")
+
+    def __init__(
+        self,
+        test_id: str,
+        name: str,
+        value: float,
+        unit: str,
+        status: Literal["low", "normal", "high"] | None = None,
+    ):
+        self.test_id = test_id
+        self.name = name
+        self.value = value
+        self.unit = unit
+        self.status = status
+
+    @classmethod
+    def from_model(cls, test: BloodTest, test_id: str) -> "BloodTestRecord":
+        return cls(test_id, test.name, test.value, test.unit, test.status)
+
+    def to_model(self) -> BloodTest:
+        # Values come from a validated BloodTest, so skip revalidation
+        return BloodTest.model_construct(
+            name=self.name, value=self.value, unit=self.unit, status=self.status
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"BloodTestRecord({self.test_id!r}, {self.name!r}, {self.value!r}, "
+            f"{self.unit!r}, {self.status!r})"
+        )
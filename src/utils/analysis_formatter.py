@@ -0,0 +1,495 @@
+"""
+PDF export of a ComprehensiveAnalysis with vector charts.
+
+The report mirrors the web dashboard: test tables with a range gauge per
+result, the domain panels (morphology, thyroid, glucose/insulin, lipids,
+liver, hormones), supplements and the summary. Charts are reportlab
+graphics drawings, so they stay sharp at any zoom. Drawings are memoized
+by their geometry: results that land on the same positions, and
+repeated exports, reuse one drawing instead of building it again.
+"""
+
+import hashlib
+import json
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+from reportlab.graphics.charts.lineplots import LinePlot
+from reportlab.graphics.shapes import Circle, Drawing, Line, Rect
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table
+
+from src.models.test_analysis import (
+    ComprehensiveAnalysis,
+    CurveReading,
+    RatioAnalysis,
+    TestAnalysis,
+)
+from src.utils.formatter import PDFFormatter, get_pdf_styles
+from src.utils.i18n import get_language, t
+
+# Bump when the analysis report layout changes, so cached reports are not reused
+ANALYSIS_TEMPLATE_VERSION = 1
+
+# Memoized drawings kept per process
+CHART_CACHE_SIZE = 4096
+
+GAUGE_WIDTH = 4.0 * cm
+GAUGE_HEIGHT = 0.45 * cm
+CURVE_WIDTH = 14.0 * cm
+CURVE_HEIGHT = 5.0 * cm
+
+# Same palette as the dashboard charts (charts.js)
+STATUS_COLORS = {
+    "low": colors.Color(59 / 255, 130 / 255, 246 / 255),
+    "high": colors.Color(239 / 255, 68 / 255, 68 / 255),
+    "normal": colors.Color(34 / 255, 197 / 255, 94 / 255),
+}
+_RANGE_COLOR = colors.Color(34 / 255, 197 / 255, 94 / 255, alpha=0.2)
+_OPTIMAL_COLOR = colors.Color(34 / 255, 197 / 255, 94 / 255, alpha=0.45)
+_TRACK_COLOR = colors.Color(0.93, 0.93, 0.93)
+
+# (x0, x1) of a band on the gauge, None if the range is not known
+Band = Optional[Tuple[float, float]]
+GaugeGeometry = Tuple[Band, Band, float, str]
+
+TEST_CATEGORIES = (
+    ("inflammatory_markers", "categories.inflammatory"),
+    ("minerals_vitamins", "categories.minerals_vitamins"),
+    ("electrolytes", "categories.electrolytes"),
+)
+
+
+def _snap(x: float) -> float:
+    """Round a position to half a point, the resolution charts are memoized at."""
+    return round(x * 2) / 2
+
+
+def gauge_geometry(test: TestAnalysis) -> Optional[GaugeGeometry]:
+    """
+    Positions of the reference bands and the value on a range gauge.
+
+    Returns:
+        (lab band, optimal band, value x, status), or None if the test has
+        no lab reference range to draw against
+    """
+    lab = test.lab_reference
+    if lab is None or (lab.min is None and lab.max is None):
+        return None
+    optimal = test.optimal_range
+
+    points = [test.value] + [
+        bound
+        for bound in (
+            lab.min,
+            lab.max,
+            optimal.min if optimal else None,
+            optimal.max if optimal else None,
+        )
+        if bound is not None
+    ]
+    # Like the dashboard chart, the scale starts at zero for positive results
+    low, high = min(points + [0.0]), max(points)
+    high += 0.1 * ((high - low) or 1.0)
+    scale = GAUGE_WIDTH / (high - low)
+
+    def band(minimum: Optional[float], maximum: Optional[float]) -> Band:
+        if minimum is None and maximum is None:
+            return None
+        x0 = 0.0 if minimum is None else (minimum - low) * scale
+        x1 = GAUGE_WIDTH if maximum is None else (maximum - low) * scale
+        return _snap(x0), _snap(x1)
+
+    optimal_band = band(optimal.min, optimal.max) if optimal else None
+    return (
+        band(lab.min, lab.max),
+        optimal_band,
+        _snap((test.value - low) * scale),
+        test.status,
+    )
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def gauge_drawing(geometry: GaugeGeometry) -> Drawing:
+    """Horizontal gauge: lab and optimal range bands with a value marker."""
+    lab_band, optimal_band, value_x, status = geometry
+    drawing = Drawing(GAUGE_WIDTH, GAUGE_HEIGHT)
+    mid = GAUGE_HEIGHT / 2
+    drawing.add(Rect(0, mid - 2, GAUGE_WIDTH, 4, fillColor=_TRACK_COLOR, strokeColor=None))
+    for band, color, height in (
+        (lab_band, _RANGE_COLOR, 8),
+        (optimal_band, _OPTIMAL_COLOR, 5),
+    ):
+        if band is not None:
+            x0, x1 = band
+            drawing.add(
+                Rect(x0, mid - height / 2, x1 - x0, height, fillColor=color, strokeColor=None)
+            )
+    marker_color = STATUS_COLORS.get(status, colors.grey)
+    drawing.add(Line(value_x, 1, value_x, GAUGE_HEIGHT - 1, strokeColor=marker_color))
+    drawing.add(
+        Circle(value_x, mid, 2.5, fillColor=marker_color, strokeColor=colors.white, strokeWidth=0.5)
+    )
+    return drawing
+
+
+def curve_signature(readings: Sequence[CurveReading]) -> Tuple[Tuple[int, float, str], ...]:
+    return tuple((r.timepoint, round(r.value, 2), r.status) for r in readings)
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def curve_drawing(signature: Tuple[Tuple[int, float, str], ...]) -> Drawing:
+    """Line chart of a load-test curve with each reading coloured by status."""
+    styles = get_pdf_styles()
+    drawing = Drawing(CURVE_WIDTH, CURVE_HEIGHT)
+    plot = LinePlot()
+    plot.x, plot.y = 1.2 * cm, 0.8 * cm
+    plot.width, plot.height = CURVE_WIDTH - 1.6 * cm, CURVE_HEIGHT - 1.2 * cm
+    plot.data = [[(timepoint, value) for timepoint, value, _ in signature]]
+    plot.lines[0].strokeColor = colors.grey
+    plot.lines[0].strokeWidth = 1.5
+    x_max = max(timepoint for timepoint, _, _ in signature) or 1
+    y_max = 1.15 * max(value for _, value, _ in signature) or 1.0
+    plot.xValueAxis.valueMin, plot.xValueAxis.valueMax = 0, x_max
+    plot.xValueAxis.valueSteps = [timepoint for timepoint, _, _ in signature]
+    plot.yValueAxis.valueMin, plot.yValueAxis.valueMax = 0, y_max
+    for axis in (plot.xValueAxis, plot.yValueAxis):
+        axis.labels.fontName = styles.font_name
+        axis.labels.fontSize = 7
+    drawing.add(plot)
+
+    # Status markers on top of the line; the axes span exactly [0, max]
+    for timepoint, value, status in signature:
+        drawing.add(
+            Circle(
+                plot.x + plot.width * timepoint / x_max,
+                plot.y + plot.height * value / y_max,
+                3,
+                fillColor=STATUS_COLORS.get(status, colors.grey),
+                strokeColor=colors.white,
+                strokeWidth=0.5,
+            )
+        )
+    return drawing
+
+
+def _format_range(minimum: Optional[float], maximum: Optional[float]) -> str:
+    if minimum is not None and maximum is not None:
+        return f"{minimum:g} – {maximum:g}"
+    if minimum is not None:
+        return f"≥ {minimum:g}"
+    if maximum is not None:
+        return f"≤ {maximum:g}"
+    return "—"
+
+
+def analysis_cache_key(analysis: ComprehensiveAnalysis) -> str:
+    """Hash of everything that determines an analysis report's rendered content."""
+    styles = get_pdf_styles()
+    payload = {
+        "template": ANALYSIS_TEMPLATE_VERSION,
+        "language": get_language(),
+        "fonts": [styles.font_name, styles.font_name_bold],
+        "analysis": analysis.model_dump(mode="json"),
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class AnalysisPDFFormatter(PDFFormatter):
+    """
+    Renders ComprehensiveAnalysis reports.
+
+    Shares file naming, atomic writes, the report cache and parallel
+    generate_many with PDFFormatter. The web dashboard serves it as
+    /api/analysis.pdf.
+
+    Example:
+        formatter = AnalysisPDFFormatter(OUTPUT_DIR)
+        paths = formatter.generate_many(analyses, workers=4)
+    """
+
+    report_kind = "analysis"
+
+    def _cache_key(self, analysis: ComprehensiveAnalysis) -> str:
+        return analysis_cache_key(analysis)
+
+    def _build(self, analysis: ComprehensiveAnalysis, target) -> None:
+        doc = SimpleDocTemplate(
+            target,
+            pagesize=A4,
+            rightMargin=2 * cm,
+            leftMargin=2 * cm,
+            topMargin=2 * cm,
+            bottomMargin=2 * cm,
+            title=f"{t('pdf.analysis_title')} - {analysis.patient_name} {analysis.patient_surname}",
+        )
+        styles = self.pdf_styles
+        normal = styles.sheet["Normal"]
+
+        elements = [
+            Paragraph(t("pdf.disclaimer"), styles.disclaimer),
+            Spacer(1, 0.5 * cm),
+            Paragraph(t("pdf.analysis_title"), styles.sheet["Title"]),
+            Spacer(1, 0.5 * cm),
+        ]
+
+        patient_info = (
+            f"<b>{t('pdf.patient')}:</b> {analysis.patient_name} {analysis.patient_surname}"
+        )
+        if analysis.test_date:
+            patient_info += f"<br/><b>{t('pdf.test_date')}:</b> {analysis.test_date}"
+        elements.append(Paragraph(patient_info, normal))
+        elements.append(Spacer(1, 0.5 * cm))
+
+        elements.append(Paragraph(t("dashboard.critical_alert_title"), styles.sheet["Heading2"]))
+        if analysis.critical_issues:
+            elements.extend(
+                Paragraph(f"• {issue}", styles.warning) for issue in analysis.critical_issues
+            )
+        else:
+            elements.append(Paragraph(t("dashboard.no_critical_issues"), normal))
+
+        for key, title_key in TEST_CATEGORIES:
+            tests = getattr(analysis, key)
+            if tests:
+                elements.extend(self._section(t(title_key)))
+                elements.append(self._tests_table(tests))
+
+        elements.extend(self._panels(analysis))
+
+        if analysis.all_supplements:
+            elements.extend(self._section(t("dashboard.supplement_recommendations")))
+            elements.append(self._supplements_table(analysis))
+
+        if analysis.recommendations_summary:
+            elements.extend(self._section(t("dashboard.recommendations_summary")))
+            elements.extend(self._bullets(analysis.recommendations_summary))
+
+        elements.append(Spacer(1, 0.5 * cm))
+        elements.append(
+            Paragraph(f"<b>{t('pdf.warning')}:</b> {t('pdf.warning_text')}", styles.warning)
+        )
+        doc.build(elements)
+
+    def _panels(self, analysis: ComprehensiveAnalysis) -> List:
+        elements = []
+
+        morphology = analysis.morphology
+        if morphology:
+            elements.extend(self._section(t("categories.morphology")))
+            elements.append(
+                self._facts(
+                    [(t("pdf.overall_status"), self._status_display(morphology.overall_status))]
+                )
+            )
+            if morphology.patterns:
+                elements.extend(self._labelled_bullets(t("pdf.patterns"), morphology.patterns))
+            if morphology.deficiencies:
+                elements.extend(
+                    self._labelled_bullets(t("pdf.deficiencies"), morphology.deficiencies)
+                )
+            elements.extend(self._bullets(morphology.recommendations))
+
+        thyroid = analysis.thyroid
+        if thyroid:
+            elements.extend(self._section(t("categories.thyroid")))
+            facts = [
+                (t("pdf.overall_status"), self._status_display(thyroid.overall_status)),
+                (t("pdf.tsh_status"), thyroid.tsh_status),
+            ]
+            if thyroid.ft3_percentage is not None:
+                facts.append(("FT3 %", f"{thyroid.ft3_percentage:.0f}%"))
+            if thyroid.ft4_percentage is not None:
+                facts.append(("FT4 %", f"{thyroid.ft4_percentage:.0f}%"))
+            if thyroid.autoimmune_markers:
+                facts.append((t("pdf.autoimmune_markers"), ", ".join(thyroid.autoimmune_markers)))
+            elements.append(self._facts(facts))
+            elements.extend(self._bullets(thyroid.recommendations))
+
+        glucose = analysis.glucose_insulin
+        if glucose:
+            elements.extend(self._section(t("categories.glucose_insulin")))
+            facts = [
+                (t("pdf.overall_status"), self._status_display(glucose.overall_status)),
+                (
+                    t("dashboard.insulin_resistance"),
+                    t("pdf.yes") if glucose.insulin_resistance else t("pdf.no"),
+                ),
+            ]
+            if glucose.homa_ir is not None:
+                facts.append((t("pdf.homa_ir"), f"{glucose.homa_ir:.2f}"))
+            if glucose.hba1c_status:
+                facts.append((t("pdf.hba1c"), glucose.hba1c_status))
+            elements.append(self._facts(facts))
+            for title_key, curve in (
+                ("pdf.glucose_curve", glucose.glucose_curve),
+                ("pdf.insulin_curve", glucose.insulin_curve),
+            ):
+                if curve and curve.readings:
+                    unit = curve.readings[0].unit
+                    elements.append(Spacer(1, 0.3 * cm))
+                    elements.append(
+                        Paragraph(
+                            f"<b>{t(title_key)}</b> ({unit}; {t('pdf.time_minutes')})",
+                            self.pdf_styles.cell,
+                        )
+                    )
+                    elements.append(curve_drawing(curve_signature(curve.readings)))
+                    elements.extend(self._bullets(curve.interpretations))
+            elements.extend(self._bullets(glucose.recommendations))
+
+        lipids = analysis.lipids
+        if lipids:
+            elements.extend(self._section(t("categories.lipids")))
+            elements.append(
+                self._facts(
+                    [
+                        (t("pdf.overall_status"), self._status_display(lipids.overall_status)),
+                        (t("dashboard.cardiovascular_risk"), lipids.cardiovascular_risk),
+                    ]
+                )
+            )
+            if lipids.ratios:
+                elements.append(self._ratios_table(lipids.ratios))
+            elements.extend(self._bullets(lipids.recommendations))
+
+        liver = analysis.liver
+        if liver:
+            elements.extend(self._section(t("categories.liver")))
+            facts = [(t("pdf.overall_status"), self._status_display(liver.overall_status))]
+            if liver.ast_alt_ratio is not None:
+                facts.append((t("pdf.ast_alt_ratio"), f"{liver.ast_alt_ratio:.2f}"))
+            if liver.pattern:
+                facts.append((t("pdf.pattern"), liver.pattern))
+            elements.append(self._facts(facts))
+            elements.extend(self._bullets(liver.recommendations))
+
+        hormones = analysis.hormones
+        if hormones:
+            elements.extend(self._section(t("categories.hormones")))
+            facts = [(t("pdf.overall_status"), self._status_display(hormones.overall_status))]
+            if hormones.cycle_phase:
+                facts.append((t("pdf.cycle_phase"), hormones.cycle_phase))
+            elements.append(self._facts(facts))
+            if hormones.ratios:
+                elements.append(self._ratios_table(hormones.ratios))
+            elements.extend(self._bullets(hormones.recommendations))
+
+        return elements
+
+    def _section(self, title: str) -> List:
+        return [Spacer(1, 0.4 * cm), Paragraph(title, self.pdf_styles.sheet["Heading2"])]
+
+    def _bullets(self, items: Sequence[str]) -> List:
+        return [Paragraph(f"• {item}", self.pdf_styles.cell) for item in items]
+
+    def _labelled_bullets(self, label: str, items: Sequence[str]) -> List:
+        return [Paragraph(f"<b>{label}:</b>", self.pdf_styles.cell)] + self._bullets(items)
+
+    def _facts(self, facts: Sequence[Tuple[str, str]]) -> Table:
+        cell = self.pdf_styles.cell
+        rows = [
+            [Paragraph(f"<b>{label}</b>", cell), Paragraph(str(value), cell)]
+            for label, value in facts
+        ]
+        table = Table(
+            rows,
+            colWidths=[5 * cm, 12 * cm],
+            hAlign="LEFT",
+        )
+        table.setStyle([("VALIGN", (0, 0), (-1, -1), "TOP")])
+        return table
+
+    def _status_display(self, status: str) -> str:
+        key = f"analysis.status_{status}"
+        translated = t(key)
+        return status if translated == key else translated
+
+    def _grid_table(
+        self, header: Sequence[str], rows: List[List], col_widths: List[float]
+    ) -> Table:
+        styles = self.pdf_styles
+        table = Table(
+            [[Paragraph(text, styles.header) for text in header]] + rows,
+            colWidths=col_widths,
+            repeatRows=1,
+            hAlign="LEFT",
+        )
+        table.setStyle(styles.table)
+        return table
+
+    def _tests_table(self, tests: Sequence[TestAnalysis]) -> Table:
+        cell = self.pdf_styles.cell
+        rows = []
+        for test in tests:
+            geometry = gauge_geometry(test)
+            reference = test.lab_reference
+            rows.append(
+                [
+                    Paragraph(test.name, cell),
+                    Paragraph(f"{test.value:g} {test.unit}", cell),
+                    Paragraph(self._status_display(test.status), cell),
+                    Paragraph(
+                        _format_range(reference.min, reference.max) if reference else "—", cell
+                    ),
+                    gauge_drawing(geometry) if geometry else "",
+                ]
+            )
+        return self._grid_table(
+            [
+                t("pdf.test"),
+                t("dashboard.value"),
+                t("pdf.status"),
+                t("dashboard.reference_range"),
+                t("pdf.chart"),
+            ],
+            rows,
+            [4.2 * cm, 2.8 * cm, 2.0 * cm, 3.2 * cm, GAUGE_WIDTH + 0.8 * cm],
+        )
+
+    def _ratios_table(self, ratios: Sequence[RatioAnalysis]) -> Table:
+        cell = self.pdf_styles.cell
+        rows = [
+            [
+                Paragraph(ratio.name, cell),
+                Paragraph(f"{ratio.value:.2f}", cell),
+                Paragraph(ratio.optimal_range, cell),
+                Paragraph(ratio.interpretation, cell),
+            ]
+            for ratio in ratios
+        ]
+        return self._grid_table(
+            [
+                t("pdf.ratio"),
+                t("dashboard.value"),
+                t("dashboard.optimal_range"),
+                t("pdf.interpretation"),
+            ],
+            rows,
+            [4.0 * cm, 2.0 * cm, 3.0 * cm, 8.0 * cm],
+        )
+
+    def _supplements_table(self, analysis: ComprehensiveAnalysis) -> Table:
+        cell = self.pdf_styles.cell
+        rows = [
+            [
+                Paragraph(supplement.name, cell),
+                Paragraph(supplement.dosage, cell),
+                Paragraph(self._get_priority_display(supplement.priority), cell),
+                Paragraph(supplement.reason, cell),
+            ]
+            for supplement in analysis.all_supplements
+        ]
+        return self._grid_table(
+            [
+                t("pdf.supplement"),
+                t("pdf.dosage"),
+                t("pdf.priority"),
+                t("pdf.reason"),
+            ],
+            rows,
+            [4.0 * cm, 3.0 * cm, 2.2 * cm, 7.8 * cm],
+        )
@@ -0,0 +1,51 @@
+"""Zero-copy binary streams over in-memory document content."""
+
+import io
+from typing import Union
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Seekable, read-only binary stream over a bytes-like object.
+
+    Unlike ``io.BytesIO(memoryview)``, the underlying buffer is not copied;
+    each read only copies the requested slice into the caller's buffer.
+    """
+
+    def __init__(self, data: BytesLike):
+        super().__init__()
+        self._view = memoryview(data).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), len(self._view) - self._pos)
+        if size <= 0:
+            return 0
+        buffer[:size] = self._view[self._pos : self._pos + size]
+        self._pos += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._pos + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+        self._pos = position
+        return position
+
+    def tell(self) -> int:
+        return self._pos
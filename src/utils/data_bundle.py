@@ -0,0 +1,252 @@
+"""
+Compiled reference data bundle.
+
+Every process start would otherwise parse all JSON files of the data
+directory and build the test name index from them. build_data_bundle()
+validates the files once and writes a single binary bundle next to them
+with the parsed data and the ready NameResolver, tagged with a hash of the
+resolver's source so a bundle pickled by other code is never loaded. The
+bundle records the size and modification time of every JSON file and a
+hash of their contents. load_data_bundle() trusts a bundle whose recorded file stats
+still match, and hashes the files only when they do not; a bundle whose
+hash no longer matches is ignored, so editing a JSON file without
+rebuilding falls back to reading the JSON.
+
+Each file is stored as its own pickle and unpickled on request, which
+hands every caller a fresh copy faster than json.loads or deepcopy.
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from src.utils.exceptions import DataLoaderError
+from src.utils.logger import get_logger
+from config import DATA_BUNDLE_ENABLED, DATA_BUNDLE_NAME, DATA_DIR, FUZZY_MATCH_THRESHOLD
+
+if TYPE_CHECKING:
+    from src.utils.name_resolver import NameResolver
+
+logger = get_logger(__name__)
+
+# Bump when the bundle layout or a pickled class changes incompatibly
+BUNDLE_FORMAT_VERSION = 2
+
+# Source of the pickled NameResolver; any edit to it invalidates bundles
+_RESOLVER_SOURCE = Path(__file__).with_name("name_resolver.py")
+
+
+@functools.lru_cache(maxsize=1)
+def bundle_format() -> str:
+    """Bundle format version plus a hash of the pickled resolver's source."""
+    source_hash = hashlib.sha256(_RESOLVER_SOURCE.read_bytes()).hexdigest()
+    return f"{BUNDLE_FORMAT_VERSION}:{source_hash[:16]}"
+
+
+def data_files(data_dir: Path) -> List[Path]:
+    """JSON files of a data directory, in bundle order."""
+    return sorted(Path(data_dir).glob("*.json"))
+
+
+def data_version(data_dir: Path) -> str:
+    """Hash of the bundle format and the content of every JSON data file."""
+    digest = hashlib.sha256(f"bundle-format:{bundle_format()}".encode())
+    for path in data_files(data_dir):
+        content = path.read_bytes()
+        digest.update(f"\0{path.name}\0{len(content)}\0".encode("utf-8"))
+        digest.update(content)
+    return digest.hexdigest()
+
+
+def _file_stats(paths: List[Path]) -> tuple:
+    """(name, size, mtime) of each existing file, taken from stat()."""
+    stats = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        stats.append((path.name, stat.st_size, stat.st_mtime_ns))
+    return tuple(stats)
+
+
+def validate_data_file(name: str, data: Any) -> List[str]:
+    """Structural problems of one parsed data file; empty if it is usable."""
+    if not isinstance(data, dict):
+        return [f"{name}: top level must be an object"]
+
+    problems = []
+    if name == "reference_ranges.json":
+        for index, entry in enumerate(data.get("reference_ranges", [])):
+            low, high = entry.get("min"), entry.get("max")
+            if not entry.get("name"):
+                problems.append(f"{name}: entry {index} has no name")
+            elif low is not None and high is not None and low > high:
+                problems.append(f"{name}: {entry['name']} has min above max")
+    elif name == "reference_ranges_v2.json":
+        for category, content in data.get("categories", {}).items():
+            for index, test in enumerate(content.get("tests", [])):
+                if not test.get("name"):
+                    problems.append(f"{name}: test {index} in {category} has no name")
+    elif name in ("supplements.json", "supplements_v2.json"):
+        seen = set()
+        for index, supplement in enumerate(data.get("supplements", [])):
+            supplement_id = supplement.get("id")
+            if not supplement_id:
+                problems.append(f"{name}: supplement {index} has no id")
+            elif supplement_id in seen:
+                problems.append(f"{name}: duplicate supplement id {supplement_id}")
+            seen.add(supplement_id)
+    elif name == "regex_patterns.json":
+        for key, pattern in data.get("patterns", {}).items():
+            if isinstance(pattern, dict) and "regex" in pattern:
+                try:
+                    re.compile(pattern["regex"])
+                except re.error as e:
+                    problems.append(f"{name}: pattern {key} does not compile: {e}")
+    return problems
+
+
+class DataBundle:
+    """Parsed data files and the name index of one data directory."""
+
+    def __init__(self, version: str, stats: tuple, files: Dict[str, bytes], name_resolver: bytes):
+        """
+        Args:
+            version: data_version() of the directory the bundle was built from
+            stats: _file_stats() of its JSON files at that time
+            files: File name -> pickled parsed content
+            name_resolver: Pickled NameResolver built from the files
+        """
+        self.version = version
+        self.stats = stats
+        self._files = files
+        self._name_resolver = name_resolver
+
+    def __contains__(self, filename: str) -> bool:
+        return filename in self._files
+
+    def load(self, filename: str) -> Any:
+        """Fresh copy of a file's parsed content."""
+        return pickle.loads(self._files[filename])
+
+    def name_resolver(self) -> "NameResolver":
+        resolver = pickle.loads(self._name_resolver)
+        # Matching settings follow the current config, not the one at build time
+        resolver.fuzzy_threshold = FUZZY_MATCH_THRESHOLD
+        return resolver
+
+    def dumps(self) -> bytes:
+        return pickle.dumps(
+            {
+                "format": bundle_format(),
+                "version": self.version,
+                "stats": self.stats,
+                "files": self._files,
+                "name_resolver": self._name_resolver,
+            },
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+
+
+def build_data_bundle(data_dir: Path = DATA_DIR) -> Path:
+    """
+    Validate every JSON file of a data directory and write its bundle.
+
+    Returns:
+        Path of the written bundle
+
+    Raises:
+        DataLoaderError: If a file cannot be parsed or fails validation
+    """
+    from src.utils.data_loader import DataLoader
+    from src.utils.name_resolver import NameResolver
+
+    data_dir = Path(data_dir)
+    stats = _file_stats(data_files(data_dir))
+    version = data_version(data_dir)
+    loader = DataLoader(data_dir, use_bundle=False)
+
+    files: Dict[str, bytes] = {}
+    problems: List[str] = []
+    for path in data_files(data_dir):
+        data = loader.load_json(path.name)
+        problems.extend(validate_data_file(path.name, data))
+        files[path.name] = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    if problems:
+        raise DataLoaderError(
+            "Invalid reference data:\n" + "\n".join(problems), file_path=str(data_dir)
+        )
+
+    resolver = NameResolver.from_data_dir(data_dir, loader=loader)
+    bundle = DataBundle(
+        version, stats, files, pickle.dumps(resolver, protocol=pickle.HIGHEST_PROTOCOL)
+    )
+
+    bundle_path = data_dir / DATA_BUNDLE_NAME
+    tmp_path = bundle_path.with_name(f"{bundle_path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(bundle.dumps())
+    os.replace(tmp_path, bundle_path)
+    logger.info(
+        "Wrote data bundle %s (%s files, version %s)", bundle_path, len(files), version[:12]
+    )
+    return bundle_path
+
+
+def load_data_bundle(data_dir: Path = DATA_DIR) -> Optional[DataBundle]:
+    """The directory's bundle, or None if it is missing, unreadable or stale."""
+    bundle_path = Path(data_dir) / DATA_BUNDLE_NAME
+    try:
+        content = bundle_path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+    try:
+        raw = pickle.loads(content)
+        if raw.get("format") != bundle_format():
+            logger.info("Ignoring data bundle %s of another format or resolver", bundle_path)
+            return None
+        bundle = DataBundle(raw["version"], raw["stats"], raw["files"], raw["name_resolver"])
+    except Exception as e:
+        logger.warning("Ignoring unreadable data bundle %s: %s", bundle_path, e)
+        return None
+
+    # Files touched without changing them (e.g. by a checkout) still match
+    # by content, which is only hashed when their stats differ
+    unchanged = bundle.stats == _file_stats(data_files(data_dir))
+    if not unchanged and bundle.version != data_version(data_dir):
+        logger.debug("Data bundle %s is stale, reading the JSON files", bundle_path)
+        return None
+    return bundle
+
+
+def _stat_signature(data_dir: Path) -> tuple:
+    """Cheap fingerprint of the data files and the bundle, taken from stat()."""
+    return _file_stats([*data_files(data_dir), Path(data_dir) / DATA_BUNDLE_NAME])
+
+
+# Bundles by resolved data directory, with the stat signature they were
+# checked against; None caches a missing or stale bundle
+_bundles: Dict[Path, Tuple[tuple, Optional[DataBundle]]] = {}
+
+
+def get_data_bundle(data_dir: Path = DATA_DIR) -> Optional[DataBundle]:
+    """
+    Get the process-wide bundle of a data directory.
+
+    The bundle is loaded on first use and checked again whenever a data
+    file or the bundle changes on disk.
+    """
+    if not DATA_BUNDLE_ENABLED:
+        return None
+    key = Path(data_dir).resolve()
+    signature = _stat_signature(key)
+    cached = _bundles.get(key)
+    if cached is None or cached[0] != signature:
+        cached = (signature, load_data_bundle(key))
+        _bundles[key] = cached
+    return cached[1]
@@ -3,6 +3,7 @@ from copy import deepcopy
 from pathlib import Path
 from typing import Dict, Any
 
+from src.utils.data_bundle import get_data_bundle
 from src.utils.exceptions import DataLoaderError
 from src.utils.logger import get_logger
 
@@ -10,11 +11,21 @@ logger = get_logger(__name__)
 
 
 class DataLoader:
-    def __init__(self, data_dir: Path):
+    def __init__(self, data_dir: Path, use_bundle: bool = True):
+        """
+        Args:
+            data_dir: Directory with the JSON data files
+            use_bundle: Serve files from the directory's compiled data bundle
+                when it is up to date (see src.utils.data_bundle)
+        """
         self.data_dir = data_dir
         self._cache: Dict[str, Any] = {}
+        self.bundle = get_data_bundle(data_dir) if use_bundle else None
 
     def load_json(self, filename: str) -> Dict[str, Any]:
+        if self.bundle is not None and filename in self.bundle:
+            return self.bundle.load(filename)
+
         candidate = Path(filename)
         if candidate.is_absolute():
             filepath = candidate.resolve()
@@ -44,7 +55,7 @@ class DataLoader:
                     logger.error(error_msg)
                     raise DataLoaderError(error_msg, file_path=str(filepath))
                 data = json.loads(content)
-                logger.debug(f"Successfully loaded {filename} from {filepath}")
+                logger.debug("Successfully loaded %s from %s", filename, filepath)
                 return data
         except json.JSONDecodeError as e:
             error_msg = f"Invalid JSON in file: {e}"
@@ -56,11 +67,14 @@ class DataLoader:
             raise DataLoaderError(error_msg, file_path=str(filepath)) from e
 
     def _load_cached(self, filename: str) -> Dict[str, Any]:
+        if self.bundle is not None and filename in self.bundle:
+            # Already a fresh copy, cheaper than copying a cached one
+            return self.bundle.load(filename)
         if filename not in self._cache:
-            logger.debug(f"Loading {filename} from file")
+            logger.debug("Loading %s from file", filename)
             self._cache[filename] = self.load_json(filename)
         else:
-            logger.debug(f"Loading {filename} from cache")
+            logger.debug("Loading %s from cache", filename)
         # Return a deep copy to prevent cache mutation
         return deepcopy(self._cache[filename])
 
@@ -8,54 +8,125 @@ them to the JSON format required by the Medical Supplement Advisor.
 import re
 import io
 import json
+import time
+import zipfile
+from contextlib import closing
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Union
 from dataclasses import dataclass
+from xml.etree.ElementTree import ParseError
 
-try:
-    from docx import Document
-
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
-
-try:
-    import pdfplumber
-
-    PDFPLUMBER_AVAILABLE = True
-except ImportError:
-    PDFPLUMBER_AVAILABLE = False
-
-try:
-    import fitz
-
-    PYMUPDF_AVAILABLE = True
-except ImportError:
-    PYMUPDF_AVAILABLE = False
-
-try:
-    import pytesseract
-    from PIL import Image
-
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
+from src.utils.buffer_io import BufferReader, BytesLike
+from src.utils.docx_reader import UnsupportedLayoutError, iter_docx_rows
 from src.utils.exceptions import DataLoaderError
+from src.utils.lazy_import import lazy_import, module_available
 from src.utils.logger import get_logger
+from src.utils.name_resolver import get_name_resolver
+from src.utils.pdf_backends import PDFPLUMBER_AVAILABLE, PDFBackend, get_pdf_backend
 from config import (
     DEFAULT_PATIENT_NAME,
     DEFAULT_PATIENT_SURNAME,
     DEFAULT_PATIENT_AGE,
     DATA_DIR,
     REGEX_PATTERNS_FILE,
+    OCR_BASE_ZOOM,
+    OCR_MAX_ZOOM,
+    OCR_MIN_CONFIDENCE,
+    PDF_BACKEND,
+    PARSE_ACCEPT_SCORE,
+    PARSE_FULL_PANEL_TESTS,
+    PARSE_TIME_BUDGET,
 )
 
+# Imported on first use, so runs that parse no documents do not pay for them
+docx = lazy_import("docx")
+fitz = lazy_import("fitz")
+pytesseract = lazy_import("pytesseract")
+Image = lazy_import("PIL.Image")
+
+DOCX_AVAILABLE = module_available("docx")
+PYMUPDF_AVAILABLE = module_available("fitz")
+OCR_AVAILABLE = module_available("pytesseract") and module_available("PIL")
+
 MAX_FILE_SIZE = 50 * 1024 * 1024
 
+# Number of characters sampled when estimating whether a page text layer is garbled
+GARBLED_SAMPLE_SIZE = 512
+
+OCR_LANGUAGE = "pol"
+
+# Characters that can appear in a result table: Polish letters, digits and units
+OCR_CHAR_WHITELIST = (
+    "AĄBCĆDEĘFGHIJKLŁMNŃOÓPQRSŚTUVWXYZŹŻ"
+    "aąbcćdeęfghijklłmnńoópqrsśtuvwxyzźż"
+    "0123456789.,:;-+/%()<>*^µ"
+)
+
+# Pixels of margin kept around the detected result-table region
+OCR_REGION_PADDING = 12
+
+# A result row: a word of at least two letters followed later by a number
+RESULT_LINE_PATTERN = re.compile(r"[A-Za-zĄĆĘŁŃÓŚŹŻąćęłńóśźż]{2,}.*?\d")
+
+# Names that look like header/footer text (addresses, registry data, dates)
+SKIP_NAME_PATTERN = re.compile(
+    r"ul\.?|numer|nr\s|data|strona|oddział|kod|adres|tel\.?|fax|email|pacjent"
+    r"|księga|rejestrowy|podmiot|leczniczy"
+)
+
+# A plausible unit: letters, digits and unit punctuation, at least one letter or %
+UNIT_PATTERN = re.compile(r"(?=.*[^\W\d_]|.*%)[\w%/*^.,µ×\- ]{1,20}")
+
 logger = get_logger(__name__)
 
 
+# A document is parsed either from a file or from its content held in memory
+DocumentSource = Union[Path, memoryview]
+
+
+def _open_source(source: DocumentSource):
+    """Return a path string or a zero-copy stream readers can open."""
+    if isinstance(source, Path):
+        return str(source)
+    return BufferReader(source)
+
+
+def _source_name(source: DocumentSource) -> str:
+    """Short description of a document source for log messages."""
+    if isinstance(source, Path):
+        return source.name
+    return f"<{source.nbytes} bytes in memory>"
+
+
+class ParseStrategy(NamedTuple):
+    """One way of extracting results from a document."""
+
+    name: str
+    # Returns the parse result, or None if the strategy does not apply
+    run: Callable[[], Optional[Dict]]
+    # Only run if no earlier strategy produced a result
+    fallback_only: bool = False
+
+
+@dataclass
+class ParseBudget:
+    """Wall-clock time budget for parsing one document (PARSE_TIME_BUDGET)."""
+
+    deadline: float
+    exceeded: bool = False
+
+    @classmethod
+    def start(cls) -> "ParseBudget":
+        return cls(time.perf_counter() + PARSE_TIME_BUDGET)
+
+    def used_up(self) -> bool:
+        """Whether the deadline has passed; marks the budget as exceeded if so."""
+        if time.perf_counter() >= self.deadline:
+            self.exceeded = True
+        return self.exceeded
+
+
 @dataclass
 class PatientData:
     """Patient information extracted from document."""
@@ -75,6 +146,22 @@ class PatientData:
         }
 
 
+@dataclass
+class OCRLine:
+    """Single line of OCR'd text with its bounding box in image pixels."""
+
+    text: str
+    left: int
+    top: int
+    right: int
+    bottom: int
+    confidences: List[float]
+
+    @property
+    def center_y(self) -> float:
+        return (self.top + self.bottom) / 2
+
+
 @dataclass
 class BloodTest:
     """Single blood test result."""
@@ -96,14 +183,34 @@ class DocumentParser:
     and blood test results.
     """
 
-    def __init__(self):
-        """Initialize the document parser."""
-        if not DOCX_AVAILABLE and not PDFPLUMBER_AVAILABLE:
+    def __init__(self, pdf_backend: Optional[str] = None):
+        """
+        Initialize the document parser.
+
+        Args:
+            pdf_backend: PDF extraction backend name ("auto", "pymupdf" or
+                "pdfplumber"); defaults to config.PDF_BACKEND
+        """
+        if not DOCX_AVAILABLE and not PDFPLUMBER_AVAILABLE and not PYMUPDF_AVAILABLE:
             raise DataLoaderError(
                 "No document parsing libraries available. "
-                "Install pdfplumber and/or python-docx."
+                "Install PyMuPDF, pdfplumber and/or python-docx."
             )
+        self.pdf_backend_name = pdf_backend or PDF_BACKEND
+        self._pdf_backend: Optional[PDFBackend] = None
         self.regex_patterns = self._load_regex_patterns()
+        self.name_resolver = get_name_resolver(DATA_DIR)
+
+    def _get_pdf_backend(self) -> PDFBackend:
+        """
+        Get the PDF extraction backend, resolving it on first use.
+
+        Raises:
+            DataLoaderError: If the configured backend is not installed
+        """
+        if self._pdf_backend is None:
+            self._pdf_backend = get_pdf_backend(self.pdf_backend_name)
+        return self._pdf_backend
 
     def _load_regex_patterns(self) -> Dict[str, Any]:
         """Load regex patterns from configuration file."""
@@ -113,11 +220,11 @@ class DocumentParser:
                 return data.get("patterns", {})
         except FileNotFoundError:
             logger.warning(
-                f"Regex patterns file not found: {REGEX_PATTERNS_FILE}, using defaults"
+                "Regex patterns file not found: %s, using defaults", REGEX_PATTERNS_FILE
             )
             return self._get_default_patterns()
         except (json.JSONDecodeError, Exception) as e:
-            logger.error(f"Failed to load regex patterns: {e}, using defaults")
+            logger.error("Failed to load regex patterns: %s, using defaults", e)
             return self._get_default_patterns()
 
     def _get_default_patterns(self) -> Dict[str, Any]:
@@ -149,7 +256,8 @@ class DocumentParser:
             file_path: Path to the document file
 
         Returns:
-            Dictionary with 'patient' and 'blood_tests' keys
+            Dictionary with 'patient' and 'blood_tests' keys, plus
+            'parse_info' describing the strategies tried (see _run_strategies)
 
         Raises:
             DataLoaderError: If file cannot be parsed
@@ -165,26 +273,56 @@ class DocumentParser:
                 f"File too large: {file_size} bytes. Maximum allowed: {MAX_FILE_SIZE} bytes"
             )
 
+        return self._parse_source(file_path, file_path.suffix)
+
+    def parse_bytes(self, data: BytesLike, kind: str) -> Dict:
+        """
+        Parse a blood test document held in memory.
+
+        The content is passed to PyMuPDF, pdfplumber and the DOCX readers
+        directly, without writing a temporary file or copying the buffer.
+
+        Args:
+            data: Document content, e.g. an uploaded file body
+            kind: Document format, "pdf" or "docx" (a leading dot is accepted)
+
+        Returns:
+            Dictionary with 'patient' and 'blood_tests' keys
+
+        Raises:
+            DataLoaderError: If the content cannot be parsed
+        """
+        view = memoryview(data)
+        if view.nbytes > MAX_FILE_SIZE:
+            raise DataLoaderError(
+                f"File too large: {view.nbytes} bytes. Maximum allowed: {MAX_FILE_SIZE} bytes"
+            )
+
+        return self._parse_source(view, "." + kind.lower().lstrip("."))
+
+    def _parse_source(self, source: DocumentSource, suffix: str) -> Dict:
+        """
+        Detect format and parse a document from a path or an in-memory buffer.
+
+        Args:
+            source: Path to the document or its content as a memoryview
+            suffix: Format suffix, ".pdf" or ".docx"
+
+        Returns:
+            Dictionary with 'patient' and 'blood_tests' keys
+        """
         # Detect format and parse accordingly
-        if file_path.suffix.lower() == ".docx":
-            if not DOCX_AVAILABLE:
-                raise DataLoaderError(
-                    "python-docx library not available. "
-                    "Install it with: pip install python-docx"
-                )
-            return self._parse_docx(file_path)
+        if suffix.lower() == ".docx":
+            return self._resolve_misread_names(self._parse_docx(source))
 
-        elif file_path.suffix.lower() == ".pdf":
-            if not PDFPLUMBER_AVAILABLE:
-                raise DataLoaderError(
-                    "pdfplumber library not available. "
-                    "Install it with: pip install pdfplumber"
-                )
-            result = self._parse_pdf(file_path)
+        elif suffix.lower() == ".pdf":
+            # Fail early if no PDF library is installed
+            self._get_pdf_backend()
+            result = self._parse_pdf(source)
 
         else:
             raise DataLoaderError(
-                f"Unsupported file format: {file_path.suffix}. "
+                f"Unsupported file format: {suffix}. "
                 "Supported formats: .pdf, .docx"
             )
 
@@ -198,9 +336,140 @@ class DocumentParser:
         if result["patient"]["age"] == 0:
             result["patient"]["age"] = DEFAULT_PATIENT_AGE
 
+        return self._resolve_misread_names(result)
+
+    def _resolve_misread_names(self, result: Dict) -> Dict:
+        """
+        Rename tests whose name only matches a known test fuzzily.
+
+        Such names are usually OCR misreads ("FERRYTVNA"); they are replaced
+        by the canonical test ID, which the engines match exactly.
+        """
+        for test in result.get("blood_tests", []):
+            if self.name_resolver.resolve(test["name"]) is None:
+                canonical = self.name_resolver.resolve(test["name"], fuzzy=True)
+                if canonical is not None:
+                    test["name"] = canonical
         return result
 
-    def _parse_docx(self, file_path: Path) -> Dict:
+    def _run_strategies(
+        self,
+        source: DocumentSource,
+        strategies: List[ParseStrategy],
+        budget: Optional[ParseBudget] = None,
+    ) -> Dict:
+        """
+        Run parse strategies in order and return the best result.
+
+        Each result is scored with _score_result. The first one scoring at
+        least PARSE_ACCEPT_SCORE is returned immediately, so later (more
+        expensive) strategies are skipped. No strategy is started once the
+        budget (PARSE_TIME_BUDGET seconds by default) is used up; the best
+        result so far is returned instead. OCR checks the same budget
+        between pages. A failing strategy is logged and skipped.
+
+        The returned result has a 'parse_info' key with the chosen strategy,
+        its score, the total time and per-stage name, score, time and error.
+
+        Raises:
+            DataLoaderError: If no strategy produced a result
+        """
+        started = time.perf_counter()
+        budget = budget or ParseBudget.start()
+        stages: List[Dict[str, Any]] = []
+        best: Optional[Dict] = None
+        best_stage: Optional[Dict[str, Any]] = None
+
+        for strategy in strategies:
+            if strategy.fallback_only and best is not None:
+                continue
+            if stages and budget.used_up():
+                logger.warning(
+                    "Parse time budget of %ss used up for %s, skipping '%s' and later strategies",
+                    PARSE_TIME_BUDGET,
+                    _source_name(source),
+                    strategy.name,
+                )
+                break
+
+            stage_started = time.perf_counter()
+            stage: Dict[str, Any] = {"name": strategy.name, "score": None}
+            try:
+                result = strategy.run()
+            except Exception as e:
+                logger.warning(
+                    "Parse strategy '%s' failed for %s: %s", strategy.name, _source_name(source), e
+                )
+                stage["error"] = str(e)
+                result = None
+            stage["elapsed"] = time.perf_counter() - stage_started
+            stages.append(stage)
+
+            if result is None:
+                continue
+            stage["score"] = self._score_result(result)
+            if best_stage is None or stage["score"] > best_stage["score"]:
+                best, best_stage = result, stage
+            if stage["score"] >= PARSE_ACCEPT_SCORE:
+                break
+
+        if best is None:
+            errors = "; ".join(
+                f"{stage['name']}: {stage['error']}" for stage in stages if "error" in stage
+            )
+            if budget.exceeded:
+                errors = errors or "time budget exceeded"
+            raise DataLoaderError(
+                f"Failed to parse {_source_name(source)}: {errors or 'no usable content'}"
+            )
+
+        best["parse_info"] = {
+            "strategy": best_stage["name"],
+            "score": best_stage["score"],
+            "elapsed": time.perf_counter() - started,
+            "budget_exceeded": budget.exceeded,
+            "stages": stages,
+        }
+        logger.debug(
+            "Parsed %s with '%s' (score %.2f)",
+            _source_name(source),
+            best_stage["name"],
+            best_stage["score"],
+        )
+        return best
+
+    def _score_result(self, result: Dict) -> float:
+        """
+        Score a parse result between 0 and 1.
+
+        The score is the mean of three parts: the number of recognised tests
+        relative to a complete panel (PARSE_FULL_PANEL_TESTS), the share of
+        test names the name resolver recognises and the share of tests with a
+        plausible unit. Only exact and alias matches count as recognised: a
+        name that merely resembles a known test is as likely to come from a
+        misparse as from an OCR misread, and must not lift a poor result
+        above PARSE_ACCEPT_SCORE.
+        """
+        blood_tests = result.get("blood_tests", [])
+        if not blood_tests:
+            return 0.0
+
+        count = len(blood_tests)
+        recognised = sum(
+            1 for test in blood_tests if self.name_resolver.resolve(test["name"], fuzzy=False)
+        )
+        valid_units = sum(
+            1
+            for test in blood_tests
+            if UNIT_PATTERN.fullmatch((test.get("unit") or "").strip())
+        )
+        return (
+            min(recognised / PARSE_FULL_PANEL_TESTS, 1.0)
+            + recognised / count
+            + valid_units / count
+        ) / 3
+
+    def _parse_docx(self, source: DocumentSource) -> Dict:
         """
         Parse DOCX file and extract patient data and blood tests.
 
@@ -208,14 +477,85 @@ class DocumentParser:
         - Table 0: Patient information (2 rows x 4 columns)
         - Table 1: Blood test results (header + data rows, 3 columns)
 
+        The tables are read with the streaming reader first; python-docx is
+        used as a fallback for layouts the streaming reader does not handle.
+
         Args:
-            file_path: Path to DOCX file
+            source: Path to DOCX file or its content
 
         Returns:
-            Dictionary with patient and blood_tests data
+            Dictionary with patient, blood_tests and parse_info data
+        """
+        return self._run_strategies(
+            source,
+            [
+                ParseStrategy("docx-stream", lambda: self._parse_docx_streaming(source)),
+                ParseStrategy(
+                    "python-docx",
+                    lambda: self._parse_docx_with_python_docx(source),
+                    fallback_only=True,
+                ),
+            ],
+        )
+
+    def _parse_docx_streaming(self, source: DocumentSource) -> Optional[Dict]:
+        """Parse DOCX tables with the streaming reader, None if it cannot."""
+        try:
+            tables = self._read_docx_tables_streaming(source)
+        except (UnsupportedLayoutError, zipfile.BadZipFile, KeyError, ParseError) as e:
+            logger.debug(
+                "Streaming DOCX reader skipped %s: %s", _source_name(source), e
+            )
+            return None
+
+        if tables is None:
+            return None
+
+        try:
+            patient_data = self._extract_patient_from_table(tables[0])
+            blood_tests = self._extract_blood_tests_from_table(tables[1])
+            return {
+                "patient": patient_data.to_dict(),
+                "blood_tests": [test.to_dict() for test in blood_tests],
+            }
+
+        except Exception as e:
+            raise DataLoaderError(f"Failed to parse DOCX file: {str(e)}")
+
+    def _read_docx_tables_streaming(
+        self, source: DocumentSource
+    ) -> Optional[List[List[List[str]]]]:
+        """
+        Read the patient and results tables with the streaming DOCX reader.
+
+        Parsing stops as soon as the results table is complete, so the rest
+        of the document is never read.
+
+        Returns:
+            List with the patient and results tables as lists of rows, or None
+            if the document has fewer than 2 tables
         """
+        tables: List[List[List[str]]] = [[], []]
+        with closing(iter_docx_rows(_open_source(source))) as rows:
+            for table_index, cells in rows:
+                if table_index > 1:
+                    break
+                tables[table_index].append(cells)
+
+        if not tables[1]:
+            return None
+        return tables
+
+    def _parse_docx_with_python_docx(self, source: DocumentSource) -> Dict:
+        """Parse DOCX file by loading it fully with python-docx."""
+        if not DOCX_AVAILABLE:
+            raise DataLoaderError(
+                "python-docx library not available. "
+                "Install it with: pip install python-docx"
+            )
+
         try:
-            doc = Document(str(file_path))
+            doc = docx.Document(_open_source(source))
 
             if len(doc.tables) < 2:
                 raise DataLoaderError(
@@ -238,58 +578,148 @@ class DocumentParser:
         except Exception as e:
             raise DataLoaderError(f"Failed to parse DOCX file: {str(e)}")
 
-    def _parse_pdf(self, file_path: Path) -> Dict:
+    def _parse_pdf(self, source: DocumentSource) -> Dict:
         """
         Parse PDF file and extract patient data and blood tests.
 
-        This method attempts multiple strategies:
-        1. Extract tables from PDF
-        2. Extract from text using pdfplumber
-        3. Fallback to OCR if text is garbled
+        Text and tables are read through the configured PDF backend
+        (PyMuPDF or pdfplumber). Strategies are tried in order of cost, and
+        later ones only run if the earlier results score too low:
+        1. "tables" - extract the patient and results tables
+        2. "text" - parse the text layer of pages that have a usable one
+        3. "ocr" - rasterize and OCR only the garbled or scanned pages,
+           combined with the text pages
+        If the backend cannot open the file or extract its text, the whole
+        document is OCR'd.
 
         Args:
-            file_path: Path to PDF file
+            source: Path to PDF file or its content
 
         Returns:
-            Dictionary with patient and blood_tests data
+            Dictionary with patient, blood_tests and parse_info data
         """
+        budget = ParseBudget.start()
         try:
-            with pdfplumber.open(str(file_path)) as pdf:
-                all_tables = []
-                for page in pdf.pages:
-                    tables = page.extract_tables()
-                    if tables:
-                        all_tables.extend(tables)
-
-                if len(all_tables) >= 2:
-                    patient_data = self._extract_patient_from_table(all_tables[0])
-                    blood_tests = self._extract_blood_tests_from_table(all_tables[1])
-                    return {
-                        "patient": patient_data.to_dict(),
-                        "blood_tests": [test.to_dict() for test in blood_tests],
-                    }
-
-                # Text extraction path — check for garbled text
-                combined_text = ""
-                for page in pdf.pages:
-                    combined_text += (page.extract_text() or "") + "\n"
-
-                if self._is_text_garbled(combined_text):
-                    return self._parse_pdf_with_ocr(file_path)
-
-                patient_data, blood_tests = self._extract_from_text(pdf)
-                return {
-                    "patient": patient_data.to_dict(),
-                    "blood_tests": [test.to_dict() for test in blood_tests],
-                }
-
+            pdf = self._get_pdf_backend().open(source)
         except Exception as e:
-            try:
-                return self._parse_pdf_with_ocr(file_path)
-            except Exception as ocr_error:
-                raise DataLoaderError(
-                    f"Failed to parse PDF file. Original error: {str(e)}. OCR also failed: {str(ocr_error)}"
-                )
+            logger.warning(
+                "Could not open %s with the PDF backend, using OCR: %s", _source_name(source), e
+            )
+            return self._run_strategies(
+                source,
+                [ParseStrategy("ocr", lambda: self._parse_pdf_with_ocr(source, budget))],
+                budget,
+            )
+
+        with pdf:
+            page_texts_cache: List[tuple] = []
+
+            def page_texts() -> tuple:
+                # Shared by the text and OCR strategies, extracted once
+                if not page_texts_cache:
+                    page_texts_cache.append(self._extract_page_texts(pdf))
+                return page_texts_cache[0]
+
+            def ocr() -> Optional[Dict]:
+                try:
+                    texts = page_texts()
+                except Exception as e:
+                    logger.warning(
+                        "Could not extract text from %s, using OCR: %s", _source_name(source), e
+                    )
+                    return self._parse_pdf_with_ocr(source, budget)
+                return self._parse_pdf_garbled_pages(source, *texts, budget)
+
+            return self._run_strategies(
+                source,
+                [
+                    ParseStrategy("tables", lambda: self._parse_pdf_tables(pdf)),
+                    ParseStrategy("text", lambda: self._parse_pdf_text(*page_texts())),
+                    ParseStrategy("ocr", ocr),
+                ],
+                budget,
+            )
+
+    def _parse_pdf_tables(self, pdf) -> Optional[Dict]:
+        """Parse the patient and results tables of a PDF, None if it has fewer than 2."""
+        all_tables = []
+        for page in pdf.pages:
+            tables = page.extract_tables()
+            if tables:
+                all_tables.extend(tables)
+            # Only the patient and results tables are used
+            if len(all_tables) >= 2:
+                break
+
+        if len(all_tables) < 2:
+            return None
+
+        patient_data = self._extract_patient_from_table(all_tables[0])
+        blood_tests = self._extract_blood_tests_from_table(all_tables[1])
+        return {
+            "patient": patient_data.to_dict(),
+            "blood_tests": [test.to_dict() for test in blood_tests],
+        }
+
+    def _parse_pdf_text(
+        self, page_texts: List[str], garbled_pages: List[int]
+    ) -> Optional[Dict]:
+        """Parse the usable text layer pages, None if every page is garbled."""
+        if len(garbled_pages) == len(page_texts):
+            return None
+        return self._parse_page_texts(page_texts)
+
+    def _parse_pdf_garbled_pages(
+        self,
+        source: DocumentSource,
+        page_texts: List[str],
+        garbled_pages: List[int],
+        budget: Optional[ParseBudget] = None,
+    ) -> Optional[Dict]:
+        """
+        OCR the garbled pages and parse them together with the text pages.
+
+        Returns:
+            Parse result, or None if no page needs OCR
+        """
+        if not garbled_pages:
+            return None
+        if len(garbled_pages) == len(page_texts):
+            return self._parse_pdf_with_ocr(source, budget)
+
+        page_texts = list(page_texts)
+        for page_num, text in self._ocr_pdf_pages(source, garbled_pages, budget).items():
+            page_texts[page_num] = text
+        return self._parse_page_texts(page_texts)
+
+    def _parse_page_texts(self, page_texts: List[str]) -> Dict:
+        full_text = "".join(text + "\n" for text in page_texts)
+        patient_data, blood_tests = self._parse_text_content(full_text)
+        return {
+            "patient": patient_data.to_dict(),
+            "blood_tests": [test.to_dict() for test in blood_tests],
+        }
+
+    def _extract_page_texts(self, pdf) -> tuple:
+        """
+        Extract the text layer of every page and flag pages that need OCR.
+
+        Args:
+            pdf: Open PDF backend document
+
+        Returns:
+            Tuple of (list of page texts, list of garbled page indexes).
+            Garbled pages have an empty string in the text list.
+        """
+        page_texts = []
+        garbled_pages = []
+        for page_num, page in enumerate(pdf.pages):
+            text = page.extract_text() or ""
+            if self._is_text_garbled(text):
+                garbled_pages.append(page_num)
+                text = ""
+            page_texts.append(text)
+        return page_texts, garbled_pages
 
     def _extract_patient_from_table(self, table) -> PatientData:
         """
@@ -428,18 +858,15 @@ class DocumentParser:
         except ValueError:
             return None
 
-    def _extract_from_text(self, pdf) -> tuple:
-        full_text = ""
-        for page in pdf.pages:
-            full_text += (page.extract_text() or "") + "\n"
-        return self._parse_text_content(full_text)
-
     def _is_text_garbled(self, text: str) -> bool:
         """
         Check if extracted text is garbled (contains CID codes).
 
         CID encoding appears as many (cid:XXX) patterns and indicates
-        the PDF uses special character encoding that needs OCR.
+        the PDF uses special character encoding that needs OCR. The
+        readable-character ratio is estimated from an evenly spaced sample
+        of at most GARBLED_SAMPLE_SIZE characters, so the check costs the
+        same for every page regardless of its length.
 
         Args:
             text: Extracted text to check
@@ -456,51 +883,37 @@ class DocumentParser:
             return True
 
         # Check if text has very few readable characters
-        readable_chars = sum(1 for c in text if c.isalnum() or c.isspace())
         total_chars = len(text)
-        if total_chars > 100 and readable_chars / total_chars < 0.3:
+        if total_chars <= 100:
+            return False
+
+        sample = text[:: max(1, total_chars // GARBLED_SAMPLE_SIZE)]
+        readable_chars = sum(1 for c in sample if c.isalnum() or c.isspace())
+        if readable_chars / len(sample) < 0.3:
             return True
 
         return False
 
-    def _parse_pdf_with_ocr(self, file_path: Path) -> Dict:
+    def _parse_pdf_with_ocr(
+        self, source: DocumentSource, budget: Optional[ParseBudget] = None
+    ) -> Dict:
         """
         Parse PDF using OCR (Optical Character Recognition).
 
         This method converts PDF pages to images and uses Tesseract OCR
-        to extract text. Used as fallback when pdfplumber fails.
+        to extract text. Used as fallback when text extraction fails.
 
         Args:
-            file_path: Path to PDF file
+            source: Path to PDF file or its content
+            budget: Time budget of the document; pages after it is used up
+                are not OCR'd
 
         Returns:
             Dictionary with patient and blood_tests data
         """
-        if not PYMUPDF_AVAILABLE:
-            raise DataLoaderError(
-                "PyMuPDF not available. Install it with: pip install PyMuPDF"
-            )
-        if not OCR_AVAILABLE:
-            raise DataLoaderError(
-                "OCR libraries not available. Install them with: pip install pytesseract Pillow"
-            )
-
         try:
-            with fitz.open(str(file_path)) as doc:
-                # Extract text from all pages using OCR
-                full_text = ""
-                for page_num, page in enumerate(doc):
-                    # Convert page to image
-                    mat = fitz.Matrix(2.0, 2.0)
-                    pix = page.get_pixmap(matrix=mat)
-                    img_data = pix.tobytes("png")
-                    img = Image.open(io.BytesIO(img_data))
-
-                    # Perform OCR with Polish language
-                    page_text = pytesseract.image_to_string(
-                        img, lang="pol", config="--psm 6"
-                    )
-                    full_text += page_text + "\n"
+            ocr_texts = self._ocr_pdf_pages(source, budget=budget)
+            full_text = "".join(text + "\n" for text in ocr_texts.values())
 
             # Check if OCR produced usable text
             if not full_text.strip():
@@ -520,6 +933,183 @@ class DocumentParser:
         except Exception as e:
             raise DataLoaderError(f"Failed to parse PDF with OCR: {str(e)}")
 
+    def _ocr_pdf_pages(
+        self,
+        source: DocumentSource,
+        page_numbers: Optional[List[int]] = None,
+        budget: Optional[ParseBudget] = None,
+    ) -> Dict[int, str]:
+        """
+        Rasterize PDF pages and OCR them.
+
+        Args:
+            source: Path to PDF file or its content
+            page_numbers: Zero-based indexes of pages to OCR (all pages if None)
+            budget: Time budget of the document; once it is used up, no
+                further page is started (at least one page is always OCR'd)
+
+        Returns:
+            Dictionary mapping page index to OCR'd text, in page order
+        """
+        if not PYMUPDF_AVAILABLE:
+            raise DataLoaderError(
+                "PyMuPDF not available. Install it with: pip install PyMuPDF"
+            )
+        if not OCR_AVAILABLE:
+            raise DataLoaderError(
+                "OCR libraries not available. Install them with: pip install pytesseract Pillow"
+            )
+
+        ocr_texts = {}
+        if isinstance(source, Path):
+            doc = fitz.open(str(source))
+        else:
+            doc = fitz.open(stream=source, filetype="pdf")
+
+        with doc:
+            if page_numbers is None:
+                page_numbers = list(range(doc.page_count))
+            for page_num in page_numbers:
+                if ocr_texts and budget is not None and budget.used_up():
+                    logger.warning(
+                        "Parse time budget of %ss used up for %s, OCR stopped after %s of %s pages",
+                        PARSE_TIME_BUDGET,
+                        _source_name(source),
+                        len(ocr_texts),
+                        len(page_numbers),
+                    )
+                    break
+                ocr_texts[page_num] = self._ocr_page(doc[page_num])
+        return ocr_texts
+
+    def _ocr_page(self, page) -> str:
+        """
+        OCR a single PyMuPDF page with adaptive resolution.
+
+        The page is first rendered at OCR_BASE_ZOOM. Lines that look like
+        result rows (a test name followed by a value) mark the result-table
+        region. If tesseract's mean confidence inside that region is below
+        OCR_MIN_CONFIDENCE, only the region is re-rendered at OCR_MAX_ZOOM
+        and OCR'd again with a block segmentation mode and a character
+        whitelist. Lines above the region (patient header) keep the
+        low-resolution reading; footer lines below it are dropped. If no
+        region is found and the page's mean confidence is below
+        OCR_MIN_CONFIDENCE (typically a poor scan), the whole page is
+        OCR'd again at OCR_MAX_ZOOM.
+
+        Args:
+            page: PyMuPDF page
+
+        Returns:
+            OCR'd page text
+        """
+        lines = self._ocr_lines(self._render_page(page, OCR_BASE_ZOOM))
+        region = self._find_results_region(lines)
+        if region is None:
+            if self._mean_confidence(lines) >= OCR_MIN_CONFIDENCE:
+                return "\n".join(line.text for line in lines)
+            page_text = pytesseract.image_to_string(
+                self._render_page(page, OCR_MAX_ZOOM), lang=OCR_LANGUAGE, config="--psm 6"
+            )
+            return page_text if page_text.strip() else "\n".join(line.text for line in lines)
+
+        top, bottom = region[1], region[3]
+        result_lines = [line for line in lines if top <= line.center_y <= bottom]
+        if self._mean_confidence(result_lines) >= OCR_MIN_CONFIDENCE:
+            return "\n".join(line.text for line in lines)
+
+        header = [line.text for line in lines if line.center_y < top]
+        scale = 1 / OCR_BASE_ZOOM
+        clip = fitz.Rect(*(coord * scale for coord in region)) & page.rect
+        roi_image = self._render_page(page, OCR_MAX_ZOOM, clip=clip)
+        roi_text = pytesseract.image_to_string(
+            roi_image,
+            lang=OCR_LANGUAGE,
+            config=f"--psm 6 -c tessedit_char_whitelist={OCR_CHAR_WHITELIST}",
+        )
+        return "\n".join(header + [roi_text])
+
+    @staticmethod
+    def _mean_confidence(lines: List[OCRLine]) -> float:
+        """Mean tesseract word confidence of lines, 0 if they have none."""
+        confidences = [conf for line in lines for conf in line.confidences]
+        return sum(confidences) / len(confidences) if confidences else 0.0
+
+    def _render_page(self, page, zoom: float, clip=None):
+        """Render a PyMuPDF page (or a clipped region of it) to a PIL image."""
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip)
+        return Image.open(io.BytesIO(pix.tobytes("png")))
+
+    def _ocr_lines(self, image) -> List[OCRLine]:
+        """
+        OCR an image and group recognised words into text lines.
+
+        Args:
+            image: PIL image of a rendered page
+
+        Returns:
+            List of OCRLine objects in reading order
+        """
+        data = pytesseract.image_to_data(
+            image,
+            lang=OCR_LANGUAGE,
+            config="--psm 6",
+            output_type=pytesseract.Output.DICT,
+        )
+
+        lines: Dict[tuple, OCRLine] = {}
+        for i, word in enumerate(data["text"]):
+            word = word.strip()
+            if not word:
+                continue
+            key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            left, top = data["left"][i], data["top"][i]
+            right, bottom = left + data["width"][i], top + data["height"][i]
+            line = lines.get(key)
+            if line is None:
+                lines[key] = OCRLine(word, left, top, right, bottom, [])
+                line = lines[key]
+            else:
+                line.text += " " + word
+                line.left, line.top = min(line.left, left), min(line.top, top)
+                line.right, line.bottom = max(line.right, right), max(line.bottom, bottom)
+            conf = float(data["conf"][i])
+            if conf >= 0:
+                line.confidences.append(conf)
+
+        return list(lines.values())
+
+    def _find_results_region(self, lines: List[OCRLine]) -> Optional[tuple]:
+        """
+        Locate the result-table area on a page from OCR'd lines.
+
+        A result line contains a word followed by a number and does not look
+        like header/footer text (addresses, registry numbers, dates).
+
+        Args:
+            lines: OCR'd lines of the page
+
+        Returns:
+            Padded (left, top, right, bottom) bounding box in rendered-image
+            pixels, or None if no result lines were found
+        """
+        result_lines = [
+            line
+            for line in lines
+            if RESULT_LINE_PATTERN.search(line.text)
+            and not SKIP_NAME_PATTERN.search(line.text.lower())
+        ]
+        if not result_lines:
+            return None
+
+        pad = OCR_REGION_PADDING
+        return (
+            max(0, min(line.left for line in result_lines) - pad),
+            max(0, min(line.top for line in result_lines) - pad),
+            max(line.right for line in result_lines) + pad,
+            max(line.bottom for line in result_lines) + pad,
+        )
+
     def _parse_text_content(self, text: str) -> tuple:
         """
         Parse patient data and blood tests from extracted text.
@@ -668,36 +1258,23 @@ class DocumentParser:
                 unit = " "
 
             # Skip if name looks like header/footer text
-            skip_patterns = [
-                r"ul\.?",
-                r"numer",
-                r"nr\s",
-                r"data",
-                r"strona",
-                r"oddział",
-                r"kod",
-                r"adres",
-                r"tel\.?",
-                r"fax",
-                r"email",
-                r"pacjent",
-                r"księga",
-                r"rejestrowy",
-                r"podmiot",
-                r"leczniczy",
-            ]
-
             name_lower = name.lower()
-            for pattern in skip_patterns:
-                if re.search(pattern, name_lower):
-                    return False
+            if SKIP_NAME_PATTERN.search(name_lower):
+                return False
 
             # Skip if name is too long or contains only addresses/numbers
             if len(name) > 100 or len(name.split()) > 10:
                 return False
 
+            # A test name never spans lines; such a match runs across rows
+            if "\n" in name:
+                return False
+
+            canonical = self.name_resolver.resolve(name, fuzzy=True)
+
             # If valid_keywords provided, check if name contains any
-            if valid_keywords:
+            # (names of known tests and their aliases are always accepted)
+            if valid_keywords and canonical is None:
                 if not any(
                     re.search(keyword, name_lower) for keyword in valid_keywords
                 ):
@@ -708,8 +1285,12 @@ class DocumentParser:
                     ):
                         return False
 
-            # Avoid duplicates
-            if not any(bt.name == name for bt in blood_tests):
+            # Avoid duplicates, including other spellings of the same test
+            test_id = canonical or name
+            if not any(
+                (self.name_resolver.resolve(bt.name, fuzzy=True) or bt.name) == test_id
+                for bt in blood_tests
+            ):
                 blood_tests.append(BloodTest(name=name, value=value, unit=unit))
                 return True
 
@@ -0,0 +1,102 @@
+"""
+Streaming reader for tables in DOCX files.
+
+Opens the .docx zip and parses ``word/document.xml`` with an iterative XML
+parser, yielding table rows as lists of cell strings without building
+python-docx objects for the whole document. Elements are discarded as soon
+as they have been read, so memory stays constant regardless of document
+size. Layouts the reader does not handle (merged cells, nested tables)
+raise UnsupportedLayoutError so callers can fall back to python-docx.
+"""
+
+import zipfile
+from pathlib import Path
+from typing import IO, Iterator, List, Tuple, Union
+from xml.etree.ElementTree import iterparse
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_BODY = f"{W_NS}body"
+_TABLE = f"{W_NS}tbl"
+_ROW = f"{W_NS}tr"
+_CELL = f"{W_NS}tc"
+_PARAGRAPH = f"{W_NS}p"
+_TEXT = f"{W_NS}t"
+_TAB = f"{W_NS}tab"
+_BREAKS = (f"{W_NS}br", f"{W_NS}cr")
+_MERGES = (f"{W_NS}gridSpan", f"{W_NS}vMerge", f"{W_NS}hMerge")
+
+
+class UnsupportedLayoutError(ValueError):
+    """Raised when a document uses a table layout the streaming reader skips."""
+
+
+def iter_docx_rows(
+    source: Union[str, Path, IO[bytes]],
+) -> Iterator[Tuple[int, List[str]]]:
+    """
+    Stream the rows of top-level tables in a DOCX document.
+
+    Cell text matches python-docx ``cell.text``: paragraphs are joined with
+    newlines, tabs and line breaks are kept.
+
+    Args:
+        source: Path to a .docx file or a binary file-like object
+
+    Yields:
+        Tuples of (table index, list of cell texts) in document order
+
+    Raises:
+        UnsupportedLayoutError: On merged cells or nested tables
+        zipfile.BadZipFile, KeyError: If the file is not a valid DOCX
+    """
+    if isinstance(source, Path):
+        source = str(source)
+
+    with zipfile.ZipFile(source) as archive, archive.open("word/document.xml") as xml:
+        body = None
+        table_index = -1
+        table_depth = 0
+        row: List[str] = []
+        paragraphs: List[str] = []
+        text: List[str] = []
+
+        for event, elem in iterparse(xml, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                if tag == _BODY:
+                    body = elem
+                elif tag == _TABLE:
+                    table_depth += 1
+                    if table_depth > 1:
+                        raise UnsupportedLayoutError("Nested tables are not supported")
+                    table_index += 1
+                continue
+
+            if tag == _TEXT:
+                text.append(elem.text or "")
+            elif tag == _TAB:
+                text.append("\t")
+            elif tag in _BREAKS:
+                text.append("\n")
+            elif tag == _PARAGRAPH:
+                paragraphs.append("".join(text))
+                text = []
+                elem.clear()
+            elif tag == _CELL:
+                row.append("\n".join(paragraphs))
+                paragraphs = []
+            elif tag == _ROW:
+                if table_depth == 1:
+                    yield table_index, row
+                row = []
+                elem.clear()
+            elif tag == _TABLE:
+                table_depth -= 1
+            elif tag in _MERGES and table_depth:
+                raise UnsupportedLayoutError("Merged table cells are not supported")
+
+            if body is not None and elem in body:
+                # Top-level element fully read - drop it from the tree
+                paragraphs = []
+                body.remove(elem)
@@ -5,12 +5,16 @@ class ValidationError(Exception):
     """Raised when validation fails.
 
     Used for validating data structures, reference ranges, supplements, and dosage rules.
+    Batch validation lists every invalid row in ``errors``.
     """
 
-    def __init__(self, message: str, field: str | None = None):
+    def __init__(
+        self, message: str, field: str | None = None, errors: list | None = None
+    ):
         super().__init__(message)
         self.message = message
         self.field = field
+        self.errors = errors or []
 
     def __str__(self) -> str:
         if self.field:
@@ -35,6 +39,25 @@ class DataLoaderError(Exception):
         return f"DataLoaderError: {self.message}"
 
 
+class ParseTimeoutError(DataLoaderError):
+    """Raised when parsing a document exceeds its time limit.
+
+    Used by the parse worker pool for wall-clock deadlines ("deadline") and
+    per-document CPU-time limits ("cpu_time").
+    """
+
+    def __init__(
+        self,
+        message: str,
+        file_path: str | None = None,
+        limit: float | None = None,
+        reason: str = "deadline",
+    ):
+        super().__init__(message, file_path)
+        self.limit = limit
+        self.reason = reason
+
+
 class RuleEngineError(Exception):
     """Raised when rule engine encounters an error.
 
@@ -0,0 +1,488 @@
+"""
+Writers for exporting recommendations and analyses to data formats.
+
+The CSV, HTML and JSON exporters are lightweight alternatives to the PDF
+reports: they stream items to one file without reportlab, for
+machine-readable or e-mailable output of many patients.
+"""
+
+import csv
+import json
+from html import escape
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, TextIO, Tuple, Union
+
+from pydantic import BaseModel
+
+from src.models.recommendation import Recommendation
+from src.models.test_analysis import ComprehensiveAnalysis
+from src.utils.i18n import get_language, t
+
+
+class JSONLinesExporter:
+    """
+    Writes records as JSON Lines (NDJSON), one JSON object per line.
+
+    The file is opened in append mode by default, so several runs can add to
+    the same export. Every record is flushed as soon as it is written, so a
+    reader tailing the file never sees a partial line and an interrupted run
+    keeps everything written so far.
+
+    Example:
+        with JSONLinesExporter(OUTPUT_DIR / "results.jsonl") as exporter:
+            exporter.write({"patient": "Jan Nowak", "supplements": 3})
+    """
+
+    def __init__(self, path: Path, append: bool = True):
+        """
+        Args:
+            path: Output .jsonl file
+            append: Append to an existing file instead of replacing it
+        """
+        self.path = Path(path)
+        self.append = append
+        self.count = 0
+        self._file: Optional[TextIO] = None
+
+    def open(self) -> "JSONLinesExporter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a" if self.append else "w", encoding="utf-8")
+        return self
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Write one record as a line."""
+        if self._file is None:
+            self.open()
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+        self.count += 1
+
+    def write_all(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Write records from an iterable (consumed lazily); returns the number written."""
+        written = 0
+        for record in records:
+            self.write(record)
+            written += 1
+        return written
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "JSONLinesExporter":
+        return self.open()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+RECOMMENDATION_COLUMNS = (
+    "patient_name",
+    "patient_surname",
+    "date",
+    "supplement",
+    "dosage",
+    "timing",
+    "priority",
+    "reason",
+)
+
+ANALYSIS_COLUMNS = (
+    "patient_name",
+    "patient_surname",
+    "test_date",
+    "category",
+    "test",
+    "value",
+    "unit",
+    "status",
+    "lab_min",
+    "lab_max",
+    "optimal_min",
+    "optimal_max",
+)
+
+# ComprehensiveAnalysis fields holding per-test results, with their headings
+ANALYSIS_TEST_CATEGORIES = {
+    "inflammatory_markers": "categories.inflammatory",
+    "minerals_vitamins": "categories.minerals_vitamins",
+    "electrolytes": "categories.electrolytes",
+}
+
+Exportable = Union[Recommendation, ComprehensiveAnalysis]
+
+
+def recommendation_rows(recommendation: Recommendation) -> Iterator[Dict[str, Any]]:
+    """One row per supplement; a patient without supplements gets one empty row."""
+    patient = {
+        "patient_name": recommendation.patient_name,
+        "patient_surname": recommendation.patient_surname,
+        "date": recommendation.date.isoformat(timespec="seconds"),
+    }
+    if not recommendation.supplements:
+        yield patient
+    for supplement in recommendation.supplements:
+        yield {
+            **patient,
+            "supplement": supplement.name,
+            "dosage": supplement.dosage,
+            "timing": supplement.timing,
+            "priority": supplement.priority,
+            "reason": supplement.reason,
+        }
+
+
+def analysis_rows(analysis: ComprehensiveAnalysis) -> Iterator[Dict[str, Any]]:
+    """One row per analyzed test and per glucose/insulin curve reading."""
+    patient = {
+        "patient_name": analysis.patient_name,
+        "patient_surname": analysis.patient_surname,
+        "test_date": analysis.test_date,
+    }
+    for category in ANALYSIS_TEST_CATEGORIES:
+        for test in getattr(analysis, category):
+            lab, optimal = test.lab_reference, test.optimal_range
+            yield {
+                **patient,
+                "category": category,
+                "test": test.name,
+                "value": test.value,
+                "unit": test.unit,
+                "status": test.status,
+                "lab_min": lab.min if lab else None,
+                "lab_max": lab.max if lab else None,
+                "optimal_min": optimal.min if optimal else None,
+                "optimal_max": optimal.max if optimal else None,
+            }
+
+    glucose = analysis.glucose_insulin
+    if glucose:
+        for category, curve in (
+            ("glucose_curve", glucose.glucose_curve),
+            ("insulin_curve", glucose.insulin_curve),
+        ):
+            for reading in curve.readings if curve else []:
+                yield {
+                    **patient,
+                    "category": category,
+                    "test": f"{reading.timepoint} min",
+                    "value": reading.value,
+                    "unit": reading.unit,
+                    "status": reading.status,
+                }
+
+
+def _rows(item: Exportable) -> Tuple[Tuple[str, ...], Iterator[Dict[str, Any]]]:
+    if isinstance(item, Recommendation):
+        return RECOMMENDATION_COLUMNS, recommendation_rows(item)
+    if isinstance(item, ComprehensiveAnalysis):
+        return ANALYSIS_COLUMNS, analysis_rows(item)
+    raise TypeError(f"Cannot export {type(item).__name__}")
+
+
+class _StreamExporter:
+    """
+    Base of the exporters writing one file item by item.
+
+    Subclasses write their preamble in _start, each item in _export and the
+    closing part in _finish, so nothing but the current item is held in
+    memory.
+    """
+
+    # File extension of the format
+    suffix = ""
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Output file, replaced if it exists
+        """
+        self.path = Path(path)
+        self.count = 0
+        self._file: Optional[TextIO] = None
+
+    def open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8", newline="")
+        self._start()
+        return self
+
+    def export(self, item: Exportable) -> None:
+        """Write one Recommendation or ComprehensiveAnalysis."""
+        if self._file is None:
+            self.open()
+        self._export(item)
+        self.count += 1
+
+    def export_all(self, items: Iterable[Exportable]) -> int:
+        """Write items from an iterable (consumed lazily); returns the number written."""
+        written = 0
+        for item in items:
+            self.export(item)
+            written += 1
+        return written
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._finish()
+            self._file.close()
+            self._file = None
+
+    def _start(self) -> None:
+        pass
+
+    def _export(self, item: Exportable) -> None:
+        raise NotImplementedError
+
+    def _finish(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class CSVExporter(_StreamExporter):
+    """
+    Writes recommendations (one row per supplement) or analyses (one row
+    per test) as CSV.
+
+    The columns are those of the first exported item; a file holds either
+    recommendations or analyses.
+
+    Example:
+        with CSVExporter(OUTPUT_DIR / "recommendations.csv") as exporter:
+            exporter.export_all(recommendations)
+    """
+
+    suffix = ".csv"
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._writer: Optional[csv.DictWriter] = None
+
+    def _export(self, item: Exportable) -> None:
+        columns, rows = _rows(item)
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, fieldnames=columns)
+            self._writer.writeheader()
+        elif tuple(self._writer.fieldnames) != columns:
+            raise ValueError("Cannot mix recommendations and analyses in one CSV file")
+        self._writer.writerows(rows)
+
+
+class JSONExporter(_StreamExporter):
+    """
+    Writes items as one JSON array, element by element.
+
+    Besides models, plain dictionaries (e.g. DocumentPipeline rows) are
+    written as they are.
+    """
+
+    suffix = ".json"
+
+    def _start(self) -> None:
+        self._file.write("[")
+
+    def _export(self, item: Union[Exportable, Dict[str, Any]]) -> None:
+        data = item.model_dump(mode="json") if isinstance(item, BaseModel) else item
+        self._file.write(",\n" if self.count else "\n")
+        self._file.write(json.dumps(data, ensure_ascii=False, default=str))
+
+    def _finish(self) -> None:
+        self._file.write("\n]\n")
+
+
+_HTML_STYLE = """
+body { font-family: "DejaVu Sans", Arial, sans-serif; margin: 2em; color: #222; }
+.disclaimer, .warning { color: #c00; font-size: 0.85em; }
+section { margin-bottom: 2.5em; page-break-inside: avoid; }
+table { border-collapse: collapse; margin: 0.5em 0; }
+th, td { border: 1px solid #777; padding: 0.3em 0.6em; text-align: left; font-size: 0.9em; }
+th { background: #808080; color: #fff; }
+td { background: #f5f5dc; }
+.status-low { color: #3b82f6; } .status-high { color: #ef4444; } .status-normal { color: #22c55e; }
+"""
+
+
+class HTMLExporter(_StreamExporter):
+    """
+    Writes a self-contained HTML file (inline styles, no external assets)
+    with a section per exported item, suitable as an e-mail attachment.
+    """
+
+    suffix = ".html"
+
+    def _start(self) -> None:
+        self._file.write(
+            f'<!DOCTYPE html>\n<html lang="{escape(get_language())}">\n<head>\n'
+            f'<meta charset="utf-8">\n<title>{escape(t("pdf.title"))}</title>\n'
+            f"<style>{_HTML_STYLE}</style>\n</head>\n<body>\n"
+            f'<p class="disclaimer">{t("pdf.disclaimer")}</p>\n'
+        )
+
+    def _export(self, item: Exportable) -> None:
+        if isinstance(item, Recommendation):
+            self._file.write(self._recommendation_section(item))
+        elif isinstance(item, ComprehensiveAnalysis):
+            self._file.write(self._analysis_section(item))
+        else:
+            raise TypeError(f"Cannot export {type(item).__name__}")
+
+    def _finish(self) -> None:
+        self._file.write(
+            f'<p class="warning"><b>{escape(t("pdf.warning"))}:</b> '
+            f'{escape(t("pdf.warning_text"))}</p>\n</body>\n</html>\n'
+        )
+
+    def _recommendation_section(self, recommendation: Recommendation) -> str:
+        parts = [
+            f"<section>\n<h1>{escape(t('pdf.title'))}</h1>\n",
+            _html_facts(
+                [
+                    (
+                        t("pdf.patient"),
+                        f"{recommendation.patient_name} {recommendation.patient_surname}",
+                    ),
+                    (t("pdf.date"), recommendation.date.strftime("%Y-%m-%d %H:%M")),
+                ]
+            ),
+        ]
+        if recommendation.supplements:
+            parts.append(
+                _html_table(
+                    [
+                        t("pdf.supplement"),
+                        t("pdf.dosage"),
+                        t("pdf.timing"),
+                        t("pdf.priority"),
+                        t("pdf.reason"),
+                    ],
+                    [
+                        [s.name, s.dosage, s.timing, _priority_display(s.priority), s.reason]
+                        for s in recommendation.supplements
+                    ],
+                )
+            )
+        else:
+            parts.append(f"<p>{escape(t('pdf.no_supplements'))}</p>\n")
+        parts.append("</section>\n")
+        return "".join(parts)
+
+    def _analysis_section(self, analysis: ComprehensiveAnalysis) -> str:
+        facts = [(t("pdf.patient"), f"{analysis.patient_name} {analysis.patient_surname}")]
+        if analysis.test_date:
+            facts.append((t("pdf.test_date"), analysis.test_date))
+        parts = [f"<section>\n<h1>{escape(t('pdf.analysis_title'))}</h1>\n", _html_facts(facts)]
+
+        if analysis.critical_issues:
+            parts.append(f"<h2>{escape(t('dashboard.critical_alert_title'))}</h2>\n")
+            parts.append(_html_list(analysis.critical_issues, "warning"))
+
+        for category, title_key in ANALYSIS_TEST_CATEGORIES.items():
+            tests = getattr(analysis, category)
+            if not tests:
+                continue
+            parts.append(f"<h2>{escape(t(title_key))}</h2>\n")
+            parts.append(
+                _html_table(
+                    [
+                        t("pdf.test"),
+                        t("dashboard.value"),
+                        t("pdf.status"),
+                        t("dashboard.reference_range"),
+                    ],
+                    [
+                        [
+                            test.name,
+                            f"{test.value:g} {test.unit}",
+                            test.status,
+                            _format_range(test.lab_reference),
+                        ]
+                        for test in tests
+                    ],
+                    status_column=2,
+                )
+            )
+
+        if analysis.all_supplements:
+            parts.append(f"<h2>{escape(t('dashboard.supplement_recommendations'))}</h2>\n")
+            parts.append(
+                _html_table(
+                    [t("pdf.supplement"), t("pdf.dosage"), t("pdf.priority"), t("pdf.reason")],
+                    [
+                        [s.name, s.dosage, _priority_display(s.priority), s.reason]
+                        for s in analysis.all_supplements
+                    ],
+                )
+            )
+
+        if analysis.recommendations_summary:
+            parts.append(f"<h2>{escape(t('dashboard.recommendations_summary'))}</h2>\n")
+            parts.append(_html_list(analysis.recommendations_summary))
+        parts.append("</section>\n")
+        return "".join(parts)
+
+
+def _priority_display(priority: str) -> str:
+    key = f"pdf.priority_{priority}"
+    translated = t(key)
+    return priority if translated == key else translated
+
+
+def _status_display(status: str) -> str:
+    key = f"analysis.status_{status}"
+    translated = t(key)
+    return status if translated == key else translated
+
+
+def _format_range(reference) -> str:
+    if reference is None or (reference.min is None and reference.max is None):
+        return "—"
+    if reference.min is not None and reference.max is not None:
+        return f"{reference.min:g} – {reference.max:g}"
+    if reference.min is not None:
+        return f"≥ {reference.min:g}"
+    return f"≤ {reference.max:g}"
+
+
+def _html_table(
+    header: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    status_column: Optional[int] = None,
+) -> str:
+    """Table with escaped cells; the status_column cell is translated and coloured."""
+    head = "".join(f"<th>{escape(text)}</th>" for text in header)
+    body = []
+    for row in rows:
+        cells = []
+        for column, value in enumerate(row):
+            if column == status_column:
+                cells.append(
+                    f'<td class="status-{escape(value)}">{escape(_status_display(value))}</td>'
+                )
+            else:
+                cells.append(f"<td>{escape(str(value))}</td>")
+        body.append(f"<tr>{''.join(cells)}</tr>\n")
+    return f"<table>\n<tr>{head}</tr>\n{''.join(body)}</table>\n"
+
+
+def _html_facts(facts: Sequence[Tuple[str, str]]) -> str:
+    return "".join(f"<p><b>{escape(label)}:</b> {escape(value)}</p>\n" for label, value in facts)
+
+
+def _html_list(items: Sequence[str], css_class: str = "") -> str:
+    attribute = f' class="{css_class}"' if css_class else ""
+    return f"<ul{attribute}>" + "".join(f"<li>{escape(item)}</li>" for item in items) + "</ul>\n"
+
+
+# Exporters by --format name; "pdf" is rendered by PDFFormatter instead
+EXPORTERS = {
+    "csv": CSVExporter,
+    "html": HTMLExporter,
+    "json": JSONExporter,
+}
+EXPORT_FORMATS = ("pdf",) + tuple(EXPORTERS)
@@ -0,0 +1,10 @@
+"""File name helpers shared by the report writers."""
+
+import re
+
+_INVALID_CHARS = re.compile(r"[<>:\"/\\|?*\x00-\x1f]")
+
+
+def sanitize_filename(name: str) -> str:
+    sanitized = _INVALID_CHARS.sub("_", name)
+    return sanitized[:100]
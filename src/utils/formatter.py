@@ -1,11 +1,18 @@
+import asyncio
+import hashlib
+import io
+import json
 import os
-import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Tuple
+from typing import AbstractSet, BinaryIO, List, NamedTuple, Optional, Sequence, Tuple
 
 from src.models.recommendation import Recommendation
-from src.utils.i18n import t
+from src.utils.filenames import sanitize_filename
+from src.utils.i18n import get_language, set_language, t
+from src.utils.logger import init_worker_logging, worker_log_queue
+from src.utils.report_cache import ReportCache
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -14,10 +21,21 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from reportlab.lib import colors
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
+from config import OUTPUT_DIR, REPORT_RENDER_WORKERS
+
+# Fonts registered in this process, see register_polish_fonts
+_registered_fonts: Optional[Tuple[str, str]] = None
 
 
 def register_polish_fonts():
-    """Register fonts with Polish character support."""
+    """Register fonts with Polish character support (once per process)."""
+    global _registered_fonts
+    if _registered_fonts is None:
+        _registered_fonts = _register_polish_fonts()
+    return _registered_fonts
+
+
+def _register_polish_fonts():
     # Try to find a font with Polish character support
     font_paths = [
         # Linux paths
@@ -49,44 +67,268 @@ def register_polish_fonts():
     return "Helvetica", "Helvetica-Bold"
 
 
-def sanitize_filename(name: str) -> str:
-    invalid_chars = r"[<>:\"/\\|?*\x00-\x1f]"
-    sanitized = re.sub(invalid_chars, "_", name)
-    return sanitized[:100]
+class PDFStyles(NamedTuple):
+    """Fonts and styles shared by every PDFFormatter in the process."""
+
+    font_name: str
+    font_name_bold: str
+    sheet: object
+    disclaimer: ParagraphStyle
+    cell: ParagraphStyle
+    header: ParagraphStyle
+    warning: ParagraphStyle
+    table: TableStyle
+
+
+_pdf_styles: Optional[PDFStyles] = None
+
+
+def get_pdf_styles() -> PDFStyles:
+    """Get the process-wide PDF styles, registering fonts on first use."""
+    global _pdf_styles
+    if _pdf_styles is None:
+        _pdf_styles = _build_pdf_styles()
+    return _pdf_styles
+
+
+def _build_pdf_styles() -> PDFStyles:
+    font_name, font_name_bold = register_polish_fonts()
+    sheet = getSampleStyleSheet()
+    for style_name in ["Normal", "Title", "Heading2"]:
+        if style_name in sheet:
+            sheet[style_name].fontName = font_name
+
+    # Medical disclaimer - prominently displayed at the top
+    disclaimer = ParagraphStyle(
+        "Disclaimer",
+        parent=sheet["Normal"],
+        fontSize=7,
+        textColor=colors.red,
+        alignment=TA_CENTER,
+        leading=10,
+    )
+
+    # Create cell style for text wrapping - LTR wraps only at word boundaries
+    cell = ParagraphStyle(
+        "TableCell",
+        parent=sheet["Normal"],
+        fontName=font_name,
+        fontSize=9,
+        leading=12,
+        wordWrap="LTR",
+    )
+
+    # Header style - no word wrapping, keep on single line
+    header = ParagraphStyle(
+        "TableHeader",
+        parent=sheet["Normal"],
+        fontName=font_name_bold,
+        fontSize=9,
+        leading=12,
+        textColor=colors.whitesmoke,
+        wordWrap="LTR",
+    )
+
+    warning = ParagraphStyle(
+        "Warning",
+        parent=sheet["Normal"],
+        fontSize=8,
+        textColor=colors.red,
+        alignment=TA_LEFT,
+    )
+
+    table = TableStyle(
+        [
+            ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+            ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+            ("FONTNAME", (0, 0), (-1, 0), font_name_bold),
+            ("FONTNAME", (0, 1), (-1, -1), font_name),
+            ("FONTSIZE", (0, 0), (-1, 0), 9),
+            ("FONTSIZE", (0, 1), (-1, -1), 9),
+            ("BOTTOMPADDING", (0, 0), (-1, 0), 8),
+            ("TOPPADDING", (0, 0), (-1, 0), 8),
+            ("BOTTOMPADDING", (0, 1), (-1, -1), 6),
+            ("TOPPADDING", (0, 1), (-1, -1), 6),
+            ("LEFTPADDING", (0, 0), (-1, -1), 4),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 4),
+            ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+        ]
+    )
+
+    return PDFStyles(
+        font_name, font_name_bold, sheet, disclaimer, cell, header, warning, table
+    )
+
+
+# Bump when the report layout changes, so cached reports are not reused
+REPORT_TEMPLATE_VERSION = 2
+
+
+def report_cache_key(recommendation: Recommendation) -> str:
+    """Hash of everything that determines a report's rendered content.
+
+    The date is left out: the same patient and supplements rendered again
+    later are served the cached report, dated when it was first rendered.
+    """
+    styles = get_pdf_styles()
+    payload = {
+        "template": REPORT_TEMPLATE_VERSION,
+        "language": get_language(),
+        "fonts": [styles.font_name, styles.font_name_bold],
+        "patient": [recommendation.patient_name, recommendation.patient_surname],
+        "supplements": [s.model_dump() for s in recommendation.supplements],
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
 
 
 class PDFFormatter:
-    def __init__(self, output_dir: Path):
+    # Last part of generated report file names
+    report_kind = "supplements"
+
+    def __init__(self, output_dir: Path, report_cache: Optional[ReportCache] = None):
+        """
+        Args:
+            output_dir: Directory the reports are written to
+            report_cache: Cache of rendered reports, e.g.
+                get_report_cache(output_dir); reports are not cached without one
+        """
         self.output_dir = output_dir
-        self.styles = getSampleStyleSheet()
-        self.font_name, self.font_name_bold = register_polish_fonts()
-        self._configure_styles()
+        self.report_cache = report_cache
+        # Shared by all formatters; do not modify per instance
+        self.pdf_styles = get_pdf_styles()
+        self.styles = self.pdf_styles.sheet
+        self.font_name = self.pdf_styles.font_name
+        self.font_name_bold = self.pdf_styles.font_name_bold
+
+    def generate_pdf(
+        self, recommendation: Recommendation, filename: Optional[str] = None
+    ) -> Path:
+        filepath = self._report_path(recommendation, filename)
+        self._render(recommendation, filepath)
+        return filepath
 
-    def _configure_styles(self):
-        for style_name in ["Normal", "Title", "Heading2"]:
-            if style_name in self.styles:
-                self.styles[style_name].fontName = self.font_name
+    def generate_many(
+        self,
+        recommendations: Sequence[Recommendation],
+        workers: Optional[int] = None,
+        filenames: Optional[Sequence[Optional[str]]] = None,
+    ) -> List[Path]:
+        """
+        Render many reports in parallel worker processes.
 
-    def generate_pdf(self, recommendation: Recommendation) -> Path:
+        Output names are chosen up front, so reports for the same patient
+        never collide, and each worker registers the fonts once.
+
+        Args:
+            recommendations: Recommendations to render
+            workers: Number of worker processes (default: CPU count); with 1
+                reports are rendered in this process
+            filenames: Optional file name per recommendation, as for
+                generate_pdf
+
+        Returns:
+            Report paths in the order of recommendations
+        """
+        filenames = filenames or [None] * len(recommendations)
+        reserved = set()
+        paths = []
+        for recommendation, filename in zip(recommendations, filenames):
+            path = self._report_path(recommendation, filename, reserved)
+            reserved.add(path)
+            paths.append(path)
+
+        workers = min(workers or os.cpu_count() or 1, len(paths))
+        if workers <= 1:
+            for recommendation, path in zip(recommendations, paths):
+                self._render(recommendation, path)
+            return paths
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_render_worker,
+            initargs=(
+                type(self),
+                self.output_dir,
+                get_language(),
+                self.report_cache,
+                worker_log_queue(),
+            ),
+        ) as executor:
+            # map() yields in submission order; any rendering error is re-raised here
+            list(executor.map(_render_in_worker, recommendations, paths))
+        return paths
+
+    def _report_path(
+        self,
+        recommendation: Recommendation,
+        filename: Optional[str] = None,
+        reserved: AbstractSet[Path] = frozenset(),
+    ) -> Path:
         safe_name = sanitize_filename(recommendation.patient_name)
         safe_surname = sanitize_filename(recommendation.patient_surname)
         timestamp = int(datetime.now().timestamp())
-        filename = f"{safe_name}_{safe_surname}_{timestamp}_supplements.pdf"
-        filepath = self.output_dir / filename
+        # Explicit names (e.g. batch runs) are used as given and overwritten
+        if filename is not None:
+            return self.output_dir / sanitize_filename(filename)
 
-        # Check for collision (extremely unlikely with timestamp, but safe)
-        if filepath.exists():
-            # Use MD5 hash to generate unique suffix - not for security, only to avoid filename collisions
-            import hashlib
+        filepath = (
+            self.output_dir / f"{safe_name}_{safe_surname}_{timestamp}_{self.report_kind}.pdf"
+        )
 
-            hash_suffix = hashlib.md5(str(filepath).encode()).hexdigest()[:6]
-            filename = (
-                f"{safe_name}_{safe_surname}_{timestamp}_{hash_suffix}_supplements.pdf"
+        # Check for collision (same patient within a second, or within one batch)
+        attempt = 0
+        while filepath.exists() or filepath in reserved:
+            # Use MD5 hash to generate unique suffix - not for security, only to avoid filename collisions
+            hash_suffix = hashlib.md5(f"{filepath}:{attempt}".encode()).hexdigest()[:6]
+            filepath = (
+                self.output_dir
+                / f"{safe_name}_{safe_surname}_{timestamp}_{hash_suffix}_{self.report_kind}.pdf"
             )
-            filepath = self.output_dir / filename
+            attempt += 1
+        return filepath
+
+    def render_bytes(self, recommendation: Recommendation) -> bytes:
+        """Render a report in memory, without touching the output directory.
+
+        If the formatter has a report cache, a report with the same content,
+        language and template version that was rendered before is returned
+        from it, and a new one is stored in it.
+        """
+        key = None
+        if self.report_cache is not None:
+            key = self._cache_key(recommendation)
+            cached = self.report_cache.get(key)
+            if cached is not None:
+                return cached
+
+        buffer = io.BytesIO()
+        self._build(recommendation, buffer)
+        pdf = buffer.getvalue()
+        if key is not None:
+            self.report_cache.put(key, pdf)
+        return pdf
 
+    def _cache_key(self, recommendation: Recommendation) -> str:
+        return report_cache_key(recommendation)
+
+    def _render(self, recommendation: Recommendation, filepath: Path) -> None:
+        """Write the report to a temporary file and move it into place."""
+        pdf = self.render_bytes(recommendation)
+        tmp_path = filepath.with_name(filepath.name + ".tmp")
+        try:
+            tmp_path.write_bytes(pdf)
+            os.replace(tmp_path, filepath)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def _build(self, recommendation: Recommendation, target: BinaryIO) -> None:
         doc = SimpleDocTemplate(
-            str(filepath),
+            target,
             pagesize=A4,
             rightMargin=2.5 * cm,
             leftMargin=2.5 * cm,
@@ -97,14 +339,7 @@ class PDFFormatter:
         elements = []
 
         # Medical disclaimer - prominently displayed at the top
-        disclaimer_style = ParagraphStyle(
-            "Disclaimer",
-            parent=self.styles["Normal"],
-            fontSize=7,
-            textColor=colors.red,
-            alignment=TA_CENTER,
-            leading=10,
-        )
+        disclaimer_style = self.pdf_styles.disclaimer
         disclaimer_text = t("pdf.disclaimer")
         elements.append(Paragraph(disclaimer_text, disclaimer_style))
         elements.append(Spacer(1, 0.5 * cm))
@@ -129,26 +364,8 @@ class PDFFormatter:
             )
             elements.append(Spacer(1, 0.5 * cm))
 
-            # Create cell style for text wrapping - LTR wraps only at word boundaries
-            cell_style = ParagraphStyle(
-                "TableCell",
-                parent=self.styles["Normal"],
-                fontName=self.font_name,
-                fontSize=9,
-                leading=12,
-                wordWrap="LTR",
-            )
-
-            # Header style - no word wrapping, keep on single line
-            header_style = ParagraphStyle(
-                "TableHeader",
-                parent=self.styles["Normal"],
-                fontName=self.font_name_bold,
-                fontSize=9,
-                leading=12,
-                textColor=colors.whitesmoke,
-                wordWrap="LTR",
-            )
+            cell_style = self.pdf_styles.cell
+            header_style = self.pdf_styles.header
 
             table_data = [
                 [
@@ -191,28 +408,7 @@ class PDFFormatter:
                 repeatRows=1,
                 hAlign="LEFT",
             )
-            table.setStyle(
-                TableStyle(
-                    [
-                        ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                        ("FONTNAME", (0, 0), (-1, 0), self.font_name_bold),
-                        ("FONTNAME", (0, 1), (-1, -1), self.font_name),
-                        ("FONTSIZE", (0, 0), (-1, 0), 9),
-                        ("FONTSIZE", (0, 1), (-1, -1), 9),
-                        ("BOTTOMPADDING", (0, 0), (-1, 0), 8),
-                        ("TOPPADDING", (0, 0), (-1, 0), 8),
-                        ("BOTTOMPADDING", (0, 1), (-1, -1), 6),
-                        ("TOPPADDING", (0, 1), (-1, -1), 6),
-                        ("LEFTPADDING", (0, 0), (-1, -1), 4),
-                        ("RIGHTPADDING", (0, 0), (-1, -1), 4),
-                        ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                        ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
-                    ]
-                )
-            )
+            table.setStyle(self.pdf_styles.table)
 
             elements.append(table)
             elements.append(Spacer(1, 1 * cm))
@@ -220,18 +416,11 @@ class PDFFormatter:
             elements.append(
                 Paragraph(
                     "<b>UWAGA:</b> Powyższe rekomendacje mają charakter informacyjny i nie zastępują profesjonalnej porady medycznej.",
-                    ParagraphStyle(
-                        "Warning",
-                        parent=self.styles["Normal"],
-                        fontSize=8,
-                        textColor=colors.red,
-                        alignment=TA_LEFT,
-                    ),
+                    self.pdf_styles.warning,
                 )
             )
 
         doc.build(elements)
-        return filepath
 
     def _get_priority_display(self, priority: str) -> str:
         """Get translated priority display with validation."""
@@ -241,3 +430,76 @@ class PDFFormatter:
             translated = t("pdf.priority_unknown")
             return translated if translated != "pdf.priority_unknown" else priority
         return t(f"pdf.priority_{priority}")
+
+
+# Formatter of the current render worker process, built by _init_render_worker
+_worker_formatter: Optional[PDFFormatter] = None
+
+
+def _init_render_worker(
+    formatter_class: type,
+    output_dir: Path,
+    language: str,
+    report_cache: Optional[ReportCache] = None,
+    log_queue=None,
+) -> None:
+    global _worker_formatter
+    init_worker_logging(log_queue)
+    set_language(language, persist=False)
+    _worker_formatter = formatter_class(output_dir, report_cache)
+
+
+def _render_in_worker(recommendation: Recommendation, filepath: Path) -> Path:
+    _worker_formatter._render(recommendation, filepath)
+    return filepath
+
+
+def _render_bytes_in_worker(report) -> bytes:
+    return _worker_formatter.render_bytes(report)
+
+
+class ReportRenderPool:
+    """
+    Renders reports to PDF bytes in worker processes for async callers.
+
+    reportlab rendering is CPU bound; running it in a process pool keeps an
+    event loop responsive. Workers are started on first use. Reports are
+    only returned, never written to disk, not even to the report cache.
+
+    Example:
+        pool = ReportRenderPool(workers=2)
+        pdf = await pool.render(recommendation)
+    """
+
+    def __init__(
+        self,
+        workers: int = REPORT_RENDER_WORKERS,
+        output_dir: Path = OUTPUT_DIR,
+        formatter_class: type = PDFFormatter,
+    ):
+        self.workers = max(1, workers)
+        self.output_dir = output_dir
+        self.formatter_class = formatter_class
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def render(self, report) -> bytes:
+        """Render a report accepted by formatter_class to PDF bytes."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_render_worker,
+                initargs=(
+                    self.formatter_class,
+                    self.output_dir,
+                    get_language(),
+                    None,
+                    worker_log_queue(),
+                ),
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, _render_bytes_in_worker, report)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
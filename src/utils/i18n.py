@@ -41,7 +41,7 @@ class I18n:
                 with open(json_file, "r", encoding="utf-8") as f:
                     self._translations[language_code] = json.load(f)
             except (json.JSONDecodeError, UnicodeDecodeError) as e:
-                logger.warning(f"Failed to load translation file {json_file}: {e}")
+                logger.warning("Failed to load translation file %s: %s", json_file, e)
 
     def _load_saved_language(self):
         """Load saved language preference from config file."""
@@ -52,9 +52,9 @@ class I18n:
                     saved_lang = settings.get("language")
                     if saved_lang and saved_lang in self._translations:
                         self._current_language = saved_lang
-                        logger.info(f"Loaded saved language preference: {saved_lang}")
+                        logger.info("Loaded saved language preference: %s", saved_lang)
         except (json.JSONDecodeError, IOError) as e:
-            logger.warning(f"Failed to load saved language setting: {e}")
+            logger.warning("Failed to load saved language setting: %s", e)
 
     def _save_language(self, language: str):
         """Save language preference to config file."""
@@ -67,9 +67,9 @@ class I18n:
             settings["language"] = language
             with open(_CONFIG_FILE, "w", encoding="utf-8") as f:
                 json.dump(settings, f, indent=2)
-            logger.info(f"Saved language preference: {language}")
+            logger.info("Saved language preference: %s", language)
         except IOError as e:
-            logger.warning(f"Failed to save language setting: {e}")
+            logger.warning("Failed to save language setting: %s", e)
 
     def set_language(self, language: str, persist: bool = True):
         """Set the current language.
@@ -84,7 +84,7 @@ class I18n:
                 self._save_language(language)
         else:
             logger.warning(
-                f"Language '{language}' not available, using '{self._current_language}'"
+                "Language '%s' not available, using '%s'", language, self._current_language
             )
 
     def get_language(self) -> str:
@@ -1,13 +1,27 @@
 import json
+import re
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, TextIO
+
+# Characters read from disk at a time by iter_records
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Largest single record iter_records accepts, bounding its memory use
+MAX_RECORD_SIZE = 16 * 1024 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+# Characters that matter when looking for the end of an object: outside
+# strings the braces and quotes, inside a string its closing quote and escapes
+_OBJECT_SPECIAL = re.compile(r'[{}"]')
+_STRING_SPECIAL = re.compile(r'["\\]')
 
 
 class JSONParser:
     """Prosty parser dla plików JSON zawierających dane pacjenta i badania krwi."""
 
     def __init__(self):
-        pass
+        self._decoder = json.JSONDecoder()
 
     def parse_document(self, filepath: Path) -> Dict[str, Any]:
         """
@@ -41,7 +55,13 @@ class JSONParser:
         except UnicodeDecodeError as e:
             raise ValueError(f"Błąd kodowania pliku: {e}") from e
 
-        # Walidacja podstawowej struktury
+        return self._validate_record(data)
+
+    def _validate_record(self, data: Any) -> Dict[str, Any]:
+        """Sprawdza podstawową strukturę rekordu pacjenta z badaniami."""
+        if not isinstance(data, dict):
+            raise ValueError("Rekord musi być obiektem JSON")
+
         if "patient" not in data:
             raise ValueError("Brak klucza 'patient' w pliku JSON")
 
@@ -53,6 +73,181 @@ class JSONParser:
 
         return {"patient": data["patient"], "blood_tests": data["blood_tests"]}
 
+    @staticmethod
+    def is_record_list(filepath: Path) -> bool:
+        """Sprawdza, czy plik JSON zawiera listę rekordów (czyta tylko jego początek)."""
+        try:
+            with open(filepath, "r", encoding="utf-8") as f:
+                while True:
+                    chunk = f.read(STREAM_CHUNK_SIZE)
+                    if not chunk:
+                        return False
+                    stripped = chunk.lstrip(_WHITESPACE + "\ufeff")
+                    if stripped:
+                        return stripped[0] == "["
+        except (OSError, UnicodeDecodeError):
+            # parse_document reports the problem
+            return False
+
+    def iter_records(self, filepath: Path) -> Iterator[Dict[str, Any]]:
+        """
+        Strumieniowo odczytuje plik JSON z listą rekordów pacjentów.
+
+        Plik jest czytany fragmentami, a każdy element listy jest dekodowany
+        osobno, więc w pamięci jest naraz tylko jeden rekord - niezależnie od
+        rozmiaru pliku. Plik z pojedynczym obiektem zwraca jeden rekord.
+
+        Oczekiwany format:
+        [
+            {"patient": {...}, "blood_tests": [...]},
+            {"patient": {...}, "blood_tests": [...]}
+        ]
+
+        Pliki .jsonl (JSON Lines) zawierają jeden rekord w każdej linii.
+
+        Yields:
+            Słowniki z kluczami 'patient' i 'blood_tests', jak parse_document
+
+        Raises:
+            FileNotFoundError: Jeśli plik nie istnieje
+            ValueError: Przy błędnym formacie JSON, rekordzie lub rekordzie
+                większym niż MAX_RECORD_SIZE
+        """
+        if not filepath.exists():
+            raise FileNotFoundError(f"Plik nie istnieje: {filepath}")
+
+        try:
+            with open(filepath, "r", encoding="utf-8") as f:
+                if filepath.suffix.lower() == ".jsonl":
+                    yield from self._iter_lines(f)
+                else:
+                    yield from self._iter_array(f)
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Błąd kodowania pliku: {e}") from e
+
+    def _iter_lines(self, f: TextIO) -> Iterator[Dict[str, Any]]:
+        """Rekordy z pliku JSON Lines: jeden obiekt w każdej niepustej linii."""
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(
+                    f"Nieprawidłowy format JSON w linii {line_number}: {e}"
+                ) from e
+            try:
+                yield self._validate_record(record)
+            except ValueError as e:
+                raise ValueError(f"Linia {line_number}: {e}") from e
+
+    def _iter_array(self, f: TextIO) -> Iterator[Dict[str, Any]]:
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def fill() -> bool:
+            """Drop consumed text and read the next chunk; False at end of file."""
+            nonlocal buffer, pos, eof
+            if eof:
+                return False
+            chunk = f.read(STREAM_CHUNK_SIZE)
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            eof = not chunk
+            return not eof
+
+        def next_char() -> str:
+            """Skip whitespace and return the next character ('' at end of file)."""
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                    pos += 1
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not fill():
+                    return ""
+
+        first = next_char()
+        if first == "{":
+            # A single record rather than a list
+            while fill():
+                pass
+            yield self._validate_record(self._decode_all(buffer[pos:]))
+            return
+        if first != "[":
+            raise ValueError("Nieprawidłowy format JSON: oczekiwano listy rekordów")
+        pos += 1
+
+        expect_comma = False
+        while True:
+            char = next_char()
+            if char == "]":
+                pos += 1
+                if next_char():
+                    raise ValueError("Nieprawidłowy format JSON: dane po końcu listy")
+                return
+            if char == "":
+                raise ValueError("Nieprawidłowy format JSON: niezakończona lista")
+            if expect_comma:
+                if char != ",":
+                    raise ValueError(
+                        f"Nieprawidłowy format JSON: oczekiwano ',' zamiast {char!r}"
+                    )
+                pos += 1
+                char = next_char()
+            if char != "{":
+                raise ValueError("Rekord musi być obiektem JSON")
+
+            # Find where the object ends, scanning each character once as
+            # chunks arrive, and decode it in one go
+            depth = 0
+            in_string = False
+            scan = pos
+            while True:
+                match = (_STRING_SPECIAL if in_string else _OBJECT_SPECIAL).search(buffer, scan)
+                if match is None:
+                    # An escape may already point past the end of the buffer
+                    scan = max(scan, len(buffer))
+                    if scan - pos > MAX_RECORD_SIZE:
+                        raise ValueError(
+                            f"Rekord przekracza maksymalny rozmiar {MAX_RECORD_SIZE} znaków"
+                        )
+                    scanned = scan - pos
+                    if not fill():
+                        raise ValueError("Nieprawidłowy format JSON: niezakończony rekord")
+                    scan = pos + scanned
+                    continue
+
+                scan = match.end()
+                special = match.group()
+                if in_string:
+                    if special == "\\":
+                        scan += 1
+                    else:
+                        in_string = False
+                elif special == '"':
+                    in_string = True
+                elif special == "{":
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        break
+
+            try:
+                record, pos = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Nieprawidłowy format JSON: {e}") from e
+            expect_comma = True
+            yield self._validate_record(record)
+
+    def _decode_all(self, text: str) -> Any:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Nieprawidłowy format JSON: {e}") from e
+
     def load_patient_only(self, filepath: Path) -> Dict[str, Any]:
         """
         Ładuje tylko dane pacjenta z pliku JSON.
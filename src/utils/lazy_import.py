@@ -0,0 +1,66 @@
+"""
+Deferred import of heavy optional dependencies.
+
+The document parsing libraries (python-docx, pdfplumber, PyMuPDF and
+pytesseract, which pulls in pandas) take most of a second to import
+together, while a run on JSON input never uses them. ``lazy_import``
+returns a stand-in that imports the module on first attribute access,
+and ``module_available`` checks that a module is installed without
+importing it, so ``*_AVAILABLE`` flags stay cheap to compute.
+"""
+
+import importlib
+import importlib.util
+from types import ModuleType
+from typing import Any, Optional
+
+
+def module_available(name: str) -> bool:
+    """Whether a module can be imported, checked without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        # A missing parent package of a dotted name
+        return False
+
+
+class LazyModule:
+    """
+    Module stand-in that imports the real module on first attribute access.
+
+    Example:
+        fitz = lazy_import("fitz")
+        doc = fitz.open(path)  # PyMuPDF is imported here
+    """
+
+    __slots__ = ("_name", "_module")
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        # Assignments (e.g. monkeypatching in tests) go to the real module
+        if attr in LazyModule.__slots__:
+            object.__setattr__(self, attr, value)
+        else:
+            setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
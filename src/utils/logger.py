@@ -1,11 +1,158 @@
+"""
+Application logging.
+
+Every module logger hands its records to one shared QueueHandler, which
+only puts them on an in-memory queue. A QueueListener thread takes them
+off the queue and does the actual I/O: the console (INFO and above) and
+logs/app.log (DEBUG and above, rotated by size). Logging a record costs
+the caller no file or terminal write.
+
+Worker processes do not write the log file themselves: pools pass
+worker_log_queue() to their workers, which call init_worker_logging() and
+send their records to the main process's writer. A child process that was
+not given the queue logs to the console only, so app.log always has a
+single writer.
+
+Log calls use %-style arguments (``logger.debug("Loaded %s", name)``) so
+that records below the level set by MSA_LOG_LEVEL are never formatted.
+"""
+
+import atexit
 import logging
+import multiprocessing
+import multiprocessing.util
+import os
+import queue
 import sys
-from pathlib import Path
-from config import BASE_DIR
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+from config import LOG_BACKUP_COUNT, LOG_DIR, LOG_FILE_MAX_MB, LOG_LEVEL
+
+CONSOLE_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+FILE_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s"
 
 # Cache for logger instances to avoid duplicate handlers
 _logger_cache = {}
 
+
+class _ProcessQueueHandler(QueueHandler):
+    """QueueHandler that starts the writer thread of the process it runs in.
+
+    A forked worker process inherits the handler but not the parent's
+    listener thread, so the first record logged in the child starts one,
+    unless the child forwards its records to the parent.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if not _forwarding and _listener_pid != os.getpid():
+            _start_listener()
+        super().emit(record)
+
+
+_handler = _ProcessQueueHandler(queue.SimpleQueue())
+_listener: Optional[QueueListener] = None
+_listener_pid: Optional[int] = None
+
+# Records of worker processes, written by a second listener thread of the
+# main process; _forwarding is set in workers sending to it
+_worker_queue = None
+_worker_listener: Optional[QueueListener] = None
+_forwarding = False
+
+
+def _output_handlers(with_file: bool = True) -> list:
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+    if not with_file:
+        return [console_handler]
+
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    file_handler = RotatingFileHandler(
+        LOG_DIR / "app.log",
+        maxBytes=LOG_FILE_MAX_MB * 1024 * 1024,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding="utf-8",
+        delay=True,
+    )
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
+    return [console_handler, file_handler]
+
+
+def _start_listener() -> None:
+    global _listener, _listener_pid
+    in_child = _listener_pid is not None and _listener_pid != os.getpid()
+    # A forked child gets a queue of its own: the inherited one may hold the
+    # parent's unwritten records, and its lock may have been held at fork
+    if in_child:
+        _handler.queue = queue.SimpleQueue()
+
+    # Only the main process writes the log file
+    with_file = not in_child and multiprocessing.parent_process() is None
+    _listener = QueueListener(
+        _handler.queue, *_output_handlers(with_file), respect_handler_level=True
+    )
+    _listener.start()
+    _listener_pid = os.getpid()
+
+    if multiprocessing.parent_process() is not None:
+        # Worker processes exit through multiprocessing, which skips atexit
+        multiprocessing.util.Finalize(None, stop_logging, exitpriority=10)
+    elif not in_child:
+        atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Write out the queued records and stop the writer threads."""
+    global _listener, _listener_pid, _worker_queue, _worker_listener
+    if _listener is not None and _listener_pid == os.getpid():
+        if _worker_listener is not None:
+            _worker_listener.stop()
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+    _listener = None
+    _listener_pid = None
+    _worker_queue = None
+    _worker_listener = None
+
+
+def worker_log_queue():
+    """
+    Queue for worker processes to send their records to this process's writer.
+
+    Pass it to the workers (e.g. in a pool's initargs) and call
+    init_worker_logging() with it there. In a worker, the queue it forwards
+    to is returned, so workers it starts log to the same writer.
+    """
+    global _worker_queue, _worker_listener
+    if _forwarding:
+        return _handler.queue
+    if _listener_pid != os.getpid():
+        _start_listener()
+    if _worker_queue is None:
+        # A spawn-context queue can be shared with forked and spawned workers alike
+        _worker_queue = multiprocessing.get_context("spawn").Queue()
+        _worker_listener = QueueListener(
+            _worker_queue, *_listener.handlers, respect_handler_level=True
+        )
+        _worker_listener.start()
+    return _worker_queue
+
+
+def init_worker_logging(log_queue) -> None:
+    """Send this worker process's records to the queue from worker_log_queue()."""
+    global _forwarding
+    if log_queue is None:
+        return
+    # Drop a writer this process may have started while importing modules
+    stop_logging()
+    _handler.queue = log_queue
+    _forwarding = True
+
+
 def get_logger(name: str = "medical_supplement_advisor") -> logging.Logger:
     """Get or create a logger with the given name.
 
@@ -16,31 +163,15 @@ def get_logger(name: str = "medical_supplement_advisor") -> logging.Logger:
 
     return setup_logger(name)
 
+
 def setup_logger(name: str = "medical_supplement_advisor") -> logging.Logger:
     logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
-
-    if logger.handlers:
-        return logger
-
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    console_format = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-    console_handler.setFormatter(console_format)
-
-    log_dir = BASE_DIR / "logs"
-    log_dir.mkdir(exist_ok=True)
-    file_handler = logging.FileHandler(log_dir / "app.log")
-    file_handler.setLevel(logging.DEBUG)
-    file_format = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s"
-    )
-    file_handler.setFormatter(file_format)
+    logger.setLevel(LOG_LEVEL)
 
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    if not _forwarding and _listener_pid != os.getpid():
+        _start_listener()
+    if _handler not in logger.handlers:
+        logger.addHandler(_handler)
 
     # Cache the logger
     _logger_cache[name] = logger
@@ -0,0 +1,449 @@
+"""
+Canonicalization of blood test names.
+
+Lab reports, reference files and rule files spell the same test in many
+ways ("Witamina D (25-OH)", "25(OH)D", "WITAMINA D3"). NameResolver maps
+every spelling to one canonical test ID using the aliases defined under
+``test_name_variations`` in regex_patterns.json plus the test names of
+reference_ranges_v2.json, clinical_thresholds.json and test_categories.json.
+Exact spellings are a dictionary lookup; other names are scanned once with
+an Aho-Corasick automaton over all canonical names and aliases, and a match
+is only accepted if the rest of the name is specimen or timing wording
+("w surowicy", "na czczo"). For names read from documents, which may be OCR
+misreads such as "FERRYTVNA", resolve(name, fuzzy=True) also accepts the
+most similar canonical name or alias from a trigram index. Names from the
+data files are never matched fuzzily. Results are cached, and one resolver
+per data directory is shared by the parser and the engines.
+"""
+
+import heapq
+import re
+from collections import deque
+from difflib import SequenceMatcher
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from src.utils.data_bundle import get_data_bundle
+from src.utils.data_loader import DataLoader
+from src.utils.exceptions import DataLoaderError
+from src.utils.logger import get_logger
+from config import DATA_DIR, FUZZY_MATCH_THRESHOLD, FUZZY_NEAR_MISS_THRESHOLD
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Resolved names kept per resolver before the cache is reset
+_CACHE_LIMIT = 10_000
+
+# Fuzzy near-misses kept for review per resolver (oldest dropped first)
+_NEAR_MISS_LIMIT = 500
+
+# Trigram candidates compared by edit similarity per fuzzy lookup
+_FUZZY_CANDIDATES = 5
+
+# Trigrams found in more than this share of the indexed strings (" WI",
+# "NA ") say little about a name and are not used to find candidates
+_COMMON_TRIGRAM_SHARE = 0.1
+_COMMON_TRIGRAM_MIN_STRINGS = 20
+
+# Uncommon trigrams a string must share with a name to be scored
+_MIN_SHARED_TRIGRAMS = 2
+
+# Words up to this length ("C", "D3", "LDL") tell tests apart and must agree
+# exactly between a name and its fuzzy match
+_DISTINGUISHING_WORD_LENGTH = 3
+
+_PARENTHESIZED = re.compile(r"\([^)]*\)")
+_WORD = re.compile(r"\w+")
+
+# Words that may surround a canonical name or alias in a longer name without
+# changing the test ("Glukoza na czczo", "Witamina D3 w surowicy"); any other
+# word is a qualifier naming a different test ("Testosteron wolny",
+# "Cholesterol nie-HDL", "AST:ALT")
+_NEUTRAL_WORDS = frozenset(
+    "W WE NA CZCZO SUROWICY SUROWICA OSOCZU OSOCZE KRWI KREW PEŁNEJ SERUM PLASMA".split()
+)
+
+
+def normalize_test_name(name: str) -> str:
+    """Upper-case a test name and collapse whitespace and underscores."""
+    return " ".join(name.upper().replace("_", " ").split())
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton finding all occurrences of many patterns in one pass."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+        for pattern in patterns:
+            self._add(pattern)
+        self._build_failure_links()
+
+    def _add(self, pattern: str) -> None:
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[node][char] = next_node
+            node = next_node
+        self._output[node].append(pattern)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find_all(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+        Find every pattern occurrence in text.
+
+        Yields:
+            Tuples of (start index, pattern), ordered by end index
+        """
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for pattern in self._output[node]:
+                yield index - len(pattern) + 1, pattern
+
+
+def _trigrams(text: str) -> List[str]:
+    padded = f"  {text} "
+    return [padded[i : i + 3] for i in range(len(padded) - 2)]
+
+
+def _digits(text: str) -> str:
+    return "".join(char for char in _PARENTHESIZED.sub("", text) if char.isdigit())
+
+
+def _distinguishing_words(text: str) -> List[str]:
+    words = _WORD.findall(_PARENTHESIZED.sub("", text))
+    return sorted(word for word in words if len(word) <= _DISTINGUISHING_WORD_LENGTH)
+
+
+class TrigramIndex:
+    """Inverted trigram index for approximate string lookup."""
+
+    def __init__(self, strings: Iterable[str]):
+        self._strings: List[str] = []
+        self._grams: List[frozenset] = []
+        self._postings: Dict[str, List[int]] = {}
+        for string in strings:
+            grams = frozenset(_trigrams(string))
+            string_id = len(self._strings)
+            self._strings.append(string)
+            self._grams.append(grams)
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(string_id)
+        self._common_limit = max(
+            _COMMON_TRIGRAM_MIN_STRINGS, int(len(self._strings) * _COMMON_TRIGRAM_SHARE)
+        )
+
+    def best_matches(self, text: str, limit: int) -> List[Tuple[str, float]]:
+        """
+        Find the indexed strings most similar to text.
+
+        Only strings sharing at least two uncommon trigrams with text are
+        scored, using the Dice coefficient of their trigram sets.
+
+        Returns:
+            Up to limit tuples of (string, similarity between 0 and 1), most
+            similar first
+        """
+        grams = frozenset(_trigrams(text))
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            postings = self._postings.get(gram, ())
+            if len(postings) > self._common_limit:
+                continue
+            for string_id in postings:
+                shared[string_id] = shared.get(string_id, 0) + 1
+
+        scored = []
+        for string_id, count in shared.items():
+            if count < _MIN_SHARED_TRIGRAMS:
+                continue
+            string_grams = self._grams[string_id]
+            similarity = 2 * len(grams & string_grams) / (len(grams) + len(string_grams))
+            scored.append((self._strings[string_id], similarity))
+        return heapq.nlargest(limit, scored, key=lambda match: match[1])
+
+    def best_match(self, text: str) -> Optional[Tuple[str, float]]:
+        """The most similar indexed string and its similarity, or None."""
+        matches = self.best_matches(text, 1)
+        return matches[0] if matches else None
+
+
+@dataclass(frozen=True)
+class NearMiss:
+    """A name whose closest fuzzy match scored below the acceptance threshold."""
+
+    name: str
+    candidate: str
+    score: float
+
+
+class NameResolver:
+    """Maps blood test name spellings to canonical test IDs."""
+
+    def __init__(
+        self,
+        mappings: Dict[str, List[str]],
+        canonical_names: Iterable[str] = (),
+        fuzzy_threshold: Optional[float] = FUZZY_MATCH_THRESHOLD,
+    ):
+        """
+        Args:
+            mappings: Canonical name -> list of aliases
+            canonical_names: Additional names that are canonical on their own
+            fuzzy_threshold: Minimum similarity for accepting a fuzzy match,
+                or None to disable fuzzy matching
+        """
+        self._patterns: Dict[str, str] = {}
+        for name in canonical_names:
+            key = normalize_test_name(name)
+            self._patterns[key] = key
+        for canonical in mappings:
+            canonical_key = normalize_test_name(canonical)
+            self._patterns[canonical_key] = canonical_key
+        # Aliases win over canonical names so that two spellings of one test
+        # in different data files collapse to a single ID
+        for canonical, aliases in mappings.items():
+            canonical_key = normalize_test_name(canonical)
+            for alias in aliases:
+                self._patterns[normalize_test_name(alias)] = canonical_key
+
+        self._automaton = AhoCorasick(self._patterns)
+        self._trigram_index = TrigramIndex(self._patterns)
+        self.fuzzy_threshold = fuzzy_threshold
+        self.near_misses: Deque[NearMiss] = deque(maxlen=_NEAR_MISS_LIMIT)
+        self._cache: Dict[str, Optional[str]] = {}
+        self._fuzzy_cache: Dict[str, Optional[str]] = {}
+
+    @classmethod
+    def from_data_dir(
+        cls, data_dir: Path = DATA_DIR, loader: Optional[DataLoader] = None
+    ) -> "NameResolver":
+        """Build a resolver from the alias mappings and reference test names."""
+        loader = loader or DataLoader(data_dir)
+        mappings: Dict[str, List[str]] = {}
+        canonical_names: List[str] = []
+        try:
+            patterns = loader.load_json("regex_patterns.json").get("patterns", {})
+            mappings = patterns.get("test_name_variations", {}).get("mappings", {})
+        except DataLoaderError as e:
+            logger.warning("Test name aliases unavailable: %s", e)
+        try:
+            categories = loader.load_json("reference_ranges_v2.json").get("categories", {})
+            canonical_names = [
+                test["name"]
+                for category in categories.values()
+                for test in category.get("tests", [])
+                if test.get("name")
+            ]
+            thresholds = loader.load_json("clinical_thresholds.json").get("thresholds", {})
+            canonical_names.extend(thresholds)
+            test_categories = loader.load_json("test_categories.json").get("categories", {})
+            canonical_names.extend(
+                name for category in test_categories.values() for name in category.get("tests", [])
+            )
+        except DataLoaderError as e:
+            logger.warning("Canonical test names unavailable: %s", e)
+        return cls(mappings, canonical_names)
+
+    @property
+    def canonical_ids(self) -> List[str]:
+        """All canonical test IDs known to the resolver."""
+        return sorted(set(self._patterns.values()))
+
+    def resolve(self, name: str, fuzzy: bool = False) -> Optional[str]:
+        """
+        Map a test name to its canonical ID.
+
+        The longest canonical name or alias found as whole words in the name
+        wins. A match is rejected if the rest of the name (ignoring
+        parenthesized parts) has any word besides specimen and timing
+        wording, e.g. "Glukoza 60 min" is a curve reading, not fasting
+        glucose, and "Testosteron wolny" is not total testosterone. With
+        fuzzy, names without such a match fall back to the most similar
+        canonical name or alias (see fuzzy_match).
+
+        Args:
+            name: Test name as written in a document or data file
+            fuzzy: Accept a similar name; only for names read from documents
+
+        Returns:
+            Canonical test ID, or None if the name is not recognised
+        """
+        key = normalize_test_name(name)
+        canonical = _cached(self._cache, key, self._match_exact)
+        if canonical is None and fuzzy and self.fuzzy_threshold is not None:
+            canonical = _cached(self._fuzzy_cache, key, self._match_fuzzy)
+        return canonical
+
+    def canonical_id(self, name: str) -> str:
+        """Canonical ID of a name, or the normalized name if it is not recognised."""
+        return self.resolve(name) or normalize_test_name(name)
+
+    def fuzzy_match(self, name: str) -> Optional[Tuple[str, float]]:
+        """
+        Find the canonical ID of the most similar canonical name or alias.
+
+        The closest candidates by trigram similarity are compared with the
+        name by edit similarity. Candidates whose digits or short words
+        differ from the name's (ignoring parenthesized parts) are rejected,
+        so "Witamina B9" never matches "Witamina B12" and "Witamina C" never
+        matches "Witamina D3".
+
+        Args:
+            name: Test name, e.g. an OCR misread
+
+        Returns:
+            Tuple of (canonical ID, similarity between 0 and 1), or None
+        """
+        key = normalize_test_name(name)
+        digits, words = _digits(key), _distinguishing_words(key)
+        best: Optional[Tuple[str, float]] = None
+        for pattern, _ in self._trigram_index.best_matches(key, _FUZZY_CANDIDATES):
+            if _digits(pattern) != digits or _distinguishing_words(pattern) != words:
+                continue
+            score = SequenceMatcher(None, key, pattern).ratio()
+            if best is None or score > best[1]:
+                best = (self._patterns[pattern], score)
+        return best
+
+    def _match_exact(self, key: str) -> Optional[str]:
+        canonical = self._patterns.get(key)
+        if canonical is None:
+            canonical = self._match_alias(key)
+        return canonical
+
+    def _match_fuzzy(self, key: str) -> Optional[str]:
+        match = self.fuzzy_match(key)
+        if match is None:
+            return None
+        canonical, score = match
+        if score >= self.fuzzy_threshold:
+            logger.debug("Fuzzy matched test name '%s' to %s (%.2f)", key, canonical, score)
+            return canonical
+        if score >= FUZZY_NEAR_MISS_THRESHOLD:
+            logger.debug("Unrecognised test name '%s', closest is %s (%.2f)", key, canonical, score)
+            self.near_misses.append(NearMiss(key, canonical, score))
+        return None
+
+    def _match_alias(self, key: str) -> Optional[str]:
+        best: Optional[str] = None
+        for start, pattern in self._automaton.find_all(key):
+            end = start + len(pattern)
+            if best is not None and len(pattern) <= len(best):
+                continue
+            if not _is_whole_word(key, start, end):
+                continue
+            leftover = _PARENTHESIZED.sub("", key[:start] + " " + key[end:])
+            if not _NEUTRAL_WORDS.issuperset(_WORD.findall(leftover)):
+                continue
+            best = pattern
+        return self._patterns[best] if best is not None else None
+
+
+def index_by_test_id(
+    entries: Iterable[Tuple[str, str, T]], source: str, keep_last: bool = False
+) -> Dict[str, T]:
+    """
+    Map canonical test IDs to items, keeping the first item of each ID.
+
+    Every item whose ID is already taken is logged as a collision, so two
+    tests that resolve to one ID never silently replace each other.
+
+    Args:
+        entries: Tuples of (canonical ID, name as written, item)
+        source: What the items are, for the log message
+        keep_last: Keep the last item of each ID instead of the first, as a
+            plain dict built from the entries would
+
+    Returns:
+        Canonical test ID -> first (or last) item with that ID
+    """
+    index: Dict[str, T] = {}
+    names: Dict[str, str] = {}
+    for test_id, name, item in entries:
+        if test_id in index:
+            ignored = names[test_id] if keep_last else name
+            logger.warning(
+                "%s: '%s' and '%s' both resolve to %s, ignoring '%s'",
+                source,
+                names[test_id],
+                name,
+                test_id,
+                ignored,
+            )
+            if not keep_last:
+                continue
+        index[test_id] = item
+        names[test_id] = name
+    return index
+
+
+def _cached(
+    cache: Dict[str, Optional[str]], key: str, match: Callable[[str], Optional[str]]
+) -> Optional[str]:
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+    if len(cache) >= _CACHE_LIMIT:
+        cache.clear()
+    cache[key] = canonical = match(key)
+    return canonical
+
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    return (start == 0 or not text[start - 1].isalnum()) and (
+        end == len(text) or not text[end].isalnum()
+    )
+
+
+_resolvers: Dict[Path, NameResolver] = {}
+
+
+def get_name_resolver(data_dir: Path = DATA_DIR) -> NameResolver:
+    """Get the process-wide resolver for a data directory.
+
+    It is taken from the directory's data bundle when that is up to date,
+    otherwise built from the JSON files on first use.
+    """
+    key = Path(data_dir).resolve()
+    if key not in _resolvers:
+        bundle = get_data_bundle(data_dir)
+        if bundle is not None:
+            _resolvers[key] = bundle.name_resolver()
+        else:
+            _resolvers[key] = NameResolver.from_data_dir(data_dir)
+    return _resolvers[key]
@@ -0,0 +1,341 @@
+"""
+Sandboxed document parsing in worker processes.
+
+A malformed PDF can make pdfplumber, PyMuPDF or tesseract hang or allocate
+without bound. ParseWorkerPool parses every document in a separate process
+with an address-space limit, a CPU-time limit and a wall-clock deadline. A
+worker that misses its deadline is killed and replaced without affecting
+jobs running in other workers, and workers are recycled after a fixed
+number of jobs so memory leaked by the parsing libraries is returned to the
+system.
+
+get_document_parser() hands out the process-wide pool that the CLI, GUI,
+batch and inbox modes parse documents with.
+"""
+
+import atexit
+import multiprocessing
+import os
+import signal
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+
+try:
+    import resource
+
+    RESOURCE_LIMITS_AVAILABLE = True
+except ImportError:
+    RESOURCE_LIMITS_AVAILABLE = False
+
+from src.utils.buffer_io import BytesLike
+from src.utils.exceptions import DataLoaderError, ParseTimeoutError
+from src.utils.logger import get_logger, init_worker_logging, worker_log_queue
+from config import (
+    PARSE_IN_WORKERS,
+    PARSE_WORKERS,
+    PARSE_WORKER_TIMEOUT,
+    PARSE_WORKER_CPU_LIMIT,
+    PARSE_WORKER_MEMORY_LIMIT_MB,
+    PARSE_WORKER_MAX_JOBS,
+)
+
+if TYPE_CHECKING:
+    from src.utils.document_parser import DocumentParser
+
+logger = get_logger(__name__)
+
+# Seconds a worker gets to exit after being asked to stop
+_STOP_TIMEOUT = 5.0
+
+
+def _limit_memory(memory_limit_mb: Optional[int]) -> None:
+    if not memory_limit_mb:
+        return
+    limit = memory_limit_mb * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _limit_cpu_time(cpu_time_limit: Optional[int]) -> None:
+    """Allow the current job cpu_time_limit more CPU seconds (SIGXCPU after that)."""
+    if not cpu_time_limit:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime) + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + cpu_time_limit
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker_main(
+    conn,
+    cpu_time_limit: Optional[int],
+    memory_limit_mb: Optional[int],
+    pdf_backend: Optional[str],
+    log_queue=None,
+) -> None:
+    """Worker process loop: parse requests received on conn until told to stop."""
+    init_worker_logging(log_queue)
+    from src.utils.document_parser import DocumentParser
+
+    if RESOURCE_LIMITS_AVAILABLE:
+        _limit_memory(memory_limit_mb)
+    parser = DocumentParser(pdf_backend=pdf_backend)
+
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+
+        if RESOURCE_LIMITS_AVAILABLE:
+            _limit_cpu_time(cpu_time_limit)
+        try:
+            kind, payload, suffix = request
+            if kind == "path":
+                result = parser.parse_document(payload)
+            else:
+                result = parser.parse_bytes(payload, suffix)
+            response = ("ok", result)
+        except DataLoaderError as e:
+            response = ("error", e.message)
+        except MemoryError:
+            response = ("error", f"Parsing exceeded the memory limit of {memory_limit_mb} MB")
+        except Exception as e:
+            response = ("error", f"{type(e).__name__}: {e}")
+        conn.send(response)
+
+
+class _Worker:
+    """One parse worker process and the parent's end of its pipe."""
+
+    def __init__(self, context, cpu_time_limit, memory_limit_mb, pdf_backend):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, cpu_time_limit, memory_limit_mb, pdf_backend, worker_log_queue()),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    def request(self, request: Tuple, timeout: float) -> Optional[Tuple[str, object]]:
+        """Send a request and wait for the response, None if the deadline passes."""
+        self.jobs += 1
+        self.conn.send(request)
+        if not self.conn.poll(timeout):
+            return None
+        return self.conn.recv()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(_STOP_TIMEOUT)
+        if self.process.is_alive():
+            self.kill()
+        self.conn.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class ParseWorkerPool:
+    """
+    Pool of sandboxed processes parsing blood test documents.
+
+    Safe to use from several threads; at most max_workers documents are
+    parsed at once and further callers wait for a free worker. Worker
+    processes are started on demand with the "spawn" method, so they do not
+    inherit the caller's threads or open files.
+
+    Example:
+        with ParseWorkerPool(max_workers=2, timeout=30) as pool:
+            result = pool.parse_document("wyniki.pdf")
+    """
+
+    def __init__(
+        self,
+        max_workers: int = PARSE_WORKERS,
+        timeout: float = PARSE_WORKER_TIMEOUT,
+        cpu_time_limit: Optional[int] = PARSE_WORKER_CPU_LIMIT,
+        memory_limit_mb: Optional[int] = PARSE_WORKER_MEMORY_LIMIT_MB,
+        max_jobs_per_worker: int = PARSE_WORKER_MAX_JOBS,
+        pdf_backend: Optional[str] = None,
+    ):
+        """
+        Args:
+            max_workers: Maximum number of worker processes
+            timeout: Wall-clock deadline per document in seconds
+            cpu_time_limit: CPU seconds per document, or None for no limit
+            memory_limit_mb: Address-space limit per worker in MB, or None
+            max_jobs_per_worker: Documents parsed before a worker is replaced
+            pdf_backend: PDF backend name passed to DocumentParser
+        """
+        if not RESOURCE_LIMITS_AVAILABLE and (cpu_time_limit or memory_limit_mb):
+            logger.warning(
+                "CPU and memory limits are not supported on this platform, "
+                "only the wall-clock deadline applies"
+            )
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.cpu_time_limit = cpu_time_limit
+        self.memory_limit_mb = memory_limit_mb
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.pdf_backend = pdf_backend
+
+        self._context = multiprocessing.get_context("spawn")
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        self._lock = threading.Lock()
+        self._idle: List[_Worker] = []
+        self._closed = False
+
+    def parse_document(self, file_path: Union[str, Path]) -> Dict:
+        """
+        Parse a blood test document in a worker process.
+
+        Args:
+            file_path: Path to the PDF or DOCX document
+
+        Returns:
+            Same result as DocumentParser.parse_document
+
+        Raises:
+            ParseTimeoutError: If the deadline or CPU-time limit is exceeded
+            DataLoaderError: If the document cannot be parsed or the worker
+                crashed
+        """
+        file_path = Path(file_path)
+        return self._run(("path", str(file_path), None), str(file_path))
+
+    def parse_bytes(self, data: BytesLike, kind: str) -> Dict:
+        """
+        Parse a blood test document held in memory in a worker process.
+
+        The content is copied to the worker once through a pipe.
+
+        Args:
+            data: Document content
+            kind: Document format, "pdf" or "docx"
+
+        Returns:
+            Same result as DocumentParser.parse_bytes
+
+        Raises:
+            ParseTimeoutError: If the deadline or CPU-time limit is exceeded
+            DataLoaderError: If the document cannot be parsed or the worker
+                crashed
+        """
+        return self._run(("bytes", bytes(data), kind), f"<{kind} in memory>")
+
+    def _run(self, request: Tuple, source_name: str) -> Dict:
+        with self._slots:
+            worker = self._acquire_worker()
+            try:
+                response = worker.request(request, self.timeout)
+            except (EOFError, OSError):
+                # The worker died while parsing
+                self._raise_worker_died(worker, source_name)
+
+            if response is None:
+                worker.kill()
+                logger.warning("Parsing %s exceeded %ss, worker killed", source_name, self.timeout)
+                raise ParseTimeoutError(
+                    f"Parsing timed out after {self.timeout} seconds",
+                    source_name,
+                    limit=self.timeout,
+                    reason="deadline",
+                )
+
+            self._release_worker(worker)
+
+        status, payload = response
+        if status == "error":
+            raise DataLoaderError(payload, source_name)
+        return payload
+
+    def _raise_worker_died(self, worker: _Worker, source_name: str) -> None:
+        worker.kill()
+        exitcode = worker.process.exitcode
+        if exitcode == -getattr(signal, "SIGXCPU", 0):
+            logger.warning("Parsing %s exceeded the CPU-time limit", source_name)
+            raise ParseTimeoutError(
+                f"Parsing exceeded the CPU-time limit of {self.cpu_time_limit} seconds",
+                source_name,
+                limit=self.cpu_time_limit,
+                reason="cpu_time",
+            )
+        logger.error("Parse worker crashed on %s (exit code %s)", source_name, exitcode)
+        raise DataLoaderError(f"Parse worker crashed (exit code {exitcode})", source_name)
+
+    def _acquire_worker(self) -> _Worker:
+        with self._lock:
+            if self._closed:
+                raise DataLoaderError("Parse worker pool is shut down")
+            if self._idle:
+                return self._idle.pop()
+        return _Worker(
+            self._context, self.cpu_time_limit, self.memory_limit_mb, self.pdf_backend
+        )
+
+    def _release_worker(self, worker: _Worker) -> None:
+        with self._lock:
+            if not self._closed and worker.jobs < self.max_jobs_per_worker:
+                self._idle.append(worker)
+                return
+        # Recycle: a fresh process replaces this one on the next request
+        worker.stop()
+
+    def shutdown(self) -> None:
+        """Stop idle workers; workers still parsing stop when they finish."""
+        with self._lock:
+            self._closed = True
+            workers, self._idle = self._idle, []
+        for worker in workers:
+            worker.stop()
+
+    def __enter__(self) -> "ParseWorkerPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+
+
+# Pool of this process, and the process it was created in: a forked child
+# must not talk to the parent's workers through the inherited pipes
+_pool: Optional[ParseWorkerPool] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+
+
+def get_document_parser() -> Union[ParseWorkerPool, "DocumentParser"]:
+    """
+    Get the parser for PDF/DOCX documents of this process.
+
+    This is a shared ParseWorkerPool, created on first use and shut down at
+    exit, or an in-process DocumentParser if PARSE_IN_WORKERS is off. Both
+    provide parse_document() and parse_bytes().
+    """
+    global _pool, _pool_pid
+    if not PARSE_IN_WORKERS:
+        from src.utils.document_parser import DocumentParser
+
+        return DocumentParser()
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ParseWorkerPool()
+            _pool_pid = os.getpid()
+            atexit.register(_pool.shutdown)
+        return _pool
@@ -0,0 +1,157 @@
+"""
+PDF text and table extraction backends.
+
+DocumentParser reads PDFs through a backend object instead of calling
+pdfplumber directly. Every backend opens a document as a context manager
+whose ``pages`` expose ``extract_text()`` and ``extract_tables()`` with the
+same return types as pdfplumber, so the parsing code is backend agnostic.
+"""
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Optional, Union
+
+from src.utils.buffer_io import BufferReader, BytesLike
+from src.utils.exceptions import DataLoaderError
+from src.utils.lazy_import import lazy_import, module_available
+
+pdfplumber = lazy_import("pdfplumber")
+fitz = lazy_import("fitz")
+
+PDFPLUMBER_AVAILABLE = module_available("pdfplumber")
+PYMUPDF_AVAILABLE = module_available("fitz")
+
+Table = List[List[Optional[str]]]
+
+# A PDF is opened either from a file path or from its content in memory
+PDFSource = Union[str, Path, BytesLike]
+
+
+class PDFBackend(ABC):
+    """Base class for PDF extraction backends."""
+
+    name = ""
+
+    @classmethod
+    @abstractmethod
+    def is_available(cls) -> bool:
+        """Return True if the backend's library is installed."""
+
+    @abstractmethod
+    def open(self, source: PDFSource):
+        """
+        Open a PDF document.
+
+        Args:
+            source: Path to PDF file or its content (not copied)
+
+        Returns:
+            Context manager yielding a document with a ``pages`` sequence
+        """
+
+
+class PdfplumberBackend(PDFBackend):
+    """Backend using pdfplumber (pure Python, pdfminer based)."""
+
+    name = "pdfplumber"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return PDFPLUMBER_AVAILABLE
+
+    def open(self, source: PDFSource):
+        if isinstance(source, (str, Path)):
+            return pdfplumber.open(str(source))
+        return pdfplumber.open(BufferReader(source))
+
+
+class PyMuPDFPage:
+    """pdfplumber-compatible view of a PyMuPDF page."""
+
+    def __init__(self, page):
+        self._page = page
+
+    def extract_text(self) -> str:
+        return self._page.get_text("text", sort=True)
+
+    def extract_tables(self) -> List[Table]:
+        # Table detection looks for ruling lines; a page without vector
+        # drawings cannot contain one, so skip the expensive analysis.
+        if not self._page.get_cdrawings():
+            return []
+        return [table.extract() for table in self._page.find_tables().tables]
+
+
+class PyMuPDFDocument:
+    """pdfplumber-compatible view of a PyMuPDF document."""
+
+    def __init__(self, doc):
+        self._doc = doc
+        self.pages = [PyMuPDFPage(page) for page in doc]
+
+    def close(self) -> None:
+        self._doc.close()
+
+    def __enter__(self) -> "PyMuPDFDocument":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class PyMuPDFBackend(PDFBackend):
+    """Backend using PyMuPDF (MuPDF C library), much faster on large files."""
+
+    name = "pymupdf"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return PYMUPDF_AVAILABLE
+
+    def open(self, source: PDFSource) -> PyMuPDFDocument:
+        if isinstance(source, (str, Path)):
+            return PyMuPDFDocument(fitz.open(str(source)))
+        return PyMuPDFDocument(fitz.open(stream=memoryview(source), filetype="pdf"))
+
+
+PDF_BACKENDS = {
+    PyMuPDFBackend.name: PyMuPDFBackend,
+    PdfplumberBackend.name: PdfplumberBackend,
+}
+
+
+def get_pdf_backend(name: str = "auto") -> PDFBackend:
+    """
+    Create a PDF backend by name.
+
+    Args:
+        name: "pymupdf", "pdfplumber" or "auto" (the first available backend,
+            PyMuPDF preferred)
+
+    Returns:
+        PDFBackend instance
+
+    Raises:
+        DataLoaderError: If the backend is unknown or its library is missing
+    """
+    if name == "auto":
+        for backend_cls in PDF_BACKENDS.values():
+            if backend_cls.is_available():
+                return backend_cls()
+        raise DataLoaderError(
+            "No PDF parsing libraries available. "
+            "Install them with: pip install PyMuPDF pdfplumber"
+        )
+
+    backend_cls = PDF_BACKENDS.get(name)
+    if backend_cls is None:
+        raise DataLoaderError(
+            f"Unknown PDF backend: {name}. "
+            f"Available backends: auto, {', '.join(PDF_BACKENDS)}"
+        )
+    if not backend_cls.is_available():
+        raise DataLoaderError(
+            f"PDF backend '{name}' is not installed. "
+            "Install it with: pip install PyMuPDF pdfplumber"
+        )
+    return backend_cls()
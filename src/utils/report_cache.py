@@ -0,0 +1,112 @@
+"""
+Size-bounded on-disk cache of rendered PDF reports.
+
+Entries are files named by their key. Reading an entry refreshes its
+modification time, and when the cache grows over its size limit the
+least recently used entries are deleted first. Entries are written
+atomically, so several processes can share one cache directory.
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.utils.logger import get_logger
+from config import REPORT_CACHE_DIR_NAME, REPORT_CACHE_MAX_MB
+
+logger = get_logger(__name__)
+
+_SUFFIX = ".pdf"
+
+
+class ReportCache:
+    """
+    LRU cache of rendered reports in a directory.
+
+    Example:
+        cache = ReportCache(Path("output/.report_cache"), max_bytes=50 * 1024 * 1024)
+        pdf = cache.get(key)
+        if pdf is None:
+            pdf = render()
+            cache.put(key, pdf)
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        """
+        Args:
+            cache_dir: Directory holding the entries, created on first write
+            max_bytes: Total size the entries are trimmed to after each write
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached content for key, or None."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            # Missing, or evicted by another process meanwhile
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store content under key and evict old entries over the size limit."""
+        if len(data) > self.max_bytes:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Cannot write report cache entry %s: %s", path, e)
+            tmp_path.unlink(missing_ok=True)
+            return
+        self._evict()
+
+    def clear(self) -> None:
+        for path in self.cache_dir.glob(f"*{_SUFFIX}"):
+            path.unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{_SUFFIX}"
+
+    def _evict(self) -> None:
+        entries: Dict[Path, os.stat_result] = {}
+        for path in self.cache_dir.glob(f"*{_SUFFIX}"):
+            try:
+                entries[path] = path.stat()
+            except FileNotFoundError:
+                continue
+
+        total = sum(stat.st_size for stat in entries.values())
+        for path, stat in sorted(entries.items(), key=lambda item: item[1].st_mtime_ns):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+
+
+_report_caches: Dict[Path, ReportCache] = {}
+
+
+def get_report_cache(output_dir: Path) -> Optional[ReportCache]:
+    """Get the shared cache for reports written to output_dir.
+
+    Returns None unless the cache is enabled in config (MSA_REPORT_CACHE_MB).
+    """
+    if REPORT_CACHE_MAX_MB <= 0:
+        return None
+    cache_dir = Path(output_dir).resolve() / REPORT_CACHE_DIR_NAME
+    cache = _report_caches.get(cache_dir)
+    if cache is None:
+        cache = ReportCache(cache_dir, REPORT_CACHE_MAX_MB * 1024 * 1024)
+        _report_caches[cache_dir] = cache
+    return cache
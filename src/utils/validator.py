@@ -1,9 +1,26 @@
-from pydantic import ValidationError as PydanticValidationError
+from pydantic import TypeAdapter, ValidationError as PydanticValidationError
 
 from src.models.patient import Patient
 from src.models.blood_test import BloodTest
 from src.utils.exceptions import ValidationError
-from typing import List
+from typing import Dict, List, Union
+
+# Built once: validates a whole list in a single call into pydantic-core
+_BLOOD_TESTS_ADAPTER = TypeAdapter(List[BloodTest])
+
+# Row errors quoted in full in the exception message
+_MAX_REPORTED_ERRORS = 10
+
+
+def _row_errors(error: PydanticValidationError) -> List[Dict]:
+    """Flatten a list validation error into one entry per failing field."""
+    rows = []
+    for detail in error.errors(include_url=False, include_input=False):
+        loc = detail["loc"]
+        index = loc[0] if loc and isinstance(loc[0], int) else None
+        field = ".".join(str(part) for part in loc[1:]) or None
+        rows.append({"index": index, "field": field, "message": detail["msg"]})
+    return rows
 
 
 class Validator:
@@ -17,12 +34,34 @@ class Validator:
             ) from e
 
     @staticmethod
-    def validate_blood_tests(data: List[dict]) -> List[BloodTest]:
+    def validate_blood_tests(data: List[Union[dict, BloodTest]]) -> List[BloodTest]:
+        """Validate a list of blood test dictionaries in one call.
+
+        Every row is checked; the raised error lists all invalid rows, not
+        only the first. BloodTest objects in the list were validated when
+        they were created and are passed through as-is, so lists built by
+        the application itself are not validated a second time.
+
+        Raises:
+            ValidationError: If any row is invalid. Its ``errors`` attribute
+                holds one {"index", "field", "message"} entry per problem.
+        """
         try:
-            return [BloodTest(**test) for test in data]
+            return _BLOOD_TESTS_ADAPTER.validate_python(data)
         except PydanticValidationError as e:
+            errors = _row_errors(e)
+            lines = [
+                f"row {error['index']}"
+                + (f" ({error['field']})" if error["field"] else "")
+                + f": {error['message']}"
+                for error in errors[:_MAX_REPORTED_ERRORS]
+            ]
+            if len(errors) > _MAX_REPORTED_ERRORS:
+                lines.append(f"... and {len(errors) - _MAX_REPORTED_ERRORS} more")
             raise ValidationError(
-                f"Invalid blood test data: {e}", field="blood_tests"
+                f"Invalid blood test data ({len(errors)} errors): " + "; ".join(lines),
+                field="blood_tests",
+                errors=errors,
             ) from e
 
     @staticmethod
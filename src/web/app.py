@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -10,12 +11,25 @@ from src.web.routers.pages import router as pages_router
 _STATIC_DIR = Path(__file__).resolve().parent / "static"
 
 
-def create_app(analysis=None) -> FastAPI:
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    yield
+    for pool in (app.state.render_pool, app.state.analysis_render_pool):
+        if pool is not None:
+            pool.shutdown()
+
+
+def create_app(analysis=None, recommendation=None) -> FastAPI:
     app = FastAPI(
         title="Medical Supplement Advisor",
         description="Interaktywny dashboard analizy badań krwi",
+        lifespan=_lifespan,
     )
     app.state.analysis = analysis
+    app.state.recommendation = recommendation
+    # Created on the first report download; importing it loads reportlab
+    app.state.render_pool = None
+    app.state.analysis_render_pool = None
 
     app.add_middleware(
         CORSMiddleware,
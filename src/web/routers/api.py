@@ -1,5 +1,9 @@
+from urllib.parse import quote
+
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from src.utils.filenames import sanitize_filename
 
 router = APIRouter(prefix="/api", tags=["API"])
 
@@ -18,3 +22,64 @@ async def get_analysis(request: Request):
             content={"error": "no_analysis", "detail": "No analysis data available"},
         )
     return analysis.model_dump(mode="json")
+
+
+_PDF_CHUNK_SIZE = 64 * 1024
+
+
+def _render_pool(app, analysis: bool = False):
+    attribute = "analysis_render_pool" if analysis else "render_pool"
+    pool = getattr(app.state, attribute)
+    if pool is None:
+        from src.utils.formatter import ReportRenderPool
+
+        if analysis:
+            from src.utils.analysis_formatter import AnalysisPDFFormatter
+
+            pool = ReportRenderPool(formatter_class=AnalysisPDFFormatter)
+        else:
+            pool = ReportRenderPool()
+        setattr(app.state, attribute, pool)
+    return pool
+
+
+def _pdf_response(pdf: bytes, filename: str) -> StreamingResponse:
+    filename = sanitize_filename(filename)
+    ascii_filename = filename.encode("ascii", "replace").decode().replace("?", "_")
+    headers = {
+        "Content-Length": str(len(pdf)),
+        "Content-Disposition": (
+            f'attachment; filename="{ascii_filename}"; ' f"filename*=UTF-8''{quote(filename)}"
+        ),
+        "Cache-Control": "no-store",
+    }
+    chunks = (pdf[i : i + _PDF_CHUNK_SIZE] for i in range(0, len(pdf), _PDF_CHUNK_SIZE))
+    return StreamingResponse(chunks, media_type="application/pdf", headers=headers)
+
+
+@router.get("/report.pdf")
+async def get_report_pdf(request: Request):
+    recommendation = request.app.state.recommendation
+    if recommendation is None:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "no_recommendation", "detail": "No recommendation available"},
+        )
+
+    pdf = await _render_pool(request.app).render(recommendation)
+    return _pdf_response(
+        pdf, f"{recommendation.patient_name}_{recommendation.patient_surname}_supplements.pdf"
+    )
+
+
+@router.get("/analysis.pdf")
+async def get_analysis_pdf(request: Request):
+    analysis = request.app.state.analysis
+    if analysis is None:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "no_analysis", "detail": "No analysis data available"},
+        )
+
+    pdf = await _render_pool(request.app, analysis=True).render(analysis)
+    return _pdf_response(pdf, f"{analysis.patient_name}_{analysis.patient_surname}_analysis.pdf")
@@ -32,6 +32,7 @@ async def dashboard(request: Request):
         "dashboard.html",
         {
             "analysis": analysis,
+            "report_available": request.app.state.recommendation is not None,
             "analysis_json": json.dumps(
                 analysis.model_dump(mode="json"), ensure_ascii=False
             ),
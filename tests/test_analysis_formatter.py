@@ -0,0 +1,144 @@
+"""Tests for AnalysisPDFFormatter module."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from src.models.test_analysis import (
+    ComprehensiveAnalysis,
+    CurveReading,
+    GlucoseCurveAnalysis,
+    GlucoseInsulinInterpretation,
+    LipidInterpretation,
+    RatioAnalysis,
+    ReferenceRange,
+    SupplementRecommendation,
+    TestAnalysis as AnalyzedTest,
+)
+from src.utils.analysis_formatter import (
+    AnalysisPDFFormatter,
+    curve_drawing,
+    curve_signature,
+    gauge_drawing,
+    gauge_geometry,
+)
+from src.utils.report_cache import ReportCache
+
+
+def make_test(value, status="normal"):
+    return AnalyzedTest(
+        name="Witamina D3",
+        value=value,
+        unit="ng/mL",
+        status=status,
+        lab_reference=ReferenceRange(min=30, max=100),
+        optimal_range=ReferenceRange(min=50, max=80),
+    )
+
+
+def make_analysis(surname="Nowak"):
+    readings = [
+        CurveReading(timepoint=minutes, value=value, unit="mg/dL", status=status)
+        for minutes, value, status in [(0, 92, "high"), (60, 150, "normal"), (120, 110, "normal")]
+    ]
+    return ComprehensiveAnalysis(
+        patient_name="Jan",
+        patient_surname=surname,
+        test_date="2024-01-15",
+        minerals_vitamins=[make_test(22.0, "low"), make_test(60.0)],
+        glucose_insulin=GlucoseInsulinInterpretation(
+            overall_status="warning",
+            insulin_resistance=True,
+            homa_ir=2.8,
+            glucose_curve=GlucoseCurveAnalysis(
+                readings=readings, fasting_status="high", peak_time=60, peak_value=150
+            ),
+        ),
+        lipids=LipidInterpretation(
+            overall_status="normal",
+            cardiovascular_risk="low",
+            ratios=[
+                RatioAnalysis(
+                    name="TG/HDL",
+                    value=1.2,
+                    optimal_range="< 1.5",
+                    status="normal",
+                    interpretation="Prawidłowy",
+                )
+            ],
+        ),
+        all_supplements=[
+            SupplementRecommendation(
+                supplement_id="vitamin_d3",
+                name="Witamina D3",
+                dosage="2000 IU",
+                priority="high",
+                reason="Niedobór witaminy D3",
+            )
+        ],
+        critical_issues=["Niska witamina D3"],
+        recommendations_summary=["Kontrola za 3 miesiące"],
+    )
+
+
+class TestCharts:
+    def test_gauge_geometry_places_value_on_scale(self):
+        lab_band, optimal_band, value_x, status = gauge_geometry(make_test(60.0))
+
+        assert lab_band[0] < optimal_band[0] < value_x < optimal_band[1] < lab_band[1]
+        assert status == "normal"
+
+    def test_gauge_geometry_none_without_reference(self):
+        test = AnalyzedTest(name="CRP", value=1.0, unit="mg/L", status="unknown")
+
+        assert gauge_geometry(test) is None
+
+    def test_gauge_drawing_memoized_by_geometry(self):
+        first = gauge_drawing(gauge_geometry(make_test(60.0)))
+
+        assert gauge_drawing(gauge_geometry(make_test(60.0))) is first
+        assert gauge_drawing(gauge_geometry(make_test(22.0, "low"))) is not first
+
+    def test_curve_drawing_memoized_by_readings(self):
+        readings = make_analysis().glucose_insulin.glucose_curve.readings
+
+        first = curve_drawing(curve_signature(readings))
+
+        assert curve_drawing(curve_signature(list(readings))) is first
+
+
+class TestAnalysisPDFFormatter:
+    @pytest.fixture
+    def formatter(self, tmp_path):
+        return AnalysisPDFFormatter(tmp_path, ReportCache(tmp_path / "cache", 10 * 1024 * 1024))
+
+    def test_generate_pdf_creates_file(self, formatter, tmp_path):
+        filepath = formatter.generate_pdf(make_analysis())
+
+        assert filepath.parent == tmp_path
+        assert filepath.name.endswith("_analysis.pdf")
+        assert filepath.read_bytes().startswith(b"%PDF")
+
+    def test_render_bytes_empty_analysis(self, formatter):
+        analysis = ComprehensiveAnalysis(patient_name="Jan", patient_surname="Nowak")
+
+        assert formatter.render_bytes(analysis).startswith(b"%PDF")
+
+    def test_render_bytes_cached_by_content(self, formatter):
+        formatter.render_bytes(make_analysis())
+        formatter.render_bytes(make_analysis())
+        formatter.render_bytes(make_analysis("Kowalski"))
+
+        assert formatter.report_cache.hits == 1
+        assert formatter.report_cache.misses == 2
+
+    def test_generate_many_in_parallel(self, formatter):
+        analyses = [make_analysis("Nowak"), make_analysis("Nowak"), make_analysis("Kowalski")]
+
+        paths = formatter.generate_many(analyses, workers=2)
+
+        assert len(set(paths)) == 3
+        assert all(path.read_bytes().startswith(b"%PDF") for path in paths)
@@ -118,3 +118,12 @@ def test_analyzer_value_range_higher_than_max(analyzer):
 
     assert len(analyzed) == 1
     assert analyzed[0].status == "high"
+
+
+def test_analyze_records_resolves_canonical_ids(analyzer, sample_blood_tests):
+    """Test that compact records carry canonical IDs and match analyze_blood_tests."""
+    records = analyzer.analyze_records(sample_blood_tests)
+
+    assert records[0].test_id == analyzer.name_resolver.canonical_id("Witamina D (25-OH)")
+    assert [r.status for r in records] == ["low", "low", "low", None]
+    assert [r.to_model() for r in records] == analyzer.analyze_blood_tests(sample_blood_tests)
@@ -0,0 +1,135 @@
+"""Tests for bulk directory processing."""
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from src.core.batch_processor import BatchProcessor, DocumentPipeline
+from src.utils.parse_workers import get_document_parser
+from config import EXAMPLES_DIR
+
+
+@pytest.fixture
+def inbox(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    shutil.copy(EXAMPLES_DIR / "sample_blood_tests.docx", inbox / "kowalski.docx")
+    shutil.copy(EXAMPLES_DIR / "sample_combined.json", inbox / "nowak.json")
+    (inbox / "broken.json").write_text("{bad", encoding="utf-8")
+    (inbox / "notes.txt").write_text("not a report", encoding="utf-8")
+    return inbox
+
+
+def test_pipeline_parses_documents_in_worker_pool(tmp_path):
+    assert DocumentPipeline(tmp_path).document_parser is get_document_parser()
+
+
+def test_find_documents_filters_supported_formats(inbox):
+    names = [path.name for path in BatchProcessor.find_documents(inbox)]
+    assert names == ["broken.json", "kowalski.docx", "nowak.json"]
+    assert [path.name for path in BatchProcessor.find_documents(inbox, "*.docx")] == [
+        "kowalski.docx"
+    ]
+
+
+def test_run_writes_reports_and_summary(inbox, tmp_path):
+    output_dir = tmp_path / "reports"
+    progress = []
+    processor = BatchProcessor(output_dir, workers=1)
+
+    summary = processor.run(
+        inbox, on_result=lambda path, result, done, total: progress.append((path.name, done, total))
+    )
+
+    assert summary["processed"] == 3
+    assert summary["succeeded"] == 2
+    assert [failure["file"] for failure in summary["failures"]] == [str(inbox / "broken.json")]
+    assert set(summary["timings"]["mean"]) == {"parse", "analyze", "render"}
+    assert sorted(path.name for path in output_dir.glob("*.pdf")) == [
+        "kowalski_docx_supplements.pdf",
+        "nowak_json_supplements.pdf",
+    ]
+    assert [done for _, done, _ in progress] == [1, 2, 3]
+
+    summary_path = tmp_path / "summary.json"
+    processor.write_summary(summary, summary_path)
+    assert json.loads(summary_path.read_text(encoding="utf-8"))["failed"] == 1
+
+
+def test_run_writes_lightweight_reports(inbox, tmp_path):
+    output_dir = tmp_path / "reports"
+    processor = BatchProcessor(output_dir, workers=1, report_format="csv")
+
+    summary = processor.run(inbox, "*.json")
+
+    assert summary["succeeded"] == 1
+    report = output_dir / "nowak_json_supplements.csv"
+    assert report.read_text(encoding="utf-8").startswith("patient_name,patient_surname,")
+
+
+def test_checkpoint_resumes_and_retries_failures(inbox, tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    BatchProcessor(tmp_path / "reports", workers=1, checkpoint_path=checkpoint).run(inbox)
+
+    (inbox / "broken.json").write_text(
+        (inbox / "nowak.json").read_text(encoding="utf-8"), encoding="utf-8"
+    )
+    summary = BatchProcessor(tmp_path / "reports", workers=1, checkpoint_path=checkpoint).run(inbox)
+
+    assert summary["skipped"] == 2
+    assert summary["processed"] == 1
+    assert summary["failed"] == 0
+
+
+def test_checkpoint_reprocesses_replaced_documents(inbox, tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    BatchProcessor(tmp_path / "reports", workers=1, checkpoint_path=checkpoint).run(inbox)
+
+    nowak = inbox / "nowak.json"
+    nowak.write_text(nowak.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    summary = BatchProcessor(tmp_path / "reports", workers=1, checkpoint_path=checkpoint).run(inbox)
+
+    assert summary["processed"] == 2
+    assert str(nowak) in summary["timings"]["files"]
+
+
+def test_report_names_stay_unique(tmp_path):
+    (tmp_path / "a").mkdir()
+    documents = [
+        tmp_path / "a" / "b.pdf",
+        tmp_path / "a_b.pdf",
+        tmp_path / "x.docx",
+        tmp_path / "x.pdf",
+    ]
+
+    names = BatchProcessor.report_names(tmp_path, documents)
+
+    assert list(names.values()) == [
+        "a_b_pdf_supplements.pdf",
+        "a_b_pdf_2_supplements.pdf",
+        "x_docx_supplements.pdf",
+        "x_pdf_supplements.pdf",
+    ]
+
+
+def test_failures_name_the_exception_once(inbox, tmp_path):
+    (inbox / "broken.json").unlink()
+    (inbox / "empty.docx").write_bytes(b"not a docx")
+
+    summary = BatchProcessor(tmp_path / "reports", workers=1).run(inbox, "*.docx")
+
+    [failure] = summary["failures"]
+    assert failure["error"].startswith("DataLoaderError: ")
+    assert "DataLoaderError: DataLoaderError" not in failure["error"]
+
+
+def test_parallel_run_processes_all_documents(inbox, tmp_path):
+    summary = BatchProcessor(tmp_path / "reports", workers=2).run(inbox)
+
+    assert summary["succeeded"] == 2
+    assert summary["failed"] == 1
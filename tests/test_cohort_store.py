@@ -0,0 +1,92 @@
+"""Tests for the columnar cohort store."""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+
+from src.core.analyzer import Analyzer
+from src.core.cohort_store import CohortStore, CohortStoreWriter
+from src.models.blood_test import BloodTest
+from src.utils.exceptions import DataLoaderError
+
+
+@pytest.fixture
+def analyzer():
+    return Analyzer(
+        {"reference_ranges": [{"name": "Ferrytyna", "min": 15.0, "max": 150.0, "unit": "ng/mL"}]}
+    )
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    path = tmp_path / "cohort"
+    # A tiny buffer forces several chunks to be written
+    with CohortStoreWriter(path, buffer_rows=3) as writer:
+        for i in range(4):
+            writer.add_panel(
+                f"P{i}",
+                [
+                    BloodTest(name="Ferrytyna", value=10.0 + 50 * i, unit="ng/mL"),
+                    BloodTest(name="Kreatynina", value=1.0, unit="mg/dL", status="high"),
+                ],
+            )
+    return path
+
+
+def test_columns_are_memory_mapped(store_path):
+    store = CohortStore(store_path)
+
+    assert len(store) == 8
+    assert isinstance(store.value, np.memmap)
+    assert store.patient_ids == ["P0", "P1", "P2", "P3"]
+    assert list(store.values_for("FERRYTYNA", chunk_rows=3)) == [10.0, 60.0, 110.0, 160.0]
+    assert not list(store_path.glob("*.part"))
+
+
+def test_analyze_cohort_sets_statuses(store_path, analyzer):
+    analyzer.analyze_cohort(CohortStore(store_path, writable=True), chunk_rows=3)
+
+    summary = CohortStore(store_path).summary(chunk_rows=3)
+    ferritin = summary["FERRYTYNA"]
+    assert (ferritin["low"], ferritin["normal"], ferritin["high"]) == (1, 2, 1)
+    assert ferritin["count"] == 4
+    assert ferritin["mean"] == pytest.approx(85.0)
+    assert (ferritin["min"], ferritin["max"]) == (10.0, 160.0)
+    # No reference range: the status it was stored with is kept
+    assert summary["KREATYNINA"]["high"] == 4
+
+
+def test_empty_store(tmp_path):
+    CohortStoreWriter(tmp_path / "empty").close()
+    store = CohortStore(tmp_path / "empty")
+
+    assert len(store) == 0
+    assert store.summary() == {}
+
+
+def test_failed_write_keeps_existing_store(store_path):
+    with pytest.raises(RuntimeError):
+        with CohortStoreWriter(store_path, buffer_rows=1) as writer:
+            writer.add("P9", "FERRYTYNA", 1.0)
+            writer.add("P9", "FERRYTYNA", 2.0)
+            raise RuntimeError("interrupted")
+
+    assert not list(store_path.glob("*.part"))
+    store = CohortStore(store_path)
+    assert len(store) == 8
+    assert "P9" not in store.patient_ids
+
+
+def test_version_mismatch(store_path):
+    index_path = store_path / "index.json"
+    index = json.loads(index_path.read_text(encoding="utf-8"))
+    index["version"] = 99
+    index_path.write_text(json.dumps(index), encoding="utf-8")
+
+    with pytest.raises(DataLoaderError, match="version"):
+        CohortStore(store_path)
@@ -0,0 +1,155 @@
+"""Tests for the compiled reference data bundle."""
+
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from config import DATA_BUNDLE_NAME, DATA_DIR
+from src.utils.data_bundle import (
+    build_data_bundle,
+    bundle_format,
+    get_data_bundle,
+    load_data_bundle,
+    validate_data_file,
+)
+from src.utils.data_loader import DataLoader
+from src.utils.exceptions import DataLoaderError
+from src.utils.name_resolver import NameResolver
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    target = tmp_path / "data"
+    target.mkdir()
+    for path in DATA_DIR.glob("*.json"):
+        shutil.copy(path, target / path.name)
+    return target
+
+
+def test_build_and_load_bundle(data_dir):
+    bundle_path = build_data_bundle(data_dir)
+
+    bundle = load_data_bundle(data_dir)
+
+    assert bundle_path == data_dir / DATA_BUNDLE_NAME
+    assert bundle is not None
+    expected = json.loads((data_dir / "supplements.json").read_text(encoding="utf-8"))
+    assert bundle.load("supplements.json") == expected
+
+
+def test_bundle_load_returns_fresh_copies(data_dir):
+    build_data_bundle(data_dir)
+    bundle = load_data_bundle(data_dir)
+
+    first = bundle.load("supplements.json")
+    first["supplements"].clear()
+
+    assert bundle.load("supplements.json")["supplements"]
+
+
+def test_missing_bundle(data_dir):
+    assert load_data_bundle(data_dir) is None
+
+
+def test_stale_bundle_is_ignored(data_dir):
+    build_data_bundle(data_dir)
+    path = data_dir / "supplements.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["supplements"].pop()
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+    assert load_data_bundle(data_dir) is None
+    assert DataLoader(data_dir).load_supplements() == data
+
+
+def test_unchanged_files_are_not_hashed(data_dir, monkeypatch):
+    build_data_bundle(data_dir)
+
+    def fail(data_dir):
+        raise AssertionError("data files hashed")
+
+    monkeypatch.setattr("src.utils.data_bundle.data_version", fail)
+    assert load_data_bundle(data_dir) is not None
+
+
+def test_touched_files_are_checked_by_content(data_dir):
+    build_data_bundle(data_dir)
+    os.utime(data_dir / "supplements.json", ns=(0, 0))
+
+    assert load_data_bundle(data_dir) is not None
+
+
+def test_get_data_bundle_notices_changed_files(data_dir):
+    build_data_bundle(data_dir)
+    assert get_data_bundle(data_dir) is not None
+
+    path = data_dir / "supplements.json"
+    path.write_text(path.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+
+    assert get_data_bundle(data_dir) is None
+
+
+def test_unreadable_bundle_is_ignored(data_dir):
+    (data_dir / DATA_BUNDLE_NAME).write_bytes(b"not a bundle")
+
+    assert load_data_bundle(data_dir) is None
+
+
+def test_build_rejects_invalid_data(data_dir):
+    path = data_dir / "supplements.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["supplements"].append(dict(data["supplements"][0]))
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+    with pytest.raises(DataLoaderError, match="duplicate supplement id"):
+        build_data_bundle(data_dir)
+    assert not (data_dir / DATA_BUNDLE_NAME).exists()
+
+
+def test_validate_data_file():
+    assert validate_data_file("x.json", []) == ["x.json: top level must be an object"]
+    assert validate_data_file(
+        "reference_ranges.json", {"reference_ranges": [{"name": "TSH", "min": 4, "max": 1}]}
+    ) == ["reference_ranges.json: TSH has min above max"]
+    assert validate_data_file("regex_patterns.json", {"patterns": {"bad": {"regex": "("}}})
+
+
+def test_loader_and_resolver_served_from_bundle(data_dir):
+    build_data_bundle(data_dir)
+
+    loader = DataLoader(data_dir)
+    resolver = load_data_bundle(data_dir).name_resolver()
+
+    assert loader.bundle is not None
+    unbundled = DataLoader(data_dir, use_bundle=False)
+    assert loader.load_reference_ranges() == unbundled.load_reference_ranges()
+    assert isinstance(resolver, NameResolver)
+    expected = NameResolver.from_data_dir(data_dir, loader=DataLoader(data_dir, use_bundle=False))
+    assert resolver.resolve("TSH") == expected.resolve("TSH")
+
+
+def test_bundle_from_other_resolver_source_is_ignored(data_dir, tmp_path, monkeypatch):
+    build_data_bundle(data_dir)
+    edited = tmp_path / "name_resolver.py"
+    edited.write_text("# edited\n", encoding="utf-8")
+    monkeypatch.setattr("src.utils.data_bundle._RESOLVER_SOURCE", edited)
+    bundle_format.cache_clear()
+    try:
+        assert load_data_bundle(data_dir) is None
+    finally:
+        monkeypatch.undo()
+        bundle_format.cache_clear()
+    assert load_data_bundle(data_dir) is not None
+
+
+def test_bundled_resolver_uses_configured_threshold(data_dir, monkeypatch):
+    build_data_bundle(data_dir)
+    monkeypatch.setattr("src.utils.data_bundle.FUZZY_MATCH_THRESHOLD", 0.95)
+
+    assert load_data_bundle(data_dir).name_resolver().fuzzy_threshold == 0.95
@@ -1,6 +1,7 @@
 """Tests for DocumentParser module."""
 
 import sys
+import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -182,3 +183,405 @@ class TestParseDocument:
 
         with pytest.raises(DataLoaderError, match="too large"):
             parser.parse_document(filepath)
+
+
+class _FakePage:
+    def __init__(self, text):
+        self._text = text
+
+    def extract_tables(self):
+        return []
+
+    def extract_text(self):
+        if isinstance(self._text, Exception):
+            raise self._text
+        return self._text
+
+
+class _FakePDF:
+    def __init__(self, texts):
+        self.pages = [_FakePage(text) for text in texts]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _FakeBackend:
+    def __init__(self, texts):
+        self.texts = texts
+
+    def open(self, file_path):
+        return _FakePDF(self.texts)
+
+
+class TestPerPageOCR:
+    GOOD_PAGE = "Pacjent: Nowak Jan\nHemoglobina: 14.2 g/dL\n"
+    GARBLED_PAGE = "(cid:12)" * 40
+
+    @pytest.fixture(autouse=True)
+    def _bind_parser(self, parser):
+        self.parser = parser
+
+    def _patch_pdf(self, monkeypatch, texts):
+        monkeypatch.setattr(self.parser, "_pdf_backend", _FakeBackend(texts))
+
+    def test_only_garbled_pages_are_ocred(self, parser, monkeypatch, tmp_path):
+        self._patch_pdf(monkeypatch, [self.GOOD_PAGE, self.GARBLED_PAGE, self.GOOD_PAGE])
+        requested = []
+
+        def fake_ocr(file_path, page_numbers=None, budget=None):
+            requested.append(page_numbers)
+            return {num: "Ferrytyna: 40.0 ng/mL" for num in page_numbers}
+
+        monkeypatch.setattr(parser, "_ocr_pdf_pages", fake_ocr)
+        result = parser._parse_pdf(tmp_path / "mixed.pdf")
+
+        assert requested == [[1]]
+        names = [test["name"] for test in result["blood_tests"]]
+        assert any("Hemoglobina" in name for name in names)
+        assert any("Ferrytyna" in name for name in names)
+
+    def test_text_layer_document_skips_ocr(self, parser, monkeypatch, tmp_path):
+        self._patch_pdf(monkeypatch, [self.GOOD_PAGE])
+
+        def fail_ocr(*args, **kwargs):
+            raise AssertionError("OCR should not run")
+
+        monkeypatch.setattr(parser, "_ocr_pdf_pages", fail_ocr)
+        result = parser._parse_pdf(tmp_path / "text.pdf")
+        assert result["patient"]["surname"] == "Nowak"
+
+    def test_ocr_failure_keeps_text_pages(self, parser, monkeypatch, tmp_path):
+        from src.utils.exceptions import DataLoaderError
+
+        self._patch_pdf(monkeypatch, [self.GOOD_PAGE, self.GARBLED_PAGE])
+
+        def broken_ocr(file_path, page_numbers=None, budget=None):
+            raise DataLoaderError("OCR libraries not available")
+
+        monkeypatch.setattr(parser, "_ocr_pdf_pages", broken_ocr)
+        result = parser._parse_pdf(tmp_path / "mixed.pdf")
+        assert result["patient"]["surname"] == "Nowak"
+
+    def test_long_readable_text_not_garbled(self, parser):
+        assert parser._is_text_garbled("Hemoglobina 14.2 g/dL\n" * 2000) is False
+
+
+class TestParseStrategies:
+    FULL_PANEL_PAGE = (
+        "Pacjent: Nowak Jan\n"
+        "Hemoglobina: 14.2 g/dL\n"
+        "Ferrytyna: 40.0 ng/mL\n"
+        "Cholesterol: 180 mg/dL\n"
+        "Glukoza: 90 mg/dL\n"
+        "Kortyzol: 12.0 ug/dL\n"
+    )
+
+    def test_complete_text_panel_skips_ocr(self, parser, monkeypatch, tmp_path):
+        pages = [self.FULL_PANEL_PAGE, TestPerPageOCR.GARBLED_PAGE]
+        monkeypatch.setattr(parser, "_pdf_backend", _FakeBackend(pages))
+
+        def fail_ocr(*args, **kwargs):
+            raise AssertionError("OCR should not run")
+
+        monkeypatch.setattr(parser, "_ocr_pdf_pages", fail_ocr)
+        result = parser._parse_pdf(tmp_path / "mixed.pdf")
+
+        info = result["parse_info"]
+        assert info["strategy"] == "text"
+        assert info["score"] >= 0.85
+        assert [stage["name"] for stage in info["stages"]] == ["tables", "text"]
+        assert len(result["blood_tests"]) == 5
+
+    def test_incomplete_panel_continues_to_ocr(self, parser, monkeypatch, tmp_path):
+        pages = [TestPerPageOCR.GOOD_PAGE, TestPerPageOCR.GARBLED_PAGE]
+        monkeypatch.setattr(parser, "_pdf_backend", _FakeBackend(pages))
+        monkeypatch.setattr(
+            parser,
+            "_ocr_pdf_pages",
+            lambda source, page_numbers=None, budget=None: {1: self.FULL_PANEL_PAGE},
+        )
+        result = parser._parse_pdf(tmp_path / "mixed.pdf")
+
+        info = result["parse_info"]
+        assert info["strategy"] == "ocr"
+        assert [stage["name"] for stage in info["stages"]] == ["tables", "text", "ocr"]
+        assert all(stage["elapsed"] >= 0 for stage in info["stages"])
+
+    def test_text_extraction_failure_falls_back_to_ocr(self, parser, monkeypatch, tmp_path):
+        pages = [ValueError("broken content stream")]
+        monkeypatch.setattr(parser, "_pdf_backend", _FakeBackend(pages))
+        ocr_result = {"patient": {"name": "Jan"}, "blood_tests": []}
+        monkeypatch.setattr(parser, "_parse_pdf_with_ocr", lambda source, budget=None: ocr_result)
+
+        result = parser._parse_pdf(tmp_path / "broken.pdf")
+
+        info = result["parse_info"]
+        assert info["strategy"] == "ocr"
+        assert "broken content stream" in info["stages"][1]["error"]
+
+    def test_score_prefers_recognised_names_and_units(self, parser):
+        known = {"blood_tests": [{"name": "Ferrytyna", "value": 40.0, "unit": "ng/mL"}]}
+        unknown = {"blood_tests": [{"name": "Xyzzy", "value": 40.0, "unit": " "}]}
+
+        assert parser._score_result({"blood_tests": []}) == 0.0
+        assert parser._score_result(unknown) < parser._score_result(known) < 1.0
+
+    def test_score_ignores_fuzzy_name_matches(self, parser):
+        misread = {"blood_tests": [{"name": "Ferrytvna", "value": 40.0, "unit": "ng/mL"}]}
+        unknown = {"blood_tests": [{"name": "Xyzzy", "value": 40.0, "unit": "ng/mL"}]}
+
+        assert parser.name_resolver.resolve("Ferrytvna", fuzzy=True) == "FERRYTYNA"
+        assert parser._score_result(misread) == parser._score_result(unknown)
+
+    def test_failing_strategy_is_skipped(self, parser):
+        from src.utils.document_parser import ParseStrategy
+
+        def broken():
+            raise ValueError("broken table")
+
+        result = parser._run_strategies(
+            Path("report.pdf"),
+            [
+                ParseStrategy("tables", broken),
+                ParseStrategy("text", lambda: {"patient": {}, "blood_tests": []}),
+            ],
+        )
+
+        stages = result["parse_info"]["stages"]
+        assert stages[0]["error"] == "broken table"
+        assert result["parse_info"]["strategy"] == "text"
+
+    def test_time_budget_stops_later_strategies(self, parser, monkeypatch):
+        from src.utils import document_parser
+        from src.utils.document_parser import ParseStrategy
+        from src.utils.exceptions import DataLoaderError
+
+        monkeypatch.setattr(document_parser, "PARSE_TIME_BUDGET", 0.0)
+
+        def fail_ocr():
+            raise AssertionError("OCR should not run")
+
+        with pytest.raises(DataLoaderError, match="time budget"):
+            parser._run_strategies(
+                Path("report.pdf"),
+                [ParseStrategy("tables", lambda: None), ParseStrategy("ocr", fail_ocr)],
+            )
+
+    def test_time_budget_stops_ocr_between_pages(self, parser, monkeypatch, tmp_path):
+        fitz = pytest.importorskip("fitz")
+        from src.utils import document_parser
+
+        path = tmp_path / "scan.pdf"
+        with fitz.open() as doc:
+            for _ in range(5):
+                doc.new_page()
+            doc.save(str(path))
+        pages = [TestPerPageOCR.GARBLED_PAGE] * 5
+        monkeypatch.setattr(parser, "_pdf_backend", _FakeBackend(pages))
+        monkeypatch.setattr(document_parser, "PARSE_TIME_BUDGET", 0.2)
+        ocred = []
+
+        def slow_ocr_page(page):
+            time.sleep(0.3)
+            ocred.append(page.number)
+            return self.FULL_PANEL_PAGE
+
+        monkeypatch.setattr(parser, "_ocr_page", slow_ocr_page)
+        result = parser._parse_pdf(path)
+
+        assert ocred == [0]
+        assert result["parse_info"]["strategy"] == "ocr"
+        assert result["parse_info"]["budget_exceeded"] is True
+
+    def test_fallback_only_strategy_runs_without_result(self, parser):
+        from src.utils.document_parser import ParseStrategy
+
+        calls = []
+        parser._run_strategies(
+            Path("report.docx"),
+            [
+                ParseStrategy("docx-stream", lambda: {"patient": {}, "blood_tests": []}),
+                ParseStrategy("python-docx", lambda: calls.append(1), fallback_only=True),
+            ],
+        )
+        assert calls == []
+
+
+def _tesseract_data(words):
+    """Build a pytesseract image_to_data dict from (line, text, left, top, conf) tuples."""
+    keys = ("text", "block_num", "par_num", "line_num", "left", "top", "width", "height", "conf")
+    data = {key: [] for key in keys}
+    for line_num, text, left, top, conf in words:
+        data["text"].append(text)
+        data["block_num"].append(1)
+        data["par_num"].append(1)
+        data["line_num"].append(line_num)
+        data["left"].append(left)
+        data["top"].append(top)
+        data["width"].append(40)
+        data["height"].append(10)
+        data["conf"].append(conf)
+    return data
+
+
+class _FakePixmap:
+    def tobytes(self, fmt):
+        from PIL import Image
+        import io
+
+        buffer = io.BytesIO()
+        Image.new("L", (10, 10), 255).save(buffer, format="PNG")
+        return buffer.getvalue()
+
+
+class _FakeFitzPage:
+    def __init__(self):
+        import fitz
+
+        self.rect = fitz.Rect(0, 0, 595, 842)
+        self.renders = []
+
+    def get_pixmap(self, matrix, clip=None):
+        self.renders.append((matrix.a, clip))
+        return _FakePixmap()
+
+
+class TestAdaptiveOCR:
+    WORDS = [
+        (1, "Pacjent:", 10, 10, 90),
+        (1, "Nowak", 60, 10, 90),
+        (1, "Jan", 110, 10, 90),
+        (2, "Ferrytyna", 10, 100, 0),
+        (2, "40,0", 60, 100, 0),
+        (3, "Hemoglobina", 10, 120, 0),
+        (3, "14,2", 60, 120, 0),
+        (4, "Strona", 10, 800, 90),
+        (4, "1", 60, 800, 90),
+    ]
+
+    def _patch_tesseract(self, monkeypatch, words, roi_text="ROI"):
+        from src.utils import document_parser
+
+        monkeypatch.setattr(
+            document_parser.pytesseract, "image_to_data", lambda *a, **k: _tesseract_data(words)
+        )
+        calls = []
+
+        def fake_image_to_string(image, lang, config):
+            calls.append(config)
+            return roi_text
+
+        monkeypatch.setattr(document_parser.pytesseract, "image_to_string", fake_image_to_string)
+        return calls
+
+    def test_results_region_excludes_header_and_footer(self, parser):
+        from src.utils.document_parser import OCRLine
+
+        lines = [
+            OCRLine("Pacjent: Nowak Jan", 10, 10, 150, 20, [90]),
+            OCRLine("Ferrytyna 40,0", 10, 100, 100, 110, [90]),
+            OCRLine("Strona 1 z 2", 10, 800, 100, 810, [90]),
+        ]
+        left, top, right, bottom = parser._find_results_region(lines)
+        assert top < 100 and bottom > 110
+        assert top > 20 and bottom < 800
+
+    def test_no_result_lines_returns_none(self, parser):
+        from src.utils.document_parser import OCRLine
+
+        assert parser._find_results_region([OCRLine("Strona 1", 0, 0, 10, 10, [])]) is None
+
+    def test_low_confidence_reocrs_only_region(self, parser, monkeypatch):
+        from src.utils.document_parser import OCR_BASE_ZOOM, OCR_MAX_ZOOM
+
+        calls = self._patch_tesseract(monkeypatch, self.WORDS, roi_text="Ferrytyna 40,0")
+        page = _FakeFitzPage()
+
+        text = parser._ocr_page(page)
+
+        assert [zoom for zoom, _ in page.renders] == [OCR_BASE_ZOOM, OCR_MAX_ZOOM]
+        clip = page.renders[1][1]
+        assert clip.y0 > 20 / OCR_BASE_ZOOM and clip.y1 < 800 / OCR_BASE_ZOOM
+        assert "tessedit_char_whitelist" in calls[0]
+        assert text.startswith("Pacjent: Nowak Jan")
+        assert "Strona" not in text
+
+    def test_high_confidence_skips_upscaling(self, parser, monkeypatch):
+        words = [(line, text, left, top, 95) for line, text, left, top, _ in self.WORDS]
+        calls = self._patch_tesseract(monkeypatch, words)
+        page = _FakeFitzPage()
+
+        text = parser._ocr_page(page)
+
+        assert len(page.renders) == 1
+        assert calls == []
+        assert "Ferrytyna 40,0" in text
+
+
+    def test_low_confidence_without_region_reocrs_whole_page(self, parser, monkeypatch):
+        from src.utils.document_parser import OCR_BASE_ZOOM, OCR_MAX_ZOOM
+
+        words = [(1, "Fer~yt", 10, 100, 20), (2, "Strona", 10, 800, 20)]
+        calls = self._patch_tesseract(monkeypatch, words, roi_text="Ferrytyna 40,0")
+        page = _FakeFitzPage()
+
+        text = parser._ocr_page(page)
+
+        assert page.renders == [(OCR_BASE_ZOOM, None), (OCR_MAX_ZOOM, None)]
+        assert "tessedit_char_whitelist" not in calls[0]
+        assert text == "Ferrytyna 40,0"
+
+    def test_confident_page_without_region_is_kept(self, parser, monkeypatch):
+        calls = self._patch_tesseract(monkeypatch, [(1, "Strona", 10, 800, 95)])
+        page = _FakeFitzPage()
+
+        assert parser._ocr_page(page) == "Strona"
+        assert len(page.renders) == 1
+        assert calls == []
+
+class TestParseBytes:
+    SAMPLE_DOCX = Path(__file__).parent.parent / "examples" / "sample_blood_tests.docx"
+
+    def test_docx_bytes_match_file(self, parser):
+        data = self.SAMPLE_DOCX.read_bytes()
+        from_bytes = parser.parse_bytes(data, "docx")
+        from_file = parser.parse_document(self.SAMPLE_DOCX)
+
+        # Only the stage timings may differ
+        assert from_bytes.pop("parse_info")["strategy"] == from_file.pop("parse_info")["strategy"]
+        assert from_bytes == from_file
+
+    def test_accepts_memoryview_and_dotted_kind(self, parser):
+        data = memoryview(bytearray(self.SAMPLE_DOCX.read_bytes()))
+
+        result = parser.parse_bytes(data, ".DOCX")
+        assert result["patient"]["surname"] == "Nowak"
+
+    def test_too_large(self, parser):
+        from src.utils.document_parser import MAX_FILE_SIZE
+        from src.utils.exceptions import DataLoaderError
+
+        with pytest.raises(DataLoaderError, match="too large"):
+            parser.parse_bytes(bytearray(MAX_FILE_SIZE + 1), "pdf")
+
+    def test_unsupported_kind(self, parser):
+        from src.utils.exceptions import DataLoaderError
+
+        with pytest.raises(DataLoaderError, match="Unsupported"):
+            parser.parse_bytes(b"text", "txt")
+
+
+class TestBufferReader:
+    def test_read_and_seek(self):
+        from src.utils.buffer_io import BufferReader
+
+        reader = BufferReader(memoryview(b"abcdef"))
+        assert reader.read(2) == b"ab"
+        reader.seek(-2, 2)
+        assert reader.read() == b"ef"
+        assert reader.tell() == 6
+        assert reader.read(1) == b""
@@ -0,0 +1,89 @@
+"""Tests for the streaming DOCX table reader."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from docx import Document
+
+from src.utils.docx_reader import UnsupportedLayoutError, iter_docx_rows
+from src.utils.document_parser import DocumentParser
+from config import EXAMPLES_DIR
+
+SAMPLE_DOCX = EXAMPLES_DIR / "sample_blood_tests.docx"
+
+
+def _python_docx_rows(path):
+    doc = Document(str(path))
+    return [
+        (index, [cell.text for cell in row.cells])
+        for index, table in enumerate(doc.tables)
+        for row in table.rows
+    ]
+
+
+def test_rows_match_python_docx():
+    assert list(iter_docx_rows(SAMPLE_DOCX)) == _python_docx_rows(SAMPLE_DOCX)
+
+
+def test_multiline_cells_match_python_docx(tmp_path):
+    path = tmp_path / "multiline.docx"
+    doc = Document()
+    doc.add_paragraph("Wyniki")
+    cell = doc.add_table(rows=1, cols=2).cell(0, 0)
+    cell.text = "Witamina D"
+    cell.add_paragraph("(25-OH)")
+    doc.save(str(path))
+
+    assert list(iter_docx_rows(path)) == _python_docx_rows(path)
+
+
+def test_merged_cells_are_unsupported(tmp_path):
+    path = tmp_path / "merged.docx"
+    doc = Document()
+    table = doc.add_table(rows=2, cols=2)
+    table.cell(0, 0).merge(table.cell(0, 1))
+    doc.save(str(path))
+
+    with pytest.raises(UnsupportedLayoutError):
+        list(iter_docx_rows(path))
+
+
+def test_parser_streaming_matches_python_docx():
+    parser = DocumentParser()
+    expected = parser._parse_docx_with_python_docx(SAMPLE_DOCX)
+
+    assert parser._parse_docx_streaming(SAMPLE_DOCX) == expected
+
+
+def test_parser_falls_back_on_merged_cells(tmp_path, monkeypatch):
+    path = tmp_path / "merged.docx"
+    doc = Document()
+    patient = doc.add_table(rows=2, cols=4)
+    for col, header in enumerate(["Imię", "Nazwisko", "Wiek", "Schorzenia"]):
+        patient.cell(0, col).text = header
+    patient.cell(1, 0).text = "Jan"
+    patient.cell(1, 1).text = "Nowak"
+    patient.cell(1, 2).text = "42"
+    tests = doc.add_table(rows=3, cols=3)
+    tests.cell(0, 0).merge(tests.cell(0, 2)).text = "Wyniki"
+    for col, text in enumerate(["Ferrytyna", "20,0", "ng/mL"]):
+        tests.cell(1, col).text = text
+    doc.save(str(path))
+
+    parser = DocumentParser()
+    fallback_calls = []
+    original = parser._parse_docx_with_python_docx
+
+    def tracking_fallback(file_path):
+        fallback_calls.append(file_path)
+        return original(file_path)
+
+    monkeypatch.setattr(parser, "_parse_docx_with_python_docx", tracking_fallback)
+    result = parser._parse_docx(path)
+
+    assert fallback_calls == [path]
+    assert result["patient"]["surname"] == "Nowak"
+    assert result["blood_tests"] == [{"name": "Ferrytyna", "value": 20.0, "unit": "ng/mL"}]
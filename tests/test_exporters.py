@@ -0,0 +1,153 @@
+"""Tests for data exporters."""
+
+import csv
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from src.core.batch_processor import DocumentPipeline
+from src.models.recommendation import Recommendation, SupplementRecommendation
+from src.models.test_analysis import ComprehensiveAnalysis, ReferenceRange
+from src.models.test_analysis import TestAnalysis as AnalyzedTest  # not a test class
+from src.utils.exporters import CSVExporter, HTMLExporter, JSONExporter, JSONLinesExporter
+from src.utils.json_parser import JSONParser
+
+
+def _read_lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_jsonl_exporter_appends(tmp_path):
+    path = tmp_path / "out" / "results.jsonl"
+    with JSONLinesExporter(path) as exporter:
+        exporter.write({"patient": "Żaneta"})
+    with JSONLinesExporter(path) as exporter:
+        assert exporter.write_all(iter([{"n": 1}, {"n": 2}])) == 2
+
+    assert _read_lines(path) == [{"patient": "Żaneta"}, {"n": 1}, {"n": 2}]
+    assert "Żaneta" in path.read_text(encoding="utf-8")
+
+    with JSONLinesExporter(path, append=False) as exporter:
+        exporter.write({"n": 3})
+    assert _read_lines(path) == [{"n": 3}]
+
+
+def test_jsonl_records_stream_to_recommendations(tmp_path):
+    patient = {"name": "Jan", "surname": "Nowak", "age": 40, "conditions": []}
+    records = [
+        {
+            "patient": patient,
+            "blood_tests": [{"name": "Ferrytyna", "value": 10.0, "unit": "ng/mL"}],
+        },
+        {
+            "patient": patient,
+            "blood_tests": [{"name": "Ferrytyna", "value": -1.0, "unit": "ng/mL"}],
+        },
+    ]
+    input_path = tmp_path / "patients.jsonl"
+    input_path.write_text("\n".join(json.dumps(r) for r in records), encoding="utf-8")
+    output_path = tmp_path / "recommendations.jsonl"
+
+    pipeline = DocumentPipeline(tmp_path)
+    with JSONLinesExporter(output_path) as exporter:
+        exporter.write_all(pipeline.recommend_records(JSONParser().iter_records(input_path)))
+
+    ok, failed = _read_lines(output_path)
+    assert ok["status"] == "ok"
+    assert ok["blood_tests"][0]["status"] == "low"
+    assert ok["recommendation"]["patient_name"] == "Jan"
+    assert failed == {"record": 1, "status": "failed", "error": failed["error"]}
+    assert list(tmp_path.glob("*.pdf")) == []
+
+
+def _recommendation(surname="Nowak", supplements=1):
+    return Recommendation(
+        patient_name="Jan",
+        patient_surname=surname,
+        date=datetime(2024, 1, 15, 10, 30),
+        supplements=[
+            SupplementRecommendation(
+                name="Witamina D3",
+                dosage="2000 IU",
+                timing="rano",
+                priority="high",
+                reason="Niedobór <witaminy> D3",
+            )
+        ][:supplements],
+    )
+
+
+def _analysis():
+    return ComprehensiveAnalysis(
+        patient_name="Jan",
+        patient_surname="Nowak",
+        minerals_vitamins=[
+            AnalyzedTest(
+                name="Ferrytyna",
+                value=10.0,
+                unit="ng/mL",
+                status="low",
+                lab_reference=ReferenceRange(min=15, max=150),
+            )
+        ],
+    )
+
+
+def test_csv_exporter_writes_row_per_supplement(tmp_path):
+    path = tmp_path / "recommendations.csv"
+    with CSVExporter(path) as exporter:
+        exporter.export_all([_recommendation(), _recommendation("Kowalski", supplements=0)])
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [(row["patient_surname"], row["supplement"]) for row in rows] == [
+        ("Nowak", "Witamina D3"),
+        ("Kowalski", ""),
+    ]
+    assert rows[0]["date"] == "2024-01-15T10:30:00"
+
+
+def test_csv_exporter_writes_analysis_tests(tmp_path):
+    path = tmp_path / "analysis.csv"
+    with CSVExporter(path) as exporter:
+        exporter.export(_analysis())
+        with pytest.raises(ValueError):
+            exporter.export(_recommendation())
+
+    with open(path, newline="", encoding="utf-8") as f:
+        (row,) = csv.DictReader(f)
+    assert row["category"] == "minerals_vitamins"
+    assert (row["test"], row["status"], row["lab_min"]) == ("Ferrytyna", "low", "15.0")
+
+
+def test_html_exporter_is_self_contained_and_escaped(tmp_path):
+    path = tmp_path / "report.html"
+    with HTMLExporter(path) as exporter:
+        exporter.export(_recommendation())
+        exporter.export(_analysis())
+
+    html = path.read_text(encoding="utf-8")
+    assert html.startswith("<!DOCTYPE html>") and html.rstrip().endswith("</html>")
+    assert html.count("<section>") == 2
+    assert "Niedobór &lt;witaminy&gt; D3" in html
+    assert 'class="status-low"' in html
+    assert "<link" not in html and "<script" not in html
+
+
+def test_json_exporter_writes_array(tmp_path):
+    path = tmp_path / "recommendations.json"
+    with JSONExporter(path) as exporter:
+        exporter.export_all([_recommendation(), _analysis(), {"record": 2}])
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert [item.get("patient_name") for item in data] == ["Jan", "Jan", None]
+    assert data[0]["supplements"][0]["name"] == "Witamina D3"
+
+    with JSONExporter(path):
+        pass
+    assert json.loads(path.read_text(encoding="utf-8")) == []
@@ -7,8 +7,13 @@ from datetime import datetime
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pytest
-from src.utils.formatter import PDFFormatter, register_polish_fonts, sanitize_filename
 
+from src.utils.formatter import (
+    PDFFormatter,
+    get_pdf_styles,
+    register_polish_fonts,
+    sanitize_filename,
+)
 
 class TestSanitizeFilename:
     def test_normal_name(self):
@@ -52,6 +57,10 @@ class TestRegisterPolishFonts:
         assert regular in ("CustomFont", "Helvetica")
         assert bold in ("CustomFont-Bold", "Helvetica-Bold")
 
+    def test_styles_are_built_once(self, tmp_path):
+        assert PDFFormatter(tmp_path).pdf_styles is PDFFormatter(tmp_path).pdf_styles
+        assert get_pdf_styles().font_name == register_polish_fonts()[0]
+
 
 class TestPDFFormatter:
     @pytest.fixture
@@ -131,3 +140,23 @@ class TestPDFFormatter:
 
         assert "Jan" in filepath.name
         assert "Nowak" in filepath.name
+
+    def test_generate_many_in_parallel(self, formatter, output_dir):
+        from src.models.recommendation import Recommendation
+
+        recommendations = [
+            Recommendation(
+                patient_name="Jan", patient_surname=surname, date=datetime.now(), supplements=[]
+            )
+            for surname in ["Nowak", "Nowak", "Kowalski"]
+        ]
+
+        paths = formatter.generate_many(
+            recommendations, workers=2, filenames=[None, None, "kowalski.pdf"]
+        )
+
+        assert len(set(paths)) == 3
+        assert all(path.stat().st_size > 0 for path in paths)
+        assert "Nowak" in paths[0].name and "Nowak" in paths[1].name
+        assert paths[2] == output_dir / "kowalski.pdf"
+        assert not list(output_dir.glob("*.tmp"))
@@ -0,0 +1,133 @@
+"""Tests for the inbox watcher."""
+
+import os
+import shutil
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.batch_processor import _process_in_worker
+from src.core.inbox_watcher import InboxWatcher
+from config import EXAMPLES_DIR
+
+
+def test_files_are_ready_once_stable(tmp_path):
+    watcher = InboxWatcher(tmp_path, tmp_path / "reports", stable_polls=2)
+    document = tmp_path / "report.json"
+    document.write_text("{}", encoding="utf-8")
+
+    assert watcher.poll_once() == []
+    # Still being written: size and mtime change between scans
+    document.write_text('{"patient": {}}', encoding="utf-8")
+    os.utime(document, ns=(1, 1))
+    assert watcher.poll_once() == []
+    assert watcher.poll_once() == [document]
+
+
+def test_unsupported_files_are_ignored(tmp_path):
+    watcher = InboxWatcher(tmp_path, tmp_path / "reports", stable_polls=1)
+    (tmp_path / "notes.txt").write_text("x", encoding="utf-8")
+
+    assert watcher.poll_once() == []
+
+
+def test_documents_are_processed_and_moved(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    finished = []
+    all_finished = threading.Event()
+
+    def on_result(path, result):
+        finished.append((path.name, result["status"]))
+        if len(finished) == 2:
+            all_finished.set()
+
+    watcher = InboxWatcher(
+        inbox, tmp_path / "reports", poll_interval=0.01, stable_polls=2, on_result=on_result
+    )
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    try:
+        shutil.copy(EXAMPLES_DIR / "sample_combined.json", inbox / "nowak.json")
+        (inbox / "broken.json").write_text("{bad", encoding="utf-8")
+        assert all_finished.wait(30)
+    finally:
+        watcher.stop()
+        thread.join(30)
+
+    assert sorted(finished) == [("broken.json", "failed"), ("nowak.json", "ok")]
+    assert (inbox / "done" / "nowak.json").exists()
+    assert (inbox / "failed" / "broken.json").exists()
+    assert "JSON" in (inbox / "failed" / "broken.json.error.txt").read_text(encoding="utf-8")
+    assert len(list((tmp_path / "reports").glob("nowak_*_supplements.pdf"))) == 1
+    assert not list(inbox.glob("*.json"))
+
+
+def test_reports_use_the_requested_format(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    finished = threading.Event()
+
+    watcher = InboxWatcher(
+        inbox,
+        tmp_path / "reports",
+        poll_interval=0.01,
+        stable_polls=1,
+        on_result=lambda path, result: finished.set(),
+        report_format="csv",
+    )
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    try:
+        shutil.copy(EXAMPLES_DIR / "sample_combined.json", inbox / "nowak.json")
+        assert finished.wait(30)
+    finally:
+        watcher.stop()
+        thread.join(30)
+
+    reports = list((tmp_path / "reports").glob("nowak_*_supplements.*"))
+    assert [report.suffix for report in reports] == [".csv"]
+
+
+def _crash_on_crash_json(file_path, report_name):
+    if file_path.stem == "crash":
+        os._exit(1)
+    return _process_in_worker(file_path, report_name)
+
+
+def test_watcher_survives_a_dead_worker(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.core.inbox_watcher._process_in_worker", _crash_on_crash_json)
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    finished = {}
+    done = {name: threading.Event() for name in ("crash.json", "nowak.json")}
+
+    def on_result(path, result):
+        finished[path.name] = result["status"]
+        done[path.name].set()
+
+    watcher = InboxWatcher(
+        inbox,
+        tmp_path / "reports",
+        workers=2,
+        poll_interval=0.01,
+        stable_polls=1,
+        on_result=on_result,
+    )
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    try:
+        shutil.copy(EXAMPLES_DIR / "sample_combined.json", inbox / "crash.json")
+        assert done["crash.json"].wait(30)
+        shutil.copy(EXAMPLES_DIR / "sample_combined.json", inbox / "nowak.json")
+        assert done["nowak.json"].wait(30)
+    finally:
+        watcher.stop()
+        thread.join(30)
+
+    assert not thread.is_alive()
+    assert finished == {"crash.json": "failed", "nowak.json": "ok"}
+    assert (inbox / "failed" / "crash.json").exists()
+    assert (inbox / "done" / "nowak.json").exists()
@@ -117,3 +117,125 @@ class TestLoadBloodTestsOnly:
     def test_file_not_found(self, parser, tmp_path):
         with pytest.raises(FileNotFoundError):
             parser.load_blood_tests_only(tmp_path / "missing.json")
+
+
+def _record(name, tests=1):
+    return {
+        "patient": {"name": name, "surname": "Żółć", "age": 40, "conditions": []},
+        "blood_tests": [{"name": "Ferrytyna", "value": 20.0, "unit": "ng/mL"}] * tests,
+    }
+
+
+class TestIterRecords:
+    def test_yields_each_record(self, parser, tmp_path):
+        records = [_record("Jan"), _record("Anna", tests=3)]
+        filepath = tmp_path / "export.json"
+        filepath.write_text(json.dumps(records, ensure_ascii=False, indent=2), encoding="utf-8")
+
+        assert list(parser.iter_records(filepath)) == records
+
+    def test_small_chunks_split_records_and_characters(self, parser, tmp_path, monkeypatch):
+        from src.utils import json_parser
+
+        monkeypatch.setattr(json_parser, "STREAM_CHUNK_SIZE", 7)
+        records = [_record(f"Pacjent {i}", tests=i) for i in range(5)]
+        filepath = tmp_path / "export.json"
+        filepath.write_text(json.dumps(records, ensure_ascii=False), encoding="utf-8")
+
+        assert list(parser.iter_records(filepath)) == records
+
+    def test_braces_and_escapes_inside_strings(self, parser, tmp_path, monkeypatch):
+        from src.utils import json_parser
+
+        monkeypatch.setattr(json_parser, "STREAM_CHUNK_SIZE", 3)
+        records = [_record('Jan "{Nowak}"'), _record("Anna \\}\\"), _record("Ewa")]
+        filepath = tmp_path / "export.json"
+        filepath.write_text(json.dumps(records, ensure_ascii=False), encoding="utf-8")
+
+        assert list(parser.iter_records(filepath)) == records
+
+    def test_non_object_record(self, parser, tmp_path):
+        filepath = tmp_path / "export.json"
+        filepath.write_text(json.dumps([_record("Jan"), [1, 2]]), encoding="utf-8")
+
+        with pytest.raises(ValueError, match="obiektem JSON"):
+            list(parser.iter_records(filepath))
+
+    def test_is_record_list(self, parser, tmp_path, valid_json_file):
+        filepath = tmp_path / "export.json"
+        filepath.write_text("\n  " + json.dumps([_record("Jan")]), encoding="utf-8")
+
+        assert parser.is_record_list(filepath)
+        assert not parser.is_record_list(valid_json_file)
+        assert not parser.is_record_list(tmp_path / "missing.json")
+
+    def test_single_object_file(self, parser, valid_json_file):
+        records = list(parser.iter_records(valid_json_file))
+
+        assert len(records) == 1
+        assert records[0] == parser.parse_document(valid_json_file)
+
+    def test_empty_list(self, parser, tmp_path):
+        filepath = tmp_path / "empty.json"
+        filepath.write_text(" [ ] \n", encoding="utf-8")
+
+        assert list(parser.iter_records(filepath)) == []
+
+    def test_invalid_record_raises_after_valid_ones(self, parser, tmp_path):
+        filepath = tmp_path / "export.json"
+        filepath.write_text(
+            json.dumps([_record("Jan"), {"patient": {}}]), encoding="utf-8"
+        )
+        records = parser.iter_records(filepath)
+
+        assert next(records)["patient"]["name"] == "Jan"
+        with pytest.raises(ValueError, match="blood_tests"):
+            next(records)
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            '[{"patient": {}, "blood_tests": []}',
+            '[{"patient": {}, "blood_tests": []} {}]',
+            '"text"',
+            "[] []",
+        ],
+    )
+    def test_malformed_json(self, parser, tmp_path, content):
+        filepath = tmp_path / "bad.json"
+        filepath.write_text(content, encoding="utf-8")
+
+        with pytest.raises(ValueError, match="Nieprawidłowy format JSON"):
+            list(parser.iter_records(filepath))
+
+    def test_record_size_is_bounded(self, parser, tmp_path, monkeypatch):
+        from src.utils import json_parser
+
+        monkeypatch.setattr(json_parser, "STREAM_CHUNK_SIZE", 16)
+        monkeypatch.setattr(json_parser, "MAX_RECORD_SIZE", 100)
+        filepath = tmp_path / "export.json"
+        filepath.write_text(json.dumps([_record("Jan", tests=50)]), encoding="utf-8")
+
+        with pytest.raises(ValueError, match="maksymalny rozmiar"):
+            list(parser.iter_records(filepath))
+
+    def test_file_not_found(self, parser, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            list(parser.iter_records(tmp_path / "missing.json"))
+
+    def test_json_lines(self, parser, tmp_path):
+        records = [_record("Jan"), _record("Anna", tests=2)]
+        filepath = tmp_path / "export.jsonl"
+        filepath.write_text(
+            "\n".join(json.dumps(record, ensure_ascii=False) for record in records) + "\n\n",
+            encoding="utf-8",
+        )
+
+        assert list(parser.iter_records(filepath)) == records
+
+    def test_json_lines_errors_name_the_line(self, parser, tmp_path):
+        filepath = tmp_path / "export.jsonl"
+        filepath.write_text(json.dumps(_record("Jan")) + "\n{bad\n", encoding="utf-8")
+
+        with pytest.raises(ValueError, match="linii 2"):
+            list(parser.iter_records(filepath))
@@ -0,0 +1,39 @@
+"""Tests for deferred imports."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.lazy_import import lazy_import, module_available
+
+ROOT = Path(__file__).parent.parent
+
+
+def test_module_available():
+    assert module_available("json")
+    assert not module_available("no_such_module_xyz")
+    assert not module_available("no_such_package_xyz.child")
+
+
+def test_lazy_module_imports_on_first_attribute_access():
+    module = lazy_import("colorsys")
+
+    assert "not loaded" in repr(module)
+    assert module.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert "(loaded)" in repr(module)
+
+
+def test_cli_import_skips_heavy_dependencies():
+    heavy = ["reportlab", "fitz", "pymupdf", "docx", "pdfplumber", "pytesseract", "numpy"]
+    code = (
+        "import sys; import src.main; "
+        f"print(','.join(name for name in {heavy!r} if name in sys.modules))"
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == ""
@@ -1,11 +1,22 @@
 """Tests for logger module."""
 
+import multiprocessing
 import sys
+from logging.handlers import QueueHandler
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.utils.logger import get_logger, setup_logger
+import pytest
+
+import src.utils.logger as logger_module
+from src.utils.logger import (
+    get_logger,
+    init_worker_logging,
+    setup_logger,
+    stop_logging,
+    worker_log_queue,
+)
 
 
 def test_get_logger_creates_logger():
@@ -33,3 +44,70 @@ def test_setup_logger_creates_logger():
     assert logger.name == "test_setup"
     assert logger.level >= 10  # DEBUG level is 10
     assert len(logger.handlers) > 0
+
+
+def test_loggers_share_one_queue_handler():
+    """Test that module loggers only enqueue records, through one handler."""
+    first = get_logger("test_queue_first")
+    second = get_logger("test_queue_second")
+
+    assert first.handlers == second.handlers
+    assert isinstance(first.handlers[0], QueueHandler)
+
+
+def test_records_written_by_listener(tmp_path, monkeypatch):
+    """Test that queued records reach the log file once the writer flushes."""
+    logger = get_logger("test_listener")
+    stop_logging()
+    monkeypatch.setattr(logger_module, "LOG_DIR", tmp_path)
+
+    logger.debug("Loaded %s from %s", "supplements.json", "cache")
+    stop_logging()
+
+    content = (tmp_path / "app.log").read_text(encoding="utf-8")
+    assert "Loaded supplements.json from cache" in content
+
+
+def _log_in_child(log_queue=None):
+    init_worker_logging(log_queue)
+    get_logger("test_forked").info("Logged in worker %s", 1)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fork is not available")
+@pytest.mark.parametrize("method", ["fork", "spawn"])
+def test_worker_records_reach_the_parent_writer(tmp_path, monkeypatch, method):
+    """Test that a worker's records are written by the main process before it exits."""
+    get_logger("test_forked")
+    stop_logging()
+    monkeypatch.setattr(logger_module, "LOG_DIR", tmp_path)
+    get_logger("test_forked").info("Logged in parent")
+
+    process = multiprocessing.get_context(method).Process(
+        target=_log_in_child, args=(worker_log_queue(),)
+    )
+    process.start()
+    process.join()
+    stop_logging()
+
+    content = (tmp_path / "app.log").read_text(encoding="utf-8")
+    assert process.exitcode == 0
+    assert "Logged in parent" in content
+    assert "Logged in worker 1" in content
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fork is not available")
+def test_worker_without_queue_does_not_write_the_file(tmp_path, monkeypatch):
+    """Test that only the main process writes app.log."""
+    get_logger("test_forked")
+    stop_logging()
+    monkeypatch.setattr(logger_module, "LOG_DIR", tmp_path)
+    get_logger("test_forked").info("Logged in parent")
+
+    process = multiprocessing.get_context("fork").Process(target=_log_in_child)
+    process.start()
+    process.join()
+    stop_logging()
+
+    content = (tmp_path / "app.log").read_text(encoding="utf-8")
+    assert process.exitcode == 0
+    assert "Logged in worker 1" not in content
@@ -0,0 +1,188 @@
+"""Tests for the blood test name resolver."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from config import DATA_DIR
+from src.core.analyzer import Analyzer
+from src.core.interpretation_engine import InterpretationEngine
+from src.models.blood_test import BloodTest
+from src.utils.data_loader import DataLoader
+from src.utils.name_resolver import (
+    AhoCorasick,
+    NameResolver,
+    TrigramIndex,
+    get_name_resolver,
+    index_by_test_id,
+)
+
+
+@pytest.fixture
+def resolver():
+    return NameResolver(
+        {
+            "WITAMINA D3": ["WITAMINA D", "25(OH)D", "WITAMINA D (25-OH)"],
+            "GLUKOZA": ["GLUCOSE"],
+            "TG": ["TRÓJGLICERYDY"],
+        },
+        canonical_names=["TSH", "FT4"],
+    )
+
+
+def test_aho_corasick_finds_overlapping_patterns():
+    automaton = AhoCorasick(["HE", "SHE", "HERS"])
+    assert sorted(automaton.find_all("USHERS")) == [(1, "SHE"), (2, "HE"), (2, "HERS")]
+
+
+def test_exact_alias_and_canonical_names(resolver):
+    assert resolver.resolve("Witamina D (25-OH)") == "WITAMINA D3"
+    assert resolver.resolve("25(OH)D") == "WITAMINA D3"
+    assert resolver.resolve("  tsh ") == "TSH"
+    assert resolver.resolve("Trójglicerydy") == "TG"
+
+
+def test_longest_whole_word_match_wins(resolver):
+    assert resolver.resolve("Witamina D3 w surowicy") == "WITAMINA D3"
+    assert resolver.resolve("Glukoza na czczo") == "GLUKOZA"
+    # "TSH" inside another word is not a match
+    assert resolver.resolve("TSHX") is None
+
+
+def test_qualifier_words_reject_match():
+    resolver = NameResolver(
+        {"HDL": ["CHOLESTEROL HDL"]},
+        canonical_names=["CHOLESTEROL", "HEMOGLOBINA", "TESTOSTERON", "RDW", "AST", "ALT"],
+        fuzzy_threshold=None,
+    )
+    assert resolver.resolve("Hemoglobina glikowana") is None
+    assert resolver.resolve("Testosteron wolny") is None
+    assert resolver.resolve("Cholesterol nie-HDL") is None
+    assert resolver.resolve("RDW-CV") is None
+    assert resolver.resolve("AST:ALT") is None
+    assert resolver.resolve("Testosteron w surowicy") == "TESTOSTERON"
+    assert resolver.resolve("AST_ALT_RATIO") is None
+    assert resolver.resolve("cholesterol_hdl") == "HDL"
+
+
+def test_numbers_outside_match_reject_it(resolver):
+    assert resolver.resolve("Glukoza 60 min") is None
+    assert resolver.resolve("Glukoza (ICD-9: L43)") == "GLUKOZA"
+
+
+def test_unknown_name(resolver):
+    assert resolver.resolve("Kreatynina") is None
+    assert resolver.canonical_id("Kreatynina") == "KREATYNINA"
+
+
+def test_default_resolver_uses_data_files():
+    resolver = get_name_resolver()
+    assert resolver is get_name_resolver()
+    assert resolver.resolve("Cholesterol całkowity") == "CHOLESTEROL"
+    assert resolver.resolve("ANTI-TPO") == resolver.resolve("ANTY-TPO")
+    assert resolver.resolve("FERRYTVNA", fuzzy=True) == "FERRYTYNA"
+
+
+def test_data_file_names_keep_distinct_ids():
+    resolver = get_name_resolver()
+    for fuzzy in (False, True):
+        vitamin_d = resolver.resolve("Witamina D (25-OH)", fuzzy=fuzzy)
+        assert resolver.resolve("Witamina C", fuzzy=fuzzy) != vitamin_d
+        assert resolver.resolve("Witamina E", fuzzy=fuzzy) != vitamin_d
+    assert resolver.resolve("Witamina C") is None
+    assert resolver.resolve("FERRYTVNA") is None
+
+
+def test_analyzer_grades_vitamin_d_against_its_own_range():
+    analyzer = Analyzer(DataLoader(DATA_DIR).load_reference_ranges())
+    analyzed = analyzer.analyze_blood_tests(
+        [
+            BloodTest(name="Witamina D3", value=20.0, unit="ng/mL"),
+            BloodTest(name="Witamina D3", value=50.0, unit="ng/mL"),
+        ]
+    )
+    assert [test.status for test in analyzed] == ["low", "normal"]
+
+
+def test_engines_match_aliases():
+    analyzer = Analyzer(
+        {"reference_ranges": [{"name": "Witamina D (25-OH)", "min": 30.0, "max": 100.0}]}
+    )
+    analyzed = analyzer.analyze_blood_tests(
+        [
+            BloodTest(name="25(OH)D", value=10.0, unit="ng/mL"),
+            BloodTest(name="Witamina D3", value=50.0, unit="ng/mL"),
+        ]
+    )
+    assert [test.status for test in analyzed] == ["low", "normal"]
+
+    engine = InterpretationEngine()
+    config = engine._find_test_config("WITAMINA D3")
+    assert config is not None
+    assert engine._find_test_config("Witamina D") is config
+
+
+def test_trigram_index_best_match():
+    index = TrigramIndex(["FERRYTYNA", "FOSFOR", "HEMOGLOBINA"])
+    match, score = index.best_match("FERRYTVNA")
+    assert match == "FERRYTYNA"
+    assert 0.6 < score < 1.0
+    assert index.best_match("FERRYTYNA") == ("FERRYTYNA", 1.0)
+    assert index.best_match("XYZ") is None
+
+
+def test_trigram_index_ignores_common_and_single_shared_trigrams():
+    names = [f"WITAMINA {letter}{letter}" for letter in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"]
+    index = TrigramIndex(names + ["FOSFOR"])
+    # "WITAMINA" trigrams are in every vitamin name, so only the suffix counts
+    assert index.best_matches("WITAMINA", 5) == []
+    assert index.best_match("WITAMINA QQ")[0] == "WITAMINA QQ"
+    # Sharing just " FO" with "FOSFOR" is not enough to be scored
+    assert index.best_match("FX") is None
+    matches = index.best_matches("FOSFOR", 3)
+    assert matches == [("FOSFOR", 1.0)]
+
+
+def test_fuzzy_match_accepts_ocr_misreads(resolver):
+    assert resolver.resolve("Witamjna D3", fuzzy=True) == "WITAMINA D3"
+    assert resolver.resolve("GLUK0ZA", fuzzy=True) is None  # digits must agree
+    assert resolver.fuzzy_match("Witamina D5") is None
+
+
+def test_fuzzy_match_requires_distinguishing_words(resolver):
+    assert resolver.fuzzy_match("Witamina C") is None
+    assert resolver.resolve("Witamina C", fuzzy=True) is None
+
+
+def test_fuzzy_near_misses_are_recorded(resolver):
+    resolver.fuzzy_threshold = 0.95
+    assert resolver.resolve("Witamjna D3", fuzzy=True) is None
+    near_miss = resolver.near_misses[-1]
+    assert near_miss.name == "WITAMJNA D3"
+    assert near_miss.candidate == "WITAMINA D3"
+    assert near_miss.score < 0.95
+
+
+def test_fuzzy_matching_can_be_disabled():
+    resolver = NameResolver({"FERRYTYNA": []}, fuzzy_threshold=None)
+    assert resolver.resolve("FERRYTVNA", fuzzy=True) is None
+    assert not resolver.near_misses
+
+
+def test_index_by_test_id_keeps_first_and_logs_collisions(monkeypatch):
+    warnings = []
+    monkeypatch.setattr(
+        "src.utils.name_resolver.logger.warning", lambda *args: warnings.append(args)
+    )
+
+    index = index_by_test_id(
+        [("WITAMINA D3", "Witamina D3", 1), ("TSH", "TSH", 2), ("WITAMINA D3", "25(OH)D", 3)],
+        "blood tests",
+    )
+
+    assert index == {"WITAMINA D3": 1, "TSH": 2}
+    assert len(warnings) == 1
+    assert "25(OH)D" in warnings[0]
@@ -0,0 +1,85 @@
+"""Tests for the sandboxed parse worker pool."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from src.utils.document_parser import DocumentParser
+from src.utils.exceptions import DataLoaderError, ParseTimeoutError
+from src.utils.parse_workers import ParseWorkerPool, get_document_parser
+from config import EXAMPLES_DIR
+
+SAMPLE_DOCX = EXAMPLES_DIR / "sample_blood_tests.docx"
+
+
+@pytest.fixture
+def pool():
+    with ParseWorkerPool(max_workers=1, timeout=60, max_jobs_per_worker=2) as pool:
+        yield pool
+
+
+def _without_parse_info(result):
+    result = dict(result)
+    result.pop("parse_info")
+    return result
+
+
+def test_results_match_in_process_parser(pool):
+    expected = DocumentParser().parse_document(SAMPLE_DOCX)
+
+    assert _without_parse_info(pool.parse_document(SAMPLE_DOCX)) == _without_parse_info(expected)
+    assert _without_parse_info(
+        pool.parse_bytes(SAMPLE_DOCX.read_bytes(), "docx")
+    ) == _without_parse_info(expected)
+
+
+def test_parse_errors_are_data_loader_errors(pool):
+    with pytest.raises(DataLoaderError, match="File not found") as excinfo:
+        pool.parse_document("/nonexistent/report.pdf")
+    assert not isinstance(excinfo.value, ParseTimeoutError)
+
+
+def test_workers_are_recycled(pool):
+    pool.parse_document(SAMPLE_DOCX)
+    first_pid = pool._idle[0].process.pid
+    pool.parse_document(SAMPLE_DOCX)
+
+    # The worker reached max_jobs_per_worker and was stopped
+    assert pool._idle == []
+    pool.parse_document(SAMPLE_DOCX)
+    assert pool._idle[0].process.pid != first_pid
+
+
+def test_deadline_kills_worker(pool):
+    # A fresh worker cannot even start within a millisecond
+    pool.timeout = 0.001
+    with pytest.raises(ParseTimeoutError) as excinfo:
+        pool.parse_document(SAMPLE_DOCX)
+    assert excinfo.value.reason == "deadline"
+    assert excinfo.value.limit == 0.001
+
+    pool.timeout = 60
+    assert pool.parse_document(SAMPLE_DOCX)["patient"]["surname"] == "Nowak"
+
+
+def test_shut_down_pool_rejects_jobs():
+    pool = ParseWorkerPool(max_workers=1)
+    pool.shutdown()
+    with pytest.raises(DataLoaderError, match="shut down"):
+        pool.parse_document(SAMPLE_DOCX)
+
+
+def test_document_parser_is_the_shared_pool():
+    parser = get_document_parser()
+
+    assert isinstance(parser, ParseWorkerPool)
+    assert get_document_parser() is parser
+
+
+def test_document_parser_in_process_when_disabled(monkeypatch):
+    monkeypatch.setattr("src.utils.parse_workers.PARSE_IN_WORKERS", False)
+
+    assert isinstance(get_document_parser(), DocumentParser)
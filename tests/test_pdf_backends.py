@@ -0,0 +1,98 @@
+"""Tests for PDF extraction backends."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Spacer, Table
+
+from src.utils.document_parser import DocumentParser
+from src.utils.exceptions import DataLoaderError
+from src.utils.pdf_backends import (
+    PDF_BACKENDS,
+    PDFBackend,
+    PdfplumberBackend,
+    PyMuPDFBackend,
+    get_pdf_backend,
+)
+
+
+@pytest.fixture
+def table_pdf(tmp_path):
+    path = tmp_path / "tables.pdf"
+    grid = [("GRID", (0, 0), (-1, -1), 0.5, "black")]
+    SimpleDocTemplate(str(path), pagesize=A4).build(
+        [
+            Table([["Imie", "Nazwisko", "Wiek"], ["Jan", "Nowak", "42"]], style=grid),
+            Spacer(1, 20),
+            Table(
+                [
+                    ["Badanie", "Wartosc", "Jednostka"],
+                    ["Ferrytyna", "20,0", "ng/mL"],
+                    ["Cynk", "60", "ug/dL"],
+                ],
+                style=grid,
+            ),
+        ]
+    )
+    return path
+
+
+class TestGetPdfBackend:
+    def test_auto_prefers_pymupdf(self):
+        assert isinstance(get_pdf_backend("auto"), PyMuPDFBackend)
+
+    def test_named_backend(self):
+        assert isinstance(get_pdf_backend("pdfplumber"), PdfplumberBackend)
+
+    def test_unknown_backend_raises(self):
+        with pytest.raises(DataLoaderError, match="Unknown PDF backend"):
+            get_pdf_backend("ghostscript")
+
+    def test_backend_must_implement_open(self):
+        class IncompleteBackend(PDFBackend):
+            @classmethod
+            def is_available(cls) -> bool:
+                return True
+
+        with pytest.raises(TypeError):
+            IncompleteBackend()
+
+
+@pytest.mark.parametrize("backend_name", list(PDF_BACKENDS))
+class TestBackendExtraction:
+    def test_extracts_tables(self, backend_name, table_pdf):
+        with get_pdf_backend(backend_name).open(table_pdf) as pdf:
+            tables = [table for page in pdf.pages for table in page.extract_tables()]
+
+        assert len(tables) == 2
+        assert tables[0][1] == ["Jan", "Nowak", "42"]
+        assert tables[1][1] == ["Ferrytyna", "20,0", "ng/mL"]
+
+    def test_extracts_text(self, backend_name, table_pdf):
+        with get_pdf_backend(backend_name).open(table_pdf) as pdf:
+            text = "".join(page.extract_text() for page in pdf.pages)
+
+        assert "Ferrytyna" in text
+
+    def test_parser_results_match(self, backend_name, table_pdf):
+        result = DocumentParser(pdf_backend=backend_name).parse_document(table_pdf)
+
+        assert result["patient"]["surname"] == "Nowak"
+        assert result["blood_tests"] == [
+            {"name": "Ferrytyna", "value": 20.0, "unit": "ng/mL"},
+            {"name": "Cynk", "value": 60.0, "unit": "ug/dL"},
+        ]
+
+    def test_parse_bytes_matches_file(self, backend_name, table_pdf):
+        parser = DocumentParser(pdf_backend=backend_name)
+
+        from_bytes = parser.parse_bytes(table_pdf.read_bytes(), "pdf")
+        from_file = parser.parse_document(table_pdf)
+
+        # Only the stage timings may differ
+        assert from_bytes.pop("parse_info")["strategy"] == from_file.pop("parse_info")["strategy"]
+        assert from_bytes == from_file
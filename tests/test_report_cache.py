@@ -0,0 +1,105 @@
+"""Tests for the rendered-report cache."""
+
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from src.models.recommendation import Recommendation
+from src.utils.formatter import PDFFormatter, report_cache_key
+from src.utils.report_cache import ReportCache, get_report_cache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ReportCache(tmp_path / "cache", max_bytes=100)
+
+
+def _recommendation(surname="Nowak", minute=30):
+    return Recommendation(
+        patient_name="Jan",
+        patient_surname=surname,
+        date=datetime(2026, 4, 19, 9, minute, 15),
+        supplements=[],
+    )
+
+
+def test_get_and_put(cache):
+    assert cache.get("a") is None
+    cache.put("a", b"report")
+    assert cache.get("a") == b"report"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    cache.put("a", b"x" * 40)
+    cache.put("b", b"x" * 40)
+    # Make "a" the most recently used entry
+    os.utime(cache.cache_dir / "b.pdf", ns=(1, 1))
+    cache.get("a")
+
+    cache.put("c", b"x" * 40)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_entries_over_the_limit_are_not_stored(cache):
+    cache.put("big", b"x" * 101)
+    assert cache.get("big") is None
+
+
+def test_cache_key_follows_rendered_content():
+    key = report_cache_key(_recommendation())
+    # Seconds are not shown in the report
+    later = _recommendation().model_copy(update={"date": datetime(2026, 4, 19, 9, 30, 59)})
+    assert report_cache_key(later) == key
+    assert report_cache_key(_recommendation(minute=31)) == key
+    assert report_cache_key(_recommendation(surname="Kowalski")) != key
+
+
+def test_formatter_reuses_cached_report(tmp_path):
+    cache = ReportCache(tmp_path / "cache", max_bytes=10 * 1024 * 1024)
+    formatter = PDFFormatter(tmp_path, cache)
+    recommendation = _recommendation()
+
+    first = formatter.render_bytes(recommendation)
+    path = formatter.generate_pdf(recommendation, filename="again.pdf")
+
+    assert cache.hits == 1
+    assert path.read_bytes() == first
+
+
+def test_rerun_a_minute_later_is_served_from_cache(tmp_path):
+    cache = ReportCache(tmp_path / "cache", max_bytes=10 * 1024 * 1024)
+    formatter = PDFFormatter(tmp_path, cache)
+
+    first = formatter.render_bytes(_recommendation(minute=30))
+    again = formatter.render_bytes(_recommendation(minute=31))
+
+    assert cache.hits == 1
+    assert again == first
+
+
+def test_formatter_does_not_cache_by_default(tmp_path):
+    formatter = PDFFormatter(tmp_path)
+    formatter.render_bytes(_recommendation())
+
+    assert formatter.report_cache is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_shared_cache_lives_in_output_dir(tmp_path, monkeypatch):
+    assert get_report_cache(tmp_path / "reports") is None
+
+    monkeypatch.setattr("src.utils.report_cache.REPORT_CACHE_MAX_MB", 1)
+    cache = get_report_cache(tmp_path / "reports")
+
+    assert cache.cache_dir == (tmp_path / "reports" / ".report_cache").resolve()
+    assert get_report_cache(tmp_path / "reports") is cache
+    assert get_report_cache(tmp_path / "other") is not cache
@@ -6,7 +6,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pytest
-from src.models.blood_test import BloodTest
+from src.models.blood_test import BloodTest, BloodTestRecord
 from src.models.patient import Patient
 from src.core.rule_engine import RuleEngine
 
@@ -184,6 +184,16 @@ def test_rule_engine_no_match(rule_engine, sample_blood_tests):
     assert len(supplements) == 0
 
 
+def test_rule_engine_repeated_test_uses_last_result(rule_engine):
+    """Test that a test listed twice is judged by its last result."""
+    patient = Patient(name="Test", surname="User", age=30, conditions=[])
+    first = BloodTest(name="Witamina D (25-OH)", value=18.0, unit="ng/mL", status="low")
+    last = BloodTest(name="Witamina D", value=45.0, unit="ng/mL", status="normal")
+
+    assert rule_engine.apply_rules([first, last], patient) == []
+    assert any(s["name"] == "Witamina D3" for s in rule_engine.apply_rules([last, first], patient))
+
+
 def test_rule_engine_priority_replacement(rule_engine):
     """Test that higher priority supplements replace lower priority ones."""
     tests = [
@@ -222,3 +232,17 @@ def test_rule_engine_multiple_supplements_per_rule(rule_engine, analyzed_blood_t
 
     # Each rule may add multiple supplements
     assert len(supplements) >= 0
+
+
+def test_rule_engine_records_match_models(rule_engine, analyzed_blood_tests):
+    """Test that rules applied to compact records give the same supplements."""
+    patient = Patient(name="Test", surname="User", age=30, conditions=[])
+    canonical_id = rule_engine.name_resolver.canonical_id
+    records = [
+        BloodTestRecord.from_model(test, canonical_id(test.name))
+        for test in analyzed_blood_tests
+    ]
+
+    assert rule_engine.apply_rules_to_records(records, patient) == rule_engine.apply_rules(
+        analyzed_blood_tests, patient
+    )
@@ -96,6 +96,26 @@ class TestValidateBloodTests:
         with pytest.raises(ValidationError):
             validator.validate_blood_tests(data)
 
+    def test_all_invalid_rows_are_reported(self, validator):
+        data = [
+            {"name": "Witamina D3", "value": 25.0, "unit": "ng/mL"},
+            {"name": "Żelazo", "value": -1.0, "unit": "ug/dL"},
+            {"name": "Ferrytyna", "unit": "ng/mL"},
+        ]
+        with pytest.raises(ValidationError) as exc_info:
+            validator.validate_blood_tests(data)
+
+        errors = exc_info.value.errors
+        assert [(e["index"], e["field"]) for e in errors] == [(1, "value"), (2, "value")]
+        assert "negative" in errors[0]["message"]
+        assert "row 2 (value)" in str(exc_info.value)
+
+    def test_blood_test_objects_are_not_revalidated(self, validator):
+        tests = validator.validate_blood_tests(
+            [{"name": "Witamina D3", "value": 25.0, "unit": "ng/mL"}]
+        )
+        assert validator.validate_blood_tests(tests)[0] is tests[0]
+
 
 class TestValidateReferenceRanges:
     def test_valid_reference_ranges(self, validator):
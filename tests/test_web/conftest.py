@@ -44,3 +44,32 @@ def sample_analysis():
 def client_with_data(sample_analysis):
     app = create_app(analysis=sample_analysis)
     return TestClient(app)
+
+
+@pytest.fixture
+def sample_recommendation():
+    from datetime import datetime
+
+    from src.models.recommendation import Recommendation, SupplementRecommendation
+
+    return Recommendation(
+        patient_name="Jan",
+        patient_surname="Kowalski",
+        date=datetime(2026, 4, 19, 9, 30),
+        supplements=[
+            SupplementRecommendation(
+                name="Witamina D3",
+                dosage="2000 IU",
+                timing="Rano",
+                priority="high",
+                reason="Niedobór witaminy D",
+            )
+        ],
+    )
+
+
+@pytest.fixture
+def client_with_report(sample_analysis, sample_recommendation):
+    app = create_app(analysis=sample_analysis, recommendation=sample_recommendation)
+    with TestClient(app) as client:
+        yield client
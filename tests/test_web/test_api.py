@@ -16,3 +16,47 @@ def test_analysis_endpoint_with_data(client_with_data):
 def test_analysis_endpoint_without_data(client):
     response = client.get("/api/analysis")
     assert response.status_code == 404
+
+
+def test_report_pdf_endpoint(client_with_report):
+    response = client_with_report.get("/api/report.pdf")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.headers["content-length"] == str(len(response.content))
+    assert "Jan_Kowalski_supplements.pdf" in response.headers["content-disposition"]
+    assert response.content.startswith(b"%PDF")
+
+
+def test_render_pool_is_created_on_first_report(client_with_report):
+    assert client_with_report.app.state.render_pool is None
+    client_with_report.get("/api/report.pdf")
+    assert client_with_report.app.state.render_pool is not None
+
+
+def test_analysis_pdf_endpoint(client_with_report):
+    response = client_with_report.get("/api/analysis.pdf")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert "Jan_Kowalski_analysis.pdf" in response.headers["content-disposition"]
+    assert response.content.startswith(b"%PDF")
+    assert client_with_report.app.state.render_pool is None
+
+
+def test_analysis_pdf_endpoint_without_analysis(client):
+    response = client.get("/api/analysis.pdf")
+    assert response.status_code == 404
+
+
+def test_report_pdf_endpoint_without_recommendation(client):
+    response = client.get("/api/report.pdf")
+    assert response.status_code == 404
+
+
+def test_render_bytes_matches_file_output(sample_recommendation, tmp_path):
+    from src.utils.formatter import PDFFormatter
+
+    formatter = PDFFormatter(tmp_path)
+    pdf = formatter.render_bytes(sample_recommendation)
+
+    assert pdf.startswith(b"%PDF")
+    assert list(tmp_path.iterdir()) == []
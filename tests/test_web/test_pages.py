@@ -136,3 +136,10 @@ def test_dashboard_with_rich_data():
     assert "Witamina D3" in response.text
     assert "Wysokie CRP" in response.text
     assert "2000 IU" in response.text
+
+
+def test_dashboard_report_download_link(client, client_with_data, client_with_report):
+    assert "/api/report.pdf" not in client_with_data.get("/").text
+    assert "/api/report.pdf" in client_with_report.get("/").text
+    assert "/api/analysis.pdf" in client_with_data.get("/").text
+    assert "/api/analysis.pdf" not in client.get("/").text